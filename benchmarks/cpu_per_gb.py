@@ -0,0 +1,91 @@
+"""
+Measure CPU time spent by pyndows (per GB) on paths where content goes through pyndows buffers.
+
+Remote computers are simulated in memory (serving or accepting chunks of a given size, as pysmb does),
+so that only pyndows overhead is measured.
+
+python benchmarks/cpu_per_gb.py [--size-mb 1024]
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+import pyndows
+from pyndows import _windows
+
+
+class InMemoryComputer:
+    """Provide the Samba connection methods used by transfer (content is generated and discarded)."""
+
+    remote_name = "InMemory"
+
+    def __init__(self, size: int, chunk_size: int):
+        self.size = size
+        self.chunk_size = chunk_size
+
+    def retrieveFile(self, share_folder, file_path, file, timeout=30):
+        chunk = bytes(self.chunk_size)
+        for _ in range(self.size // self.chunk_size):
+            file.write(chunk)
+        return 0, self.size
+
+    def storeFile(self, share_folder, file_path, file, timeout=30):
+        stored = 0
+        for data in iter(lambda: file.read(self.chunk_size), b""):
+            stored += len(data)
+        return stored
+
+    def listPath(self, *args, **kwargs):
+        return []
+
+    def createDirectory(self, *args, **kwargs):
+        pass
+
+    def rename(self, *args, **kwargs):
+        pass
+
+
+def cpu_seconds(function) -> float:
+    start = time.process_time()
+    function()
+    return time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=1024)
+    size = parser.parse_args().size_mb * 1024 * 1024
+    gigabytes = size / 1024**3
+
+    for produced, consumed in [(1024 * 1024, 65536), (4 * 1024 * 1024, 65536)]:
+        seconds = cpu_seconds(
+            lambda: pyndows.transfer(
+                InMemoryComputer(size, produced),
+                "share",
+                "/file",
+                InMemoryComputer(size, consumed),
+                "share",
+                "/file",
+                write_to_new_folder_after=0,
+            )
+        )
+        print(
+            f"transfer ({produced // 1024}KB chunks read by {consumed // 1024}KB): "
+            f"{seconds / gigabytes:.3f} CPU seconds per GB"
+        )
+
+    with tempfile.TemporaryDirectory() as folder:
+        file_path = os.path.join(folder, "file")
+        with open(file_path, "wb") as file:
+            file.truncate(size)
+        seconds = cpu_seconds(lambda: _windows._hash_file(hashlib.md5(), file_path))
+        print(
+            f"local file checksum (md5): {seconds / gigabytes:.3f} CPU seconds per GB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,58 @@
-from pyndows._exceptions import PyndowsException
-from pyndows._windows import (
-    connect,
-    get,
-    move,
-    rename,
-    get_file_desc,
-    check,
-    get_folder_content,
-)
+import importlib
+import sys
 
+from pyndows._exceptions import PyndowsException
 from pyndows.version import __version__
+
+# Imported when first accessed, so that importing pyndows does not load pysmb
+_lazy_attributes = {
+    "connect": "pyndows._windows",
+    "get": "pyndows._windows",
+    "move": "pyndows._windows",
+    "copy": "pyndows._windows",
+    "transfer": "pyndows._windows",
+    "rename": "pyndows._windows",
+    "get_file_desc": "pyndows._windows",
+    "check": "pyndows._windows",
+    "get_folder_content": "pyndows._windows",
+    "DownloadCache": "pyndows._cache",
+    "FolderListing": "pyndows._listing",
+    "open_remote": "pyndows._remote_file",
+    "follow": "pyndows._follow",
+    "RetryPolicy": "pyndows._retry",
+    "ConnectionPool": "pyndows._pool",
+    "rename_many": "pyndows._bulk",
+    "delete_many": "pyndows._bulk",
+    "move_many": "pyndows._bulk",
+    "purge": "pyndows._bulk",
+    "Claim": "pyndows._claim",
+    "claim_files": "pyndows._claim",
+    "renew_claim": "pyndows._claim",
+    "release_claim": "pyndows._claim",
+    "Scheduler": "pyndows._scheduler",
+    "HealthMonitor": "pyndows._health",
+    "du": "pyndows._usage",
+    "FolderUsage": "pyndows._usage",
+}
+
+__all__ = ["PyndowsException", "__version__", *_lazy_attributes]
+
+
+def __getattr__(name: str):
+    module_name = _lazy_attributes.get(name)
+    if not module_name:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Further accesses will not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_lazy_attributes})
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module __getattr__ is only supported since Python 3.7
+    for _name in _lazy_attributes:
+        __getattr__(_name)
@@ -0,0 +1,5 @@
+import sys
+
+from pyndows._cli import main
+
+sys.exit(main())
@@ -0,0 +1,473 @@
+import datetime
+import io
+import itertools
+import logging
+import os
+import time
+from typing import Union, List, Tuple, Optional, Dict, Set, Iterable
+
+from smb.SMBConnection import SMBConnection
+from smb.base import SharedFile
+from smb.smb_structs import OperationFailure
+
+from pyndows._exceptions import PyndowsException
+from pyndows._listing import _timestamp
+from pyndows._pool import ConnectionPool, map_connections
+from pyndows._windows import (
+    get_folder_content,
+    get_file_desc,
+    _rename,
+    _pattern_regex,
+    _create_folders,
+    _store,
+    _rename_temp_file,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def rename_many(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    file_paths: List[Tuple[str, str]],
+) -> List[Optional[Exception]]:
+    """
+    Rename many files or folders.
+
+    Existence of files is checked by listing every folder once (instead of once per file).
+
+    :param connection: Samba connection as returned by connect function.
+    Renaming is performed concurrently if a ConnectionPool is provided.
+    :param share_folder: Shared folder name.
+    :param file_paths: (old file path, new file path) for every file to rename.
+    :return: The outcome of every rename, in the same order as file_paths.
+    None if file was renamed, FileNotFoundError if file does not exist or PyndowsException if rename failed.
+    """
+    logger.info(
+        f"Renaming {len(file_paths)} files within \\\\{connection.remote_name}\\{share_folder}..."
+    )
+    existing = _existing_file_names(
+        connection, share_folder, [old_file_path for old_file_path, _ in file_paths]
+    )
+
+    def rename(
+        connection: SMBConnection, file_path: Tuple[str, str]
+    ) -> Optional[Exception]:
+        old_file_path, new_file_path = file_path
+        if os.path.basename(old_file_path).lower() not in existing.get(
+            os.path.dirname(old_file_path), ()
+        ):
+            return FileNotFoundError(
+                f"\\\\{connection.remote_name}\\{share_folder}{old_file_path} doesn't exist"
+            )
+        try:
+            _rename(connection, share_folder, old_file_path, new_file_path)
+        except PyndowsException as e:
+            return e
+
+    outcomes = map_connections(connection, rename, file_paths)
+    logger.info(
+        f"{outcomes.count(None)} files renamed out of {len(file_paths)} within \\\\{connection.remote_name}\\{share_folder}."
+    )
+    return outcomes
+
+
+def delete_many(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    file_paths: List[str],
+) -> List[Optional[Exception]]:
+    """
+    Delete many files.
+
+    Existence of files is checked by listing every folder once (instead of once per file).
+
+    :param connection: Samba connection as returned by connect function.
+    Deletion is performed concurrently if a ConnectionPool is provided.
+    :param share_folder: Shared folder name.
+    :param file_paths: Full path to every file to delete.
+    :return: The outcome of every deletion, in the same order as file_paths.
+    None if file was deleted, FileNotFoundError if file does not exist or PyndowsException if deletion failed.
+    """
+    logger.info(
+        f"Deleting {len(file_paths)} files within \\\\{connection.remote_name}\\{share_folder}..."
+    )
+    existing = _existing_file_names(connection, share_folder, file_paths)
+
+    def delete(connection: SMBConnection, file_path: str) -> Optional[Exception]:
+        if os.path.basename(file_path).lower() not in existing.get(
+            os.path.dirname(file_path), ()
+        ):
+            return FileNotFoundError(
+                f"\\\\{connection.remote_name}\\{share_folder}{file_path} doesn't exist"
+            )
+        try:
+            _delete_file(connection, share_folder, file_path)
+        except PyndowsException as e:
+            return e
+
+    outcomes = map_connections(connection, delete, file_paths)
+    logger.info(
+        f"{outcomes.count(None)} files deleted out of {len(file_paths)} within \\\\{connection.remote_name}\\{share_folder}."
+    )
+    return outcomes
+
+
+def move_many(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    file_paths: List[Tuple[str, str]],
+    manifest_file_path: Optional[str] = None,
+    temp_file_suffix: str = ".tmp",
+    timeout: int = 30,
+    write_to_new_folder_after: float = 1,
+):
+    """
+    Move many local files to a Windows location, making them available (almost) at once.
+
+    Every file is first written with a temporary name. Once every file is written, they are all renamed
+    (concurrently if a ConnectionPool is provided), then the manifest file is written (if provided).
+    Consumers can wait for the manifest to process the whole batch.
+
+    :param connection: Samba connection as returned by connect function.
+    Writing and renaming are performed concurrently if a ConnectionPool is provided.
+    :param share_folder: Shared folder name.
+    :param file_paths: (local file path, remote file path) for every file to move. Folders will be created if needed.
+    :param manifest_file_path: Remote file listing every moved file (one remote file path per line),
+    written (with a temporary name as well) once every file is available. No manifest by default.
+    :param temp_file_suffix: Suffix of the files while being written. Default to ".tmp".
+    :param timeout: Maximum amount of seconds to write a file. Default to 30 seconds.
+    :param write_to_new_folder_after: Number of seconds to wait before writing files if folders needed to be created.
+    Useful as Microsoft does not seems to release folder right away. Default to 1 second.
+    :raises PyndowsException: if a file cannot be read or written (written files are removed and nothing is made available)
+    or renamed. Local files are only removed once every file (and the manifest) is available.
+    """
+    logger.info(
+        f"Moving {len(file_paths)} files within \\\\{connection.remote_name}\\{share_folder}..."
+    )
+    _create_missing_folders(
+        connection,
+        share_folder,
+        [os.path.dirname(file_path) for _, file_path in file_paths],
+        write_to_new_folder_after,
+    )
+
+    temp_file_paths = [
+        f"{remote_file_path}{temp_file_suffix}" for _, remote_file_path in file_paths
+    ]
+    written = set()
+    failures = set()
+
+    def write(connection: SMBConnection, file_path: Tuple[str, str]):
+        input_file_path, remote_file_path = file_path
+        temp_file_path = f"{remote_file_path}{temp_file_suffix}"
+        try:
+            _store(
+                connection,
+                share_folder,
+                temp_file_path,
+                input_file_path,
+                timeout,
+                checksum=None,
+                compression=None,
+                retry=None,
+            )
+            written.add(temp_file_path)
+        # Local file might also be missing or unreadable
+        except (OperationFailure, OSError):
+            logger.exception(f"Unable to write {input_file_path}.")
+            failures.add(temp_file_path)
+        # Connection might not be usable anymore (pooled connection is discarded)
+        except Exception:
+            logger.exception(f"Unable to write {input_file_path}.")
+            failures.add(temp_file_path)
+            raise
+
+    def remove(connection: SMBConnection, file_path: str):
+        try:
+            _delete_file(connection, share_folder, file_path)
+        except PyndowsException:
+            logger.exception(f"Unable to remove {file_path}.")
+
+    try:
+        map_connections(connection, write, file_paths)
+    except Exception:
+        # Files that could not be written (or were not even attempted) are reported as failures
+        failures.update(set(temp_file_paths) - written)
+    if failures:
+        map_connections(
+            connection, remove, [path for path in temp_file_paths if path in written]
+        )
+        raise PyndowsException(
+            f"Unable to write {', '.join(path for path in temp_file_paths if path in failures)} "
+            f"within \\\\{connection.remote_name}\\{share_folder}"
+        )
+
+    # Files (then manifest) are renamed only once everything is written
+    _publish(
+        connection,
+        share_folder,
+        [remote_file_path for _, remote_file_path in file_paths],
+        temp_file_suffix,
+    )
+    if manifest_file_path:
+
+        def write_manifest(connection: SMBConnection, manifest: str):
+            try:
+                connection.storeFile(
+                    share_folder,
+                    f"{manifest_file_path}{temp_file_suffix}",
+                    io.BytesIO(manifest.encode()),
+                    timeout,
+                )
+            except OperationFailure:
+                raise PyndowsException(
+                    f"Unable to write {manifest_file_path}{temp_file_suffix} "
+                    f"within \\\\{connection.remote_name}\\{share_folder}"
+                )
+
+        map_connections(
+            connection,
+            write_manifest,
+            ["".join(f"{file_path}\n" for _, file_path in file_paths)],
+        )
+        _publish(connection, share_folder, [manifest_file_path], temp_file_suffix)
+
+    for input_file_path, _ in file_paths:
+        os.remove(input_file_path)
+    logger.info(
+        f"{len(file_paths)} files moved within \\\\{connection.remote_name}\\{share_folder}."
+    )
+
+
+def _publish(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    file_paths: List[str],
+    temp_file_suffix: str,
+):
+    """Rename every temporary file (concurrently if a ConnectionPool is provided)."""
+
+    def publish(connection: SMBConnection, file_path: str) -> Optional[str]:
+        try:
+            _rename_temp_file(connection, share_folder, file_path, temp_file_suffix)
+        except PyndowsException:
+            return file_path
+
+    failures = [
+        failure
+        for failure in map_connections(connection, publish, file_paths)
+        if failure
+    ]
+    if failures:
+        raise PyndowsException(
+            f"Unable to rename temp files into {', '.join(failures)} "
+            f"within \\\\{connection.remote_name}\\{share_folder}"
+        )
+
+
+def purge(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    folder_path: str = "",
+    older_than: Union[datetime.datetime, datetime.timedelta, None] = None,
+    pattern: str = "*",
+    recursive: bool = False,
+    remove_empty_folders: bool = False,
+) -> Dict[str, int]:
+    """
+    Delete files that were not modified for a while.
+
+    Every folder is listed once, files are then deleted (concurrently if a ConnectionPool is provided).
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param folder_path: Folder containing files to delete. Default to the root of the shared folder.
+    :param older_than: Only delete files last written before this time (or more than this duration ago).
+    Every matching file is deleted by default.
+    :param pattern: Only delete files with a name matching this pattern (* and ? wildcards, case-insensitive).
+    Default to every file (*).
+    :param recursive: Delete files within sub folders as well. Default to False.
+    :param remove_empty_folders: Remove sub folders that were emptied by the purge (deepest first). Default to False.
+    :return: Number of "deleted" files, number of "bytes_freed", number of files that "failed" to be deleted
+    and number of "removed_folders".
+    """
+    folder_path = folder_path.rstrip("/")
+    logger.info(f"Purging \\\\{connection.remote_name}\\{share_folder}{folder_path}...")
+    content = _folder_content(connection, share_folder, folder_path, recursive)
+
+    matches = _pattern_regex(pattern).fullmatch
+    before = _timestamp(older_than)
+    targets = [
+        (f"{folder}/{file.filename}", file)
+        for folder, files in content.items()
+        for file in files
+        if not file.isDirectory
+        and matches(file.filename)
+        and (before is None or file.last_write_time < before)
+    ]
+
+    def delete(connection: SMBConnection, file_path: str) -> bool:
+        try:
+            _delete_file(connection, share_folder, file_path)
+            return True
+        except PyndowsException:
+            logger.exception(f"Unable to purge {file_path}.")
+            return False
+
+    outcomes = map_connections(connection, delete, [path for path, _ in targets])
+    deleted = [path for (path, _), outcome in zip(targets, outcomes) if outcome]
+    report = {
+        "deleted": len(deleted),
+        "bytes_freed": sum(
+            file.file_size for (_, file), outcome in zip(targets, outcomes) if outcome
+        ),
+        "failed": outcomes.count(False),
+        "removed_folders": 0,
+    }
+    if remove_empty_folders:
+        report["removed_folders"] = _remove_emptied_folders(
+            connection, share_folder, folder_path, content, deleted
+        )
+
+    logger.info(
+        f"\\\\{connection.remote_name}\\{share_folder}{folder_path} purged: {report}."
+    )
+    return report
+
+
+def _delete_file(connection: SMBConnection, share_folder: str, file_path: str):
+    try:
+        connection.deleteFiles(share_folder, file_path)
+    except OperationFailure:
+        raise PyndowsException(
+            f"Unable to delete \\\\{connection.remote_name}\\{share_folder}{file_path}"
+        )
+
+
+def _folder_content(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    folder_path: str,
+    recursive: bool,
+) -> Dict[str, List[SharedFile]]:
+    """
+    :return: Content of every folder (listing folders of the same depth concurrently if a pool is provided).
+    """
+    content = {}
+    folders = [folder_path]
+    while folders:
+        listings = map_connections(
+            connection,
+            lambda connection, folder: get_folder_content(
+                connection, share_folder, folder
+            ),
+            folders,
+        )
+        content.update(zip(folders, listings))
+        folders = [
+            f"{folder}/{file.filename}"
+            for folder, files in zip(folders, listings)
+            for file in files
+            if recursive and file.isDirectory
+        ]
+    return content
+
+
+def _create_missing_folders(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    folder_paths: Iterable[str],
+    write_to_new_folder_after: float,
+):
+    """
+    Create every folder that does not exist yet, then wait for write_to_new_folder_after if any was created.
+    """
+
+    def create(connection: SMBConnection, folder_paths: List[str]) -> bool:
+        created = False
+        for folder_path in folder_paths:
+            if folder_path in ("", "/") or get_file_desc(
+                connection, share_folder, folder_path
+            ):
+                continue
+            _create_folders(connection, share_folder, folder_path)
+            created = True
+        return created
+
+    # Folders are created one after the other as they may share parents
+    (created,) = map_connections(connection, create, [sorted(set(folder_paths))])
+    if created:
+        time.sleep(write_to_new_folder_after)
+
+
+def _remove_emptied_folders(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    folder_path: str,
+    content: Dict[str, List[SharedFile]],
+    deleted: List[str],
+) -> int:
+    """
+    :return: Number of removed folders.
+    """
+    remaining = {folder: len(files) for folder, files in content.items()}
+    emptied = set()
+
+    def remove_from_parent(path: str):
+        parent = path.rsplit("/", maxsplit=1)[0]
+        remaining[parent] -= 1
+        emptied.add(parent)
+
+    for file_path in deleted:
+        remove_from_parent(file_path)
+
+    def remove(connection: SMBConnection, folder: str) -> bool:
+        try:
+            connection.deleteDirectory(share_folder, folder)
+            return True
+        except OperationFailure:
+            logger.exception(f"Unable to remove {folder} folder.")
+            return False
+
+    removed = 0
+    sub_folders = sorted(
+        (folder for folder in content if folder != folder_path),
+        key=lambda folder: folder.count("/"),
+        reverse=True,
+    )
+    # Deepest folders first, as a folder can only be removed once empty
+    for _, folders in itertools.groupby(
+        sub_folders, key=lambda folder: folder.count("/")
+    ):
+        folders = [
+            folder for folder in folders if folder in emptied and not remaining[folder]
+        ]
+        for folder, outcome in zip(
+            folders, map_connections(connection, remove, folders)
+        ):
+            if outcome:
+                removed += 1
+                remove_from_parent(folder)
+    return removed
+
+
+def _existing_file_names(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    file_paths: List[str],
+) -> Dict[str, Set[str]]:
+    """
+    :return: Lower cased names of existing files (and folders) per folder (listing each folder only once).
+    """
+    folder_paths = sorted({os.path.dirname(file_path) for file_path in file_paths})
+
+    def list_names(connection: SMBConnection, folder_path: str) -> Set[str]:
+        return {
+            file.filename.lower()
+            for file in get_folder_content(connection, share_folder, folder_path)
+        }
+
+    return dict(
+        zip(folder_paths, map_connections(connection, list_names, folder_paths))
+    )
@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadCache:
+    """
+    Local cache of retrieved files, avoiding to retrieve an unchanged file again.
+
+    Files are identified by their remote location, size and last write time.
+    Least recently used files are removed once the cache exceeds its maximum size.
+    """
+
+    def __init__(
+        self, folder_path: str, max_size: int = 1024**3, hard_link: bool = True
+    ):
+        """
+        :param folder_path: Local folder containing cached files (created if needed).
+        :param max_size: Maximum number of bytes stored within the cache. Default to 1GB.
+        :param hard_link: Provide cached files as hard links (instead of copies) when possible.
+        Retrieved files must not be modified in place in such a case. Default to True.
+        """
+        os.makedirs(folder_path, exist_ok=True)
+        self.folder_path = folder_path
+        self.max_size = max_size
+        self.hard_link = hard_link
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256("\0".join(map(str, parts)).encode()).hexdigest()
+
+    def restore(self, key: str, output_file_path: str) -> bool:
+        """
+        Provide the cached file as output_file_path.
+
+        :return: False if file is not cached.
+        """
+        cached_file_path = os.path.join(self.folder_path, key)
+        try:
+            with self._lock:
+                # Mark as most recently used
+                os.utime(cached_file_path)
+            self._provide(cached_file_path, output_file_path)
+        # Not cached, or evicted (by a concurrent store) before being provided
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def _provide(self, cached_file_path: str, output_file_path: str):
+        if os.path.lexists(output_file_path):
+            os.remove(output_file_path)
+        if self.hard_link:
+            try:
+                os.link(cached_file_path, output_file_path)
+                return
+            except FileNotFoundError:
+                raise
+            except OSError:
+                logger.debug(f"Unable to link {cached_file_path}, copying it instead.")
+        shutil.copyfile(cached_file_path, output_file_path)
+
+    def store(self, key: str, file_path: str):
+        """Copy file_path within the cache and remove least recently used files if needed."""
+        descriptor, temp_file_path = tempfile.mkstemp(
+            dir=self.folder_path, suffix=".tmp"
+        )
+        os.close(descriptor)
+        shutil.copyfile(file_path, temp_file_path)
+        os.replace(temp_file_path, os.path.join(self.folder_path, key))
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(self.folder_path)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        )
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                return
+            logger.debug(f"Removing {path} from cache.")
+            os.remove(path)
+            size -= entry_size
+
+    def statistics(self) -> dict:
+        """
+        :return: Number of hits and misses (since the cache was created),
+        number of cached files and number of bytes they use.
+        """
+        sizes = [
+            entry.stat().st_size
+            for entry in os.scandir(self.folder_path)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        ]
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "files": len(sizes),
+                "size": sum(sizes),
+            }
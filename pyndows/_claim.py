@@ -0,0 +1,149 @@
+import logging
+import random
+import re
+import time
+from collections import namedtuple
+from typing import Union, List
+
+from smb.SMBConnection import SMBConnection
+
+from pyndows._exceptions import PyndowsException
+from pyndows._pool import ConnectionPool, map_connections
+from pyndows._windows import get_folder_content, _rename, _pattern_regex
+
+logger = logging.getLogger(__name__)
+
+# A file reserved for a node until expires_at (number of seconds since epoch), accessible via claimed_file_path
+Claim = namedtuple("Claim", ["file_path", "claimed_file_path", "node", "expires_at"])
+
+# file_name.node.expires_at.claimed
+_claimed_name = re.compile(
+    r"(?P<name>.+)\.(?P<node>[^.]+)\.(?P<expires_at>\d+)\.claimed", re.IGNORECASE
+)
+
+
+def claim_files(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    folder_path: str,
+    node: str,
+    max_files: int = 10,
+    lease: float = 300,
+    pattern: str = "*",
+) -> List[Claim]:
+    """
+    Reserve files within a folder shared by many nodes, so that a file is processed by a single node.
+
+    Files are reserved by renaming them (which only one node can do) into file_name.node.expires_at.claimed.
+    Claims that expired (as the node that reserved the file stopped for instance) can be claimed by any node.
+    Nodes try to claim files in a different (random) order to avoid competing for the same files.
+
+    :param connection: Samba connection as returned by connect function.
+    Files are renamed concurrently if a ConnectionPool is provided.
+    :param share_folder: Shared folder name.
+    :param folder_path: Folder containing files to process.
+    :param node: Name of the node claiming files. Must be unique across nodes and cannot contain . / or \\
+    :param max_files: Maximum number of files to claim. Default to 10.
+    :param lease: Number of seconds the files are reserved for (use renew_claim to keep them longer).
+    Default to 5 minutes. Note that clocks of all nodes must be synchronized.
+    :param pattern: Only claim files with a name matching this pattern (* and ? wildcards, case-insensitive).
+    Default to every file (*).
+    :return: Claimed files (at most max_files), empty if there is no file to claim.
+    """
+    if not node or any(character in node for character in "./\\"):
+        raise PyndowsException(f"{node} is not a valid node name.")
+
+    folder_path = folder_path.rstrip("/")
+    now = time.time()
+    matches = _pattern_regex(pattern).fullmatch
+    (files,) = map_connections(
+        connection,
+        lambda connection, folder: get_folder_content(
+            connection, share_folder, folder, include_folders=False
+        ),
+        [folder_path],
+    )
+    candidates = []
+    for file in files:
+        claimed = _claimed_name.fullmatch(file.filename)
+        name = claimed.group("name") if claimed else file.filename
+        if (not claimed or int(claimed.group("expires_at")) < now) and matches(name):
+            candidates.append((f"{folder_path}/{file.filename}", name))
+    random.shuffle(candidates)
+
+    expires_at = int(now + lease)
+
+    def claim(connection: SMBConnection, candidate: tuple) -> Union[Claim, None]:
+        current_file_path, name = candidate
+        file_claim = Claim(
+            file_path=f"{folder_path}/{name}",
+            claimed_file_path=f"{folder_path}/{name}.{node}.{expires_at}.claimed",
+            node=node,
+            expires_at=expires_at,
+        )
+        try:
+            _rename(
+                connection,
+                share_folder,
+                current_file_path,
+                file_claim.claimed_file_path,
+            )
+            return file_claim
+        except PyndowsException:
+            logger.debug(f"{current_file_path} was claimed by another node.")
+
+    claims = []
+    while candidates and len(claims) < max_files:
+        attempts = candidates[: max_files - len(claims)]
+        candidates = candidates[len(attempts) :]
+        claims.extend(
+            file_claim
+            for file_claim in map_connections(connection, claim, attempts)
+            if file_claim
+        )
+
+    logger.info(
+        f"{len(claims)} files claimed by {node} within \\\\{connection.remote_name}\\{share_folder}{folder_path}."
+    )
+    return claims
+
+
+def renew_claim(
+    connection: SMBConnection, share_folder: str, file_claim: Claim, lease: float = 300
+) -> Claim:
+    """
+    Keep a file reserved for longer.
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param file_claim: Claim as returned by claim_files (or renew_claim).
+    :param lease: Number of seconds (from now) the file is reserved for. Default to 5 minutes.
+    :return: The new claim (claimed file path changes).
+    :raises PyndowsException: if the file is not claimed anymore (as the claim expired and another node claimed it).
+    """
+    expires_at = int(time.time() + lease)
+    renewed = file_claim._replace(
+        claimed_file_path=f"{file_claim.file_path}.{file_claim.node}.{expires_at}.claimed",
+        expires_at=expires_at,
+    )
+    _rename(
+        connection,
+        share_folder,
+        file_claim.claimed_file_path,
+        renewed.claimed_file_path,
+    )
+    return renewed
+
+
+def release_claim(connection: SMBConnection, share_folder: str, file_claim: Claim):
+    """
+    Provide a claimed file back (with its original name), so that it can be claimed by any node.
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param file_claim: Claim as returned by claim_files (or renew_claim).
+    :raises PyndowsException: if the file is not claimed anymore.
+    """
+    _rename(
+        connection, share_folder, file_claim.claimed_file_path, file_claim.file_path
+    )
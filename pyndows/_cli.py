@@ -0,0 +1,424 @@
+"""
+pyndows command line interface.
+
+pyndows --machine NAME --ip IP --user USER --share SHARE [-j JOBS] [--json] COMMAND ...
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from smb.SMBConnection import SMBConnection
+from smb.base import NotConnectedError, SMBTimeout
+
+from pyndows._bulk import _folder_content, _create_missing_folders, delete_many
+from pyndows._exceptions import PyndowsException
+from pyndows._pool import ConnectionPool, map_connections
+from pyndows._windows import get, get_file_desc, _send, _pattern_regex
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    """
+    :return: 0 if every operation succeeded, 1 if some failed, 2 if command could not be performed at all.
+    """
+    parser = _parser()
+    args = parser.parse_args(arguments)
+    password = (
+        args.password
+        if args.password is not None
+        else os.environ.get("PYNDOWS_PASSWORD", "")
+    )
+    try:
+        with ConnectionPool(
+            args.machine,
+            args.ip,
+            args.port,
+            args.domain,
+            args.user,
+            password,
+            size=args.jobs,
+        ) as pool:
+            result, success = args.command(pool, args)
+    # Connection (or socket) failures prevent the command from being performed
+    except (PyndowsException, NotConnectedError, SMBTimeout, OSError) as e:
+        print(f"pyndows: {str(e) or type(e).__name__}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_text(result)
+    return 0 if success else 1
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pyndows", description="Access Windows shared folders."
+    )
+    parser.add_argument("--machine", required=True, help="Remote computer name.")
+    parser.add_argument("--ip", required=True, help="Remote computer IP address.")
+    parser.add_argument("--port", type=int, default=445, help="Default to 445.")
+    parser.add_argument("--domain", default="", help="Domain of the user.")
+    parser.add_argument("--user", required=True, help="Name of the user.")
+    parser.add_argument(
+        "--password",
+        help="Password of the user. Default to PYNDOWS_PASSWORD environment variable.",
+    )
+    parser.add_argument("--share", required=True, help="Shared folder name.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=4,
+        help="Number of operations performed concurrently (one connection each). Default to 4.",
+    )
+    parser.add_argument("--json", action="store_true", help="Output results as JSON.")
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not report progress."
+    )
+    commands = parser.add_subparsers(dest="command_name", metavar="COMMAND")
+    commands.required = True
+
+    ls = commands.add_parser("ls", help="List files matching remote patterns.")
+    ls.add_argument("remote", nargs="+", help="Remote paths (such as /folder/*.csv).")
+    ls.add_argument("-r", "--recursive", action="store_true")
+    ls.set_defaults(command=_ls)
+
+    stat = commands.add_parser("stat", help="Describe remote files.")
+    stat.add_argument("remote", nargs="+", help="Remote file paths.")
+    stat.set_defaults(command=_stat)
+
+    get_command = commands.add_parser("get", help="Retrieve remote files.")
+    get_command.add_argument(
+        "remote", nargs="+", help="Remote paths (such as /folder/*.csv)."
+    )
+    get_command.add_argument("local", help="Local destination folder.")
+    get_command.add_argument("-r", "--recursive", action="store_true")
+    get_command.set_defaults(command=_get)
+
+    put = commands.add_parser("put", help="Send local files (keeping them).")
+    put.add_argument("local", nargs="+", help="Local paths (such as folder/*.csv).")
+    put.add_argument("remote", help="Remote destination folder.")
+    put.add_argument("-r", "--recursive", action="store_true")
+    put.set_defaults(command=_put)
+
+    sync = commands.add_parser(
+        "sync",
+        help="Retrieve remote files (or send local files) that are missing or changed.",
+    )
+    sync.add_argument("remote", help="Remote folder.")
+    sync.add_argument("local", help="Local folder.")
+    sync.add_argument(
+        "--upload",
+        action="store_true",
+        help="Send local files instead of retrieving remote files.",
+    )
+    sync.set_defaults(command=_sync)
+
+    rm = commands.add_parser("rm", help="Delete remote files.")
+    rm.add_argument("remote", nargs="+", help="Remote paths (such as /folder/*.csv).")
+    rm.add_argument("-r", "--recursive", action="store_true")
+    rm.set_defaults(command=_rm)
+    return parser
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _describe(path: str, file) -> dict:
+    return {
+        "path": path,
+        "is_directory": bool(file.isDirectory),
+        "size": file.file_size,
+        "last_write_time": file.last_write_time,
+    }
+
+
+def _remote_files(
+    pool: ConnectionPool,
+    share_folder: str,
+    patterns: List[str],
+    recursive: bool,
+    include_folders: bool = False,
+) -> List[Tuple[str, str, object]]:
+    """
+    Wildcards are only supported within the file name. Sub folders are only walked if recursive.
+
+    :return: (path relative to the pattern folder, full path, SharedFile) for every matching file.
+    """
+    files = []
+    for pattern in patterns:
+        folder_path, _, name = pattern.rpartition("/")
+        matches = _pattern_regex(name).fullmatch
+        for folder, content in _folder_content(
+            pool, share_folder, folder_path, recursive
+        ).items():
+            files.extend(
+                (
+                    f"{folder[len(folder_path):]}/{file.filename}".lstrip("/"),
+                    f"{folder}/{file.filename}",
+                    file,
+                )
+                for file in content
+                if (include_folders or not file.isDirectory) and matches(file.filename)
+            )
+    return files
+
+
+def _local_files(patterns: List[str], recursive: bool) -> List[Tuple[str, str]]:
+    """
+    :return: (path relative to the pattern folder, full path) for every matching file.
+    """
+    files = []
+    for pattern in patterns:
+        folder_path, name = os.path.split(pattern)
+        for folder, _, names in os.walk(folder_path or "."):
+            files.extend(
+                (
+                    os.path.relpath(
+                        os.path.join(folder, file_name), folder_path or "."
+                    ),
+                    os.path.join(folder, file_name),
+                )
+                for file_name in names
+                if fnmatch.fnmatch(file_name, name)
+            )
+            if not recursive:
+                break
+    return files
+
+
+def _ls(pool: ConnectionPool, args) -> Tuple[list, bool]:
+    return (
+        [
+            _describe(path, file)
+            for _, path, file in _remote_files(
+                pool, args.share, args.remote, args.recursive, include_folders=True
+            )
+        ],
+        True,
+    )
+
+
+def _stat(pool: ConnectionPool, args) -> Tuple[list, bool]:
+    def stat(connection: SMBConnection, path: str) -> dict:
+        file = get_file_desc(connection, args.share, path)
+        return _describe(path, file) if file else {"path": path, "error": "Not found"}
+
+    result = map_connections(pool, stat, args.remote)
+    return result, not any("error" in description for description in result)
+
+
+def _get(pool: ConnectionPool, args) -> Tuple[dict, bool]:
+    files = [
+        (path, os.path.join(args.local, *relative_path.split("/")), file.file_size)
+        for relative_path, path, file in _remote_files(
+            pool, args.share, args.remote, args.recursive
+        )
+    ]
+
+    def retrieve(connection: SMBConnection, source: str, destination: str):
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        get(connection, args.share, source, destination)
+
+    return _transfer(pool, files, retrieve, args.quiet)
+
+
+def _put(pool: ConnectionPool, args) -> Tuple[dict, bool]:
+    remote_folder = args.remote.rstrip("/")
+    files = [
+        (
+            path,
+            f"{remote_folder}/{relative_path.replace(os.sep, '/')}",
+            os.path.getsize(path),
+        )
+        for relative_path, path in _local_files(args.local, args.recursive)
+    ]
+
+    return _transfer(pool, files, _sender(pool, args, files), args.quiet)
+
+
+def _sync(pool: ConnectionPool, args) -> Tuple[dict, bool]:
+    remote_folder = args.remote.rstrip("/")
+    remote_files = {
+        relative_path: (path, file)
+        for relative_path, path, file in _remote_files(
+            pool, args.share, [f"{remote_folder}/*"], recursive=True
+        )
+    }
+    if args.upload:
+        local_files = _local_files([os.path.join(args.local, "*")], recursive=True)
+        files = []
+        for relative_path, path in local_files:
+            relative_path = relative_path.replace(os.sep, "/")
+            local = os.stat(path)
+            _, remote = remote_files.get(relative_path, (None, None))
+            # Remote file is written after local file, it is identical if it has the same size
+            if (
+                not remote
+                or remote.file_size != local.st_size
+                or remote.last_write_time < local.st_mtime
+            ):
+                files.append((path, f"{remote_folder}/{relative_path}", local.st_size))
+
+        return _transfer(
+            pool,
+            files,
+            _sender(pool, args, files),
+            args.quiet,
+            skipped=len(local_files) - len(files),
+        )
+
+    files = []
+    last_write_times = {}
+    for relative_path, (path, remote) in remote_files.items():
+        destination = os.path.join(args.local, *relative_path.split("/"))
+        # Local file is identical as long as it has the same size and last write time (set once retrieved)
+        if (
+            not os.path.exists(destination)
+            or os.path.getsize(destination) != remote.file_size
+            or int(os.path.getmtime(destination)) != int(remote.last_write_time)
+        ):
+            files.append((path, destination, remote.file_size))
+            last_write_times[path] = remote.last_write_time
+
+    def retrieve(connection: SMBConnection, source: str, destination: str):
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        get(connection, args.share, source, destination)
+        os.utime(destination, (time.time(), last_write_times[source]))
+
+    return _transfer(
+        pool, files, retrieve, args.quiet, skipped=len(remote_files) - len(files)
+    )
+
+
+def _sender(pool: ConnectionPool, args, files: List[Tuple[str, str, int]]) -> callable:
+    # Folders are created (and waited for) once, instead of for every file
+    _create_missing_folders(
+        pool,
+        args.share,
+        [os.path.dirname(destination) for _, destination, _ in files],
+        write_to_new_folder_after=1,
+    )
+
+    def send(connection: SMBConnection, source: str, destination: str):
+        _send(connection, args.share, destination, source, write_to_new_folder_after=0)
+
+    return send
+
+
+def _rm(pool: ConnectionPool, args) -> Tuple[dict, bool]:
+    paths = [
+        path
+        for _, path, _ in _remote_files(pool, args.share, args.remote, args.recursive)
+    ]
+    outcomes = delete_many(pool, args.share, paths)
+    errors = {path: str(error) for path, error in zip(paths, outcomes) if error}
+    return (
+        {
+            "deleted": len(paths) - len(errors),
+            "failed": len(errors),
+            "errors": errors,
+        },
+        not errors,
+    )
+
+
+def _transfer(
+    pool: ConnectionPool,
+    files: List[Tuple[str, str, int]],
+    transfer: callable,
+    quiet: bool,
+    skipped: int = 0,
+) -> Tuple[dict, bool]:
+    """
+    Perform transfer(connection, source, destination) for every (source, destination, size) concurrently.
+    """
+    progress = _Progress(len(files), quiet)
+
+    def perform(connection: SMBConnection, file: Tuple[str, str, int]):
+        source, destination, size = file
+        try:
+            transfer(connection, source, destination)
+            progress.done(source, size)
+        except (PyndowsException, OSError) as e:
+            progress.done(source, 0, e)
+            return str(e)
+
+    outcomes = map_connections(pool, perform, files)
+    errors = {source: error for (source, _, _), error in zip(files, outcomes) if error}
+    summary = progress.summary()
+    summary.update({"skipped": skipped, "failed": len(errors), "errors": errors})
+    return summary, not errors
+
+
+class _Progress:
+    """Report progress (on standard error) as files are transferred."""
+
+    def __init__(self, total: int, quiet: bool):
+        self.total = total
+        self.quiet = quiet
+        self.completed = 0
+        self.transferred = 0
+        self.bytes = 0
+        self.start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def done(self, path: str, size: int, error: Optional[Exception] = None):
+        with self._lock:
+            self.completed += 1
+            if not error:
+                self.transferred += 1
+                self.bytes += size
+            if self.quiet:
+                return
+            status = f"failed: {error}" if error else f"{size} bytes"
+            print(
+                f"[{self.completed}/{self.total}] {path} ({status}), {_rate(self.bytes, self.elapsed())}",
+                file=sys.stderr,
+            )
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def summary(self) -> dict:
+        elapsed = self.elapsed()
+        return {
+            "transferred": self.transferred,
+            "bytes": self.bytes,
+            "seconds": round(elapsed, 3),
+            "bytes_per_second": round(self.bytes / elapsed) if elapsed else 0,
+        }
+
+
+def _rate(size: int, seconds: float) -> str:
+    return f"{size / seconds / 1024 / 1024:.2f} MB/s" if seconds else "- MB/s"
+
+
+def _print_text(result):
+    if isinstance(result, list):
+        for description in result:
+            if "error" in description:
+                print(f"{description['path']}: {description['error']}")
+                continue
+            last_write_time = datetime.datetime.fromtimestamp(
+                description["last_write_time"]
+            ).isoformat(sep=" ", timespec="seconds")
+            print(
+                f"{description['size']:>12} {last_write_time} {description['path']}{'/' if description['is_directory'] else ''}"
+            )
+        return
+
+    for path, error in result.pop("errors").items():
+        print(f"{path}: {error}")
+    print(", ".join(f"{key}: {value}" for key, value in result.items()))
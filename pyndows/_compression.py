@@ -0,0 +1,47 @@
+import os
+from typing import Optional
+import zlib
+
+from pyndows._exceptions import PyndowsException
+
+# Compression inferred from the remote file extension
+_extensions = {".gz": "gzip", ".zst": "zstd"}
+
+
+def resolve(compression: Optional[str], file_path: str) -> Optional[str]:
+    """
+    :param compression: gzip, zstd, infer (to guess from file extension) or None.
+    :param file_path: Remote file path.
+    :return: The compression to use (gzip or zstd), None if file should not be compressed.
+    """
+    if compression == "infer":
+        return _extensions.get(os.path.splitext(file_path)[1].lower())
+    if compression not in (None, "gzip", "zstd"):
+        raise PyndowsException(
+            f"{compression} compression is not supported. Use gzip, zstd or infer."
+        )
+    return compression
+
+
+def compressor(compression: str):
+    """Return an object providing compress(data) and flush() methods."""
+    if compression == "gzip":
+        return zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    return _zstandard().ZstdCompressor().compressobj()
+
+
+def decompressor(compression: str):
+    """Return an object providing decompress(data) and flush() methods."""
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    return _zstandard().ZstdDecompressor().decompressobj()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise PyndowsException(
+            "zstandard module must be installed to use zstd compression."
+        )
+    return zstandard
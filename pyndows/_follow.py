@@ -0,0 +1,109 @@
+import io
+import json
+import logging
+import os
+import time
+from typing import Iterator, Optional
+
+from smb.SMBConnection import SMBConnection
+from smb.smb_structs import OperationFailure
+
+from pyndows._exceptions import PyndowsException
+from pyndows._windows import get_file_desc, _chunk_size
+
+logger = logging.getLogger(__name__)
+
+
+def follow(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    checkpoint_file_path: Optional[str] = None,
+    poll_interval: float = 1,
+    idle_timeout: Optional[float] = None,
+    chunk_size: int = _chunk_size,
+) -> Iterator[bytes]:
+    """
+    Provide the content of a Windows file (such as a log file) as it is appended.
+
+    Only appended bytes are retrieved. If the file is truncated or replaced (detected thanks to its size and creation
+    time), it is read from the start again.
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param file_path: Full path to the file that should be followed.
+    :param checkpoint_file_path: Local file storing the position in the followed file, so that a new call resumes where
+    the previous one stopped. Position is stored once the consumer requests the next chunk (ensuring that a chunk
+    is provided again if it was not processed). The file is read from the start by default.
+    :param poll_interval: Number of seconds to wait before checking for new content. Default to 1 second.
+    :param idle_timeout: Stop once no new content was appended for this number of seconds.
+    Use 0 to stop once the current content was provided. Never stops by default.
+    :param chunk_size: Maximum number of bytes provided at once. Default to 1MB.
+    :return: Appended content, chunk by chunk.
+    :raises PyndowsException: if appended content cannot be retrieved.
+    """
+    description = f"\\\\{connection.remote_name}\\{share_folder}{file_path}"
+    logger.info(f"Following {description}...")
+    offset, create_time = _load_checkpoint(checkpoint_file_path)
+    idle_since = time.monotonic()
+    while True:
+        file = get_file_desc(connection, share_folder, file_path)
+        if file and (file.create_time != create_time or file.file_size < offset):
+            if offset:
+                logger.warning(f"{description} was truncated or replaced.")
+            offset, create_time = 0, file.create_time
+
+        data = (
+            _read(connection, share_folder, file_path, offset, chunk_size)
+            if file and file.file_size > offset
+            else b""
+        )
+        if data:
+            yield data
+            offset += len(data)
+            _save_checkpoint(checkpoint_file_path, offset, create_time)
+            idle_since = time.monotonic()
+            continue
+
+        if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+            logger.info(f"No content appended to {description}, stop following.")
+            return
+        time.sleep(poll_interval)
+
+
+def _read(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    offset: int,
+    chunk_size: int,
+) -> bytes:
+    content = io.BytesIO()
+    try:
+        connection.retrieveFileFromOffset(
+            share_folder, file_path, content, offset, chunk_size
+        )
+    except OperationFailure:
+        raise PyndowsException(
+            f"Unable to retrieve \\\\{connection.remote_name}\\{share_folder}{file_path} file"
+        )
+    return content.getvalue()
+
+
+def _load_checkpoint(checkpoint_file_path: Optional[str]) -> (int, Optional[float]):
+    if not checkpoint_file_path or not os.path.exists(checkpoint_file_path):
+        return 0, None
+    with open(checkpoint_file_path) as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    return checkpoint["offset"], checkpoint["create_time"]
+
+
+def _save_checkpoint(
+    checkpoint_file_path: Optional[str], offset: int, create_time: float
+):
+    if not checkpoint_file_path:
+        return
+    # Replace the checkpoint at once so that it cannot be partially written
+    with open(f"{checkpoint_file_path}.tmp", "w") as checkpoint_file:
+        json.dump({"offset": offset, "create_time": create_time}, checkpoint_file)
+    os.replace(f"{checkpoint_file_path}.tmp", checkpoint_file_path)
@@ -0,0 +1,144 @@
+import threading
+import time
+from typing import Union, Optional, List
+
+from smb.SMBConnection import SMBConnection
+
+from pyndows._pool import ConnectionPool
+from pyndows._windows import check, _failed_check, _reconnect
+
+_statuses = ["pass", "warn", "fail"]
+
+# Clock used to compute the age of checks
+_now = time.monotonic
+
+
+class _UnhealthyConnection(Exception):
+    """Raised within a pooled connection block so that the failing connection is discarded by the pool."""
+
+
+class _Monitored:
+    def __init__(self, computer_name: str, connection):
+        self.computer_name = computer_name
+        self.connection = connection
+        # (status, checks, clock time of the check), replaced at once by the refreshing thread
+        self.latest = None
+        self.thread = None
+
+    def refresh(self):
+        if isinstance(self.connection, ConnectionPool):
+            try:
+                with self.connection.connection() as connection:
+                    status, checks = check(self.computer_name, connection)
+                    if status == "fail":
+                        raise _UnhealthyConnection()
+            except _UnhealthyConnection:
+                pass
+            except Exception as e:
+                status, checks = _failed_check(
+                    self.computer_name, self.connection.remote_name, e
+                )
+        else:
+            try:
+                # Connection might not be usable anymore after a failure
+                if self.latest and self.latest[0] == "fail":
+                    _reconnect(self.connection)
+                status, checks = check(self.computer_name, self.connection)
+            except Exception as e:
+                status, checks = _failed_check(
+                    self.computer_name, self.connection.remote_name, e
+                )
+        self.latest = status, checks, _now()
+
+
+class HealthMonitor:
+    """
+    Check connections in the background, so that health can be provided (as often as needed) without any remote call.
+    """
+
+    def __init__(
+        self,
+        interval: float = 10,
+        warn_after: Optional[float] = None,
+        fail_after: Optional[float] = None,
+    ):
+        """
+        :param interval: Number of seconds between two checks of a connection. Default to 10 seconds.
+        :param warn_after: Number of seconds without refresh before a check is reported as warn.
+        Default to 3 intervals.
+        :param fail_after: Number of seconds without refresh before a check is reported as fail.
+        Default to 6 intervals.
+        """
+        self.interval = interval
+        self.warn_after = warn_after if warn_after is not None else 3 * interval
+        self.fail_after = fail_after if fail_after is not None else 6 * interval
+        self._monitored: List[_Monitored] = []
+        self._stopping = threading.Event()
+
+    def add(self, computer_name: str, connection: Union[SMBConnection, ConnectionPool]):
+        """
+        Check a connection right away, then every interval.
+        A connection failing its check is re-established (or replaced by another pooled connection) before the next
+        check.
+
+        :param computer_name: Remote computer name (identifying the check).
+        :param connection: Samba connection as returned by connect function (should be dedicated to the monitor as
+        it is used from another thread) or a ConnectionPool.
+        """
+        monitored = _Monitored(computer_name, connection)
+        monitored.refresh()
+        monitored.thread = threading.Thread(
+            target=self._monitor, args=(monitored,), daemon=True
+        )
+        self._monitored.append(monitored)
+        monitored.thread.start()
+
+    def health(self) -> (str, dict):
+        """
+        Return the latest health of every connection.
+
+        :return: A tuple with a string providing the worst status (pass, warn, fail) and the checks.
+        Checks are based on https://inadarei.github.io/rfc-healthcheck/
+        A check that was not refreshed for warn_after (or fail_after) seconds is reported as warn (or fail).
+        """
+        now = _now()
+        worst = 0
+        all_checks = {}
+        for monitored in self._monitored:
+            status, checks, checked_at = monitored.latest
+            age = now - checked_at
+            stale_status = (
+                "fail"
+                if age >= self.fail_after
+                else "warn" if age >= self.warn_after else "pass"
+            )
+            if _statuses.index(stale_status) > _statuses.index(status):
+                status = stale_status
+                checks = {
+                    name: {
+                        **details,
+                        "status": stale_status,
+                        "output": f"Last checked {age:.1f} seconds ago.",
+                    }
+                    for name, details in checks.items()
+                }
+            worst = max(worst, _statuses.index(status))
+            all_checks.update(checks)
+        return _statuses[worst], all_checks
+
+    def stop(self):
+        """Stop checking connections."""
+        self._stopping.set()
+        for monitored in self._monitored:
+            monitored.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _monitor(self, monitored: _Monitored):
+        # If refreshing stops (for any reason), the check will be reported as stale
+        while not self._stopping.wait(self.interval):
+            monitored.refresh()
@@ -0,0 +1,183 @@
+import datetime
+import itertools
+import operator
+import time
+from array import array
+from typing import Iterable, Iterator, List, Optional, Union
+
+from smb.SMBConnection import SMB_FILE_ATTRIBUTE_DIRECTORY
+from smb.base import SharedFile
+
+
+class FolderListing:
+    """
+    Content of a folder, stored in a compact way.
+
+    File names are stored within a single (UTF-8 encoded) buffer and every other attribute within a typed array
+    (file_size, alloc_size, create_time, last_access_time, last_write_time, last_attr_change_time and file_attributes).
+    As arrays expose the buffer protocol, they can be shared with other libraries (such as numpy) without any copy.
+
+    SharedFile objects are only created when accessed (by index or while iterating). Note that short_name is not kept.
+    """
+
+    def __init__(self, files: Iterable[SharedFile] = ()):
+        self._names = bytearray()
+        # Start (and end) of every name within _names
+        self._offsets = array("Q", [0])
+        self.file_size = array("q")
+        self.alloc_size = array("q")
+        self.create_time = array("d")
+        self.last_access_time = array("d")
+        self.last_write_time = array("d")
+        self.last_attr_change_time = array("d")
+        self.file_attributes = array("L")
+        for file in files:
+            self.append(file)
+
+    def append(self, file: SharedFile):
+        self._names += file.filename.encode()
+        self._offsets.append(len(self._names))
+        self.file_size.append(file.file_size)
+        self.alloc_size.append(file.alloc_size)
+        self.create_time.append(file.create_time)
+        self.last_access_time.append(file.last_access_time)
+        self.last_write_time.append(file.last_write_time)
+        self.last_attr_change_time.append(file.last_attr_change_time)
+        self.file_attributes.append(file.file_attributes)
+
+    def name(self, index: int) -> str:
+        """File name of the file (or folder) at this index."""
+        index = self._position(index)
+        return self._names[self._offsets[index] : self._offsets[index + 1]].decode()
+
+    def names(self) -> Iterator[str]:
+        return (self.name(index) for index in range(len(self)))
+
+    def is_directory(self, index: int) -> bool:
+        return bool(self.file_attributes[index] & SMB_FILE_ATTRIBUTE_DIRECTORY)
+
+    def select(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_after: Union[datetime.datetime, float, None] = None,
+        modified_before: Union[datetime.datetime, float, None] = None,
+        attributes: int = 0,
+        excluded_attributes: int = 0,
+    ) -> "FolderListing":
+        """
+        Filter files without creating any SharedFile object.
+
+        :param min_size: Only keep files of at least this number of bytes.
+        :param max_size: Only keep files of at most this number of bytes.
+        :param modified_after: Only keep files modified at (or after) this time (datetime or number of seconds since epoch).
+        :param modified_before: Only keep files modified before this time (datetime or number of seconds since epoch).
+        :param attributes: Only keep files with all those attributes (SMB_FILE_ATTRIBUTE_* flags).
+        :param excluded_attributes: Only keep files without any of those attributes (SMB_FILE_ATTRIBUTE_* flags).
+        Use SMB_FILE_ATTRIBUTE_DIRECTORY to only keep files.
+        :return: A new listing with the files matching every condition.
+        """
+        conditions = []
+        if min_size is not None:
+            conditions.append(_compare(operator.ge, self.file_size, min_size))
+        if max_size is not None:
+            conditions.append(_compare(operator.le, self.file_size, max_size))
+        if modified_after is not None:
+            conditions.append(
+                _compare(operator.ge, self.last_write_time, _timestamp(modified_after))
+            )
+        if modified_before is not None:
+            conditions.append(
+                _compare(operator.lt, self.last_write_time, _timestamp(modified_before))
+            )
+        if attributes:
+            conditions.append(
+                _compare(
+                    operator.eq,
+                    _compare(operator.and_, self.file_attributes, attributes),
+                    attributes,
+                )
+            )
+        if excluded_attributes:
+            conditions.append(
+                map(
+                    operator.not_,
+                    _compare(operator.and_, self.file_attributes, excluded_attributes),
+                )
+            )
+
+        mask = itertools.repeat(True, len(self))
+        for condition in conditions:
+            mask = map(operator.and_, mask, condition)
+        return self._subset(list(itertools.compress(range(len(self)), mask)))
+
+    def _subset(self, indices: List[int]) -> "FolderListing":
+        subset = FolderListing()
+        names = [
+            self._names[self._offsets[index] : self._offsets[index + 1]]
+            for index in indices
+        ]
+        subset._names = bytearray(b"".join(names))
+        subset._offsets = array(
+            "Q", itertools.accumulate(itertools.chain([0], map(len, names)))
+        )
+        for column in _columns:
+            values = getattr(self, column)
+            setattr(
+                subset, column, array(values.typecode, map(values.__getitem__, indices))
+            )
+        return subset
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FolderListing index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.file_size)
+
+    def __getitem__(self, index: int) -> SharedFile:
+        index = self._position(index)
+        return SharedFile(
+            create_time=self.create_time[index],
+            last_access_time=self.last_access_time[index],
+            last_write_time=self.last_write_time[index],
+            last_attr_change_time=self.last_attr_change_time[index],
+            file_size=self.file_size[index],
+            alloc_size=self.alloc_size[index],
+            file_attributes=self.file_attributes[index],
+            short_name="",
+            filename=self.name(index),
+        )
+
+    def __iter__(self) -> Iterator[SharedFile]:
+        return (self[index] for index in range(len(self)))
+
+
+_columns = (
+    "file_size",
+    "alloc_size",
+    "create_time",
+    "last_access_time",
+    "last_write_time",
+    "last_attr_change_time",
+    "file_attributes",
+)
+
+
+def _compare(comparison: callable, values: Iterable, value) -> Iterator:
+    """Compare every value with the same value (without any Python level loop)."""
+    return map(comparison, values, itertools.repeat(value))
+
+
+def _timestamp(
+    value: Union[datetime.datetime, datetime.timedelta, float, None],
+) -> Optional[float]:
+    """:return: POSIX timestamp of a datetime, or of now minus a timedelta. Any other value is returned as is."""
+    if isinstance(value, datetime.timedelta):
+        return time.time() - value.total_seconds()
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return value
@@ -0,0 +1,144 @@
+import contextlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Iterable, List
+
+from smb.SMBConnection import SMBConnection
+
+from pyndows._windows import connect
+
+
+class ConnectionPool:
+    """
+    Pool of Samba connections to the same computer, allowing to perform operations concurrently.
+
+    Connections are created when needed (up to size) and reused afterwards.
+    """
+
+    def __init__(
+        self,
+        machine_name: str,
+        ip: str,
+        port: int,
+        domain: str,
+        user_name: str,
+        password: str,
+        size: int = 4,
+    ):
+        """
+        :param machine_name: Remote computer name.
+        :param ip: Remote computer IP address.
+        :param port: Remote computer port.
+        :param domain: Domain of the user.
+        :param user_name: Name of the user.
+        :param password: Password of the user.
+        :param size: Maximum number of connections. Default to 4.
+        """
+        self.remote_name = machine_name
+        self.size = size
+        self._connection_parameters = (
+            machine_name,
+            ip,
+            port,
+            domain,
+            user_name,
+            password,
+        )
+        self._idle_connections = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def connection(self) -> SMBConnection:
+        """
+        Provide a connection that cannot be used by anyone else until the end of the with block.
+        Wait for a connection to be released if size is already reached.
+
+        Connection is closed (instead of being reused) if the with block raises, as it might be unusable.
+        """
+        connection = self._acquire()
+        try:
+            yield connection
+        except BaseException:
+            with contextlib.suppress(Exception):
+                connection.close()
+            self._release_slot()
+            raise
+        self._idle_connections.put(connection)
+
+    def _acquire(self) -> SMBConnection:
+        while True:
+            try:
+                connection = self._idle_connections.get_nowait()
+            except queue.Empty:
+                connection = None
+            if connection:
+                return connection
+
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+
+            if not create:
+                connection = self._idle_connections.get()
+                if connection:
+                    return connection
+                # A connection was discarded, another one can be created
+                continue
+
+            try:
+                return connect(*self._connection_parameters)
+            except Exception:
+                self._release_slot()
+                raise
+
+    def _release_slot(self):
+        with self._lock:
+            self._created -= 1
+        # Wake up anyone waiting for a connection, so that a new one can be created
+        self._idle_connections.put(None)
+
+    def close(self):
+        """Close idle connections."""
+        while True:
+            try:
+                connection = self._idle_connections.get_nowait()
+            except queue.Empty:
+                return
+            if not connection:
+                continue
+            connection.close()
+            with self._lock:
+                self._created -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def map_connections(
+    connection: Union[SMBConnection, ConnectionPool],
+    function: callable,
+    items: Iterable,
+) -> List:
+    """
+    Call function(connection, item) for every item.
+    Calls are performed concurrently (one per pooled connection) when a pool is provided.
+
+    :return: Results of function, in the same order as items.
+    """
+    if not isinstance(connection, ConnectionPool):
+        return [function(connection, item) for item in items]
+
+    pool = connection
+
+    def call(item):
+        with pool.connection() as pooled_connection:
+            return function(pooled_connection, item)
+
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        return list(executor.map(call, items))
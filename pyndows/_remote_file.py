@@ -0,0 +1,155 @@
+import collections
+import io
+import logging
+
+from smb.SMBConnection import SMBConnection
+from smb.smb_structs import OperationFailure
+
+from pyndows._exceptions import PyndowsException
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    Read-only and seekable Windows file.
+
+    Content is retrieved by blocks, only when read. Most recently used blocks are kept in memory.
+    When reading sequentially, following blocks are retrieved within the same request.
+    """
+
+    def __init__(
+        self,
+        connection: SMBConnection,
+        share_folder: str,
+        file_path: str,
+        block_size: int = 64 * 1024,
+        cache_size: int = 64,
+        read_ahead: int = 4,
+    ):
+        super().__init__()
+        self._connection = connection
+        self._share_folder = share_folder
+        self._file_path = file_path
+        self._block_size = block_size
+        self._cache_size = cache_size
+        self._read_ahead = read_ahead
+        self._blocks = collections.OrderedDict()
+        self._last_block = None
+        self._position = 0
+        self.name = f"\\\\{connection.remote_name}\\{share_folder}{file_path}"
+        try:
+            self.size = connection.getAttributes(share_folder, file_path).file_size
+        except OperationFailure:
+            raise FileNotFoundError(f"{self.name} doesn't exist")
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence ({whence})")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        self._checkClosed()
+        buffer = memoryview(buffer).cast("B")
+        read = 0
+        while read < len(buffer) and self._position < self.size:
+            index, start = divmod(self._position, self._block_size)
+            block = self._block(index)[start : start + len(buffer) - read]
+            if not block:
+                break  # File was truncated since it was opened
+            buffer[read : read + len(block)] = block
+            read += len(block)
+            self._position += len(block)
+        return read
+
+    def _block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+        else:
+            block = self._fetch(index)
+        self._last_block = index
+        return block
+
+    def _fetch(self, index: int) -> bytes:
+        count = 1
+        if index - 1 == self._last_block:
+            # Sequential access, retrieve following (not cached) blocks as well
+            last = min(index + self._read_ahead, (self.size - 1) // self._block_size)
+            while index + count <= last and index + count not in self._blocks:
+                count += 1
+
+        content = io.BytesIO()
+        try:
+            self._connection.retrieveFileFromOffset(
+                self._share_folder,
+                self._file_path,
+                content,
+                index * self._block_size,
+                count * self._block_size,
+            )
+        except OperationFailure:
+            raise PyndowsException(f"Unable to read {self.name} file")
+
+        content = content.getvalue()
+        for position in range(count):
+            self._blocks[index + position] = content[
+                position * self._block_size : (position + 1) * self._block_size
+            ]
+        while len(self._blocks) > self._cache_size:
+            self._blocks.popitem(last=False)
+        return content[: self._block_size]
+
+    def close(self):
+        self._blocks.clear()
+        super().close()
+
+
+def open_remote(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    block_size: int = 64 * 1024,
+    cache_size: int = 64,
+    read_ahead: int = 4,
+) -> RemoteFile:
+    """
+    Open a Windows file for reading, without retrieving it.
+
+    Only the blocks containing the bytes that are read are retrieved,
+    allowing to read a small part of a huge file (such as the header or the end of an archive).
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param file_path: Full path to the file that should be read.
+    :param block_size: Number of bytes retrieved at once. Default to 64KB.
+    :param cache_size: Maximum number of blocks kept in memory (most recently used are kept). Default to 64.
+    :param read_ahead: Number of following blocks retrieved (within the same request) when reading sequentially.
+    Default to 4.
+    :return: A read-only and seekable (unbuffered) file object. Wrap it in io.BufferedReader for small reads.
+    :raises FileNotFoundError: if file does not exist.
+    """
+    logger.info(
+        f"Opening file \\\\{connection.remote_name}\\{share_folder}{file_path}..."
+    )
+    return RemoteFile(
+        connection, share_folder, file_path, block_size, cache_size, read_ahead
+    )
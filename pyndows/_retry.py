@@ -0,0 +1,80 @@
+import logging
+import random
+import socket
+import time
+from typing import Optional, Tuple, Type
+
+from smb.base import SMBTimeout, NotConnectedError
+from smb.smb_structs import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Describe how a failed operation should be retried.
+
+    Connection is re-established before every new attempt.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 1,
+        max_backoff: float = 30,
+        jitter: float = 0.1,
+        retry_on: Tuple[Type[Exception], ...] = (
+            OperationFailure,
+            SMBTimeout,
+            NotConnectedError,
+            ConnectionError,
+            socket.timeout,
+        ),
+    ):
+        """
+        :param max_attempts: Maximum number of attempts (including the first one). Default to 3.
+        :param backoff: Number of seconds to wait before the second attempt, doubled for every subsequent attempt.
+        Default to 1 second.
+        :param max_backoff: Maximum number of seconds to wait between two attempts. Default to 30 seconds.
+        :param jitter: Ratio of the waiting time that is randomly added or removed. Default to 10%.
+        :param retry_on: Exceptions that should lead to a new attempt.
+        Default to Samba operation failures, timeouts and connection failures.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_on = retry_on
+
+    def delay(self, attempt: int) -> float:
+        """Number of seconds to wait after this (failed) attempt."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+def call(retry: Optional[RetryPolicy], operation: callable, reconnect: callable):
+    """
+    Call operation (without parameter) and return its result.
+
+    :param retry: Policy to follow in case operation fails. Operation is not retried if None.
+    :param operation: Function to call (on every attempt).
+    :param reconnect: Function to call (without parameter) before every new attempt.
+    """
+    if not retry:
+        return operation()
+
+    attempt = 1
+    while True:
+        try:
+            if attempt > 1:
+                reconnect()
+            return operation()
+        except retry.retry_on as e:
+            if attempt >= retry.max_attempts:
+                raise
+            delay = retry.delay(attempt)
+            logger.warning(
+                f"Attempt {attempt} failed ({type(e).__name__}: {e}). Retrying in {delay:.2f} seconds..."
+            )
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,243 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Dict
+
+from pyndows._exceptions import PyndowsException
+from pyndows._pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    def __init__(self, function: callable, priority: int, size: int, sequence: int):
+        self.function = function
+        self.size = size
+        self.future = Future()
+        self.submitted_at = time.monotonic()
+        # Highest priority first, then first submitted first
+        self.order = (-priority, sequence)
+
+    def __lt__(self, other: "_Job") -> bool:
+        return self.order < other.order
+
+
+class _TokenBucket:
+    """
+    Allow up to bytes_per_second bytes per second (with a burst of one second worth of bytes).
+    """
+
+    def __init__(self, bytes_per_second: float):
+        self.rate = bytes_per_second
+        self.tokens = bytes_per_second
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay(self, size: int, now: float) -> float:
+        """Number of seconds to wait before size bytes can be consumed."""
+        self._refill(now)
+        # Jobs bigger than the burst only wait for a full bucket (and then put the bucket in debt)
+        missing = min(size, self.rate) - self.tokens
+        return missing / self.rate if missing > 0 else 0
+
+    def consume(self, size: int):
+        self.tokens -= size
+
+
+class _Host:
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        max_sessions: int,
+        bytes_per_second: Optional[float],
+    ):
+        self.pool = pool
+        self.max_sessions = max_sessions
+        self.bucket = _TokenBucket(bytes_per_second) if bytes_per_second else None
+        self.queue = []
+        self.running = 0
+        self.started = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def delay(self, now: float) -> Optional[float]:
+        """
+        :return: None if no job can be started on this host, 0 if next job can be started right away,
+        or number of seconds to wait for bandwidth.
+        """
+        if not self.queue or self.running >= self.max_sessions:
+            return None
+        return self.bucket.delay(self.queue[0].size, now) if self.bucket else 0
+
+    def pop(self, now: float) -> _Job:
+        job = heapq.heappop(self.queue)
+        if self.bucket:
+            self.bucket.consume(job.size)
+        wait = now - job.submitted_at
+        self.running += 1
+        self.started += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return job
+
+
+class Scheduler:
+    """
+    Run jobs (such as pyndows.get or pyndows.move calls) against many computers.
+
+    Every computer has its own maximum number of concurrent sessions and bandwidth budget.
+    Computers are served in turn (so that a busy computer does not prevent jobs on others from starting),
+    and jobs with the highest priority are started first on each computer.
+    """
+
+    def __init__(self):
+        self._hosts: Dict[str, _Host] = {}
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        self._last_served: Optional[str] = None
+        self._stopping = False
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def add_host(
+        self,
+        pool: ConnectionPool,
+        max_sessions: Optional[int] = None,
+        bytes_per_second: Optional[float] = None,
+    ):
+        """
+        Allow jobs to be submitted for a computer.
+
+        :param pool: Connections to the computer. Jobs are identified by pool.remote_name.
+        :param max_sessions: Maximum number of jobs running at the same time. Default to pool size.
+        :param bytes_per_second: Maximum number of bytes (as provided by jobs) per second. Unlimited by default.
+        """
+        with self._condition:
+            self._hosts[pool.remote_name] = _Host(
+                pool, max_sessions or pool.size, bytes_per_second
+            )
+
+    def submit(
+        self, remote_name: str, job: callable, priority: int = 0, size: int = 0
+    ) -> Future:
+        """
+        Schedule a job.
+
+        :param remote_name: Remote computer name, as provided to add_host.
+        :param job: Function receiving a Samba connection as single parameter.
+        :param priority: Jobs with highest priority are started first. Default to 0.
+        :param size: Number of bytes the job will transfer, used to respect bandwidth. Default to 0.
+        :return: A future providing the result of job.
+        """
+        with self._condition:
+            if self._stopping:
+                raise PyndowsException("Scheduler is shut down.")
+            host = self._hosts.get(remote_name)
+            if not host:
+                raise PyndowsException(f"{remote_name} was not added to the scheduler.")
+            scheduled = _Job(job, priority, size, next(self._sequence))
+            heapq.heappush(host.queue, scheduled)
+            self._condition.notify_all()
+        return scheduled.future
+
+    def metrics(self) -> Dict[str, dict]:
+        """
+        :return: For every computer, the number of queued and running jobs,
+        the number of jobs started so far and the average and maximum number of seconds they waited before starting.
+        """
+        with self._condition:
+            return {
+                remote_name: {
+                    "queued": len(host.queue),
+                    "running": host.running,
+                    "started": host.started,
+                    "average_wait": (
+                        host.total_wait / host.started if host.started else 0.0
+                    ),
+                    "max_wait": host.max_wait,
+                }
+                for remote_name, host in self._hosts.items()
+            }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting jobs.
+
+        :param wait: Wait for all submitted jobs to be over.
+        Otherwise, queued jobs are cancelled and running jobs are not waited for.
+        """
+        with self._condition:
+            self._stopping = True
+            if not wait:
+                for host in self._hosts.values():
+                    for job in host.queue:
+                        job.future.cancel()
+                    host.queue.clear()
+            self._condition.notify_all()
+            if wait:
+                while any(host.queue or host.running for host in self._hosts.values()):
+                    self._condition.wait()
+        if wait:
+            self._dispatcher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _dispatch(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                delays = {
+                    remote_name: host.delay(now)
+                    for remote_name, host in self._hosts.items()
+                }
+                remote_name = self._next_host(delays)
+                if remote_name is not None:
+                    host = self._hosts[remote_name]
+                    self._last_served = remote_name
+                    job = host.pop(now)
+                    threading.Thread(
+                        target=self._run, args=(host, job), daemon=True
+                    ).start()
+                    continue
+
+                if self._stopping and not any(
+                    host.queue or host.running for host in self._hosts.values()
+                ):
+                    self._condition.notify_all()
+                    return
+
+                waits = [delay for delay in delays.values() if delay]
+                self._condition.wait(timeout=min(waits) if waits else None)
+
+    def _next_host(self, delays: Dict[str, Optional[float]]) -> Optional[str]:
+        """Round robin on computers with a job that can be started right away."""
+        remote_names = list(delays)
+        if self._last_served in remote_names:
+            start = remote_names.index(self._last_served) + 1
+            remote_names = remote_names[start:] + remote_names[:start]
+        for remote_name in remote_names:
+            if delays[remote_name] == 0:
+                return remote_name
+
+    def _run(self, host: _Host, job: _Job):
+        if job.future.set_running_or_notify_cancel():
+            try:
+                with host.pool.connection() as connection:
+                    job.future.set_result(job.function(connection))
+            except Exception as e:
+                logger.exception(f"Job failed on {host.pool.remote_name}.")
+                job.future.set_exception(e)
+
+        with self._condition:
+            host.running -= 1
+            self._condition.notify_all()
@@ -0,0 +1,106 @@
+import logging
+from collections import namedtuple
+from typing import Union, Optional, List
+
+from smb.SMBConnection import SMBConnection
+
+from pyndows._pool import ConnectionPool, map_connections
+from pyndows._windows import get_folder_content
+
+logger = logging.getLogger(__name__)
+
+# Total size (in bytes) and number of files within a folder (including sub folders)
+FolderUsage = namedtuple("FolderUsage", ["path", "size", "files", "folders"])
+
+
+class _Folder:
+    __slots__ = ("path", "depth", "parent", "size", "files", "pending", "folders")
+
+    def __init__(self, path: str, depth: int, parent: Optional["_Folder"]):
+        self.path = path
+        self.depth = depth
+        self.parent = parent
+        self.size = 0
+        self.files = 0
+        # Number of sub folders whose total is not known yet
+        self.pending = 0
+        self.folders: List[FolderUsage] = []
+
+
+def du(
+    connection: Union[SMBConnection, ConnectionPool],
+    share_folder: str,
+    folder_path: str = "",
+    max_depth: Optional[int] = None,
+    progress: Optional[callable] = None,
+) -> FolderUsage:
+    """
+    Compute the size and number of files of a folder and its sub folders.
+
+    Only totals are kept in memory (not the listed files).
+
+    :param connection: Samba connection as returned by connect function.
+    Folders of the same depth are listed concurrently if a ConnectionPool is provided.
+    :param share_folder: Shared folder name.
+    :param folder_path: Folder to compute usage of. Default to the root of the shared folder.
+    :param max_depth: Provide usage of sub folders up to this depth (0 meaning only the requested folder).
+    Deeper folders are still included in totals. Default to every sub folder.
+    :param progress: Function called with the FolderUsage of every folder as soon as its total is known
+    (sub folders first).
+    :return: Usage of the requested folder, with usage of its sub folders (sorted by path) in folders.
+    """
+    root = _Folder(folder_path.rstrip("/"), 0, None)
+    usage = None
+
+    def list_folder(connection: SMBConnection, folder: _Folder) -> (int, int, list):
+        size = files = 0
+        sub_folders = []
+        for file in get_folder_content(connection, share_folder, folder.path):
+            if file.isDirectory:
+                sub_folders.append(file.filename)
+            else:
+                size += file.file_size
+                files += 1
+        return size, files, sub_folders
+
+    def complete(folder: _Folder) -> FolderUsage:
+        while True:
+            folder_usage = FolderUsage(
+                folder.path,
+                folder.size,
+                folder.files,
+                sorted(folder.folders, key=lambda sub_folder: sub_folder.path),
+            )
+            if progress:
+                progress(folder_usage)
+            parent = folder.parent
+            if not parent:
+                return folder_usage
+            parent.size += folder.size
+            parent.files += folder.files
+            if max_depth is None or parent.depth < max_depth:
+                parent.folders.append(folder_usage)
+            parent.pending -= 1
+            if parent.pending:
+                return folder_usage
+            folder = parent
+
+    folders = [root]
+    while folders:
+        listings = map_connections(connection, list_folder, folders)
+        sub_folders = []
+        for folder, (size, files, names) in zip(folders, listings):
+            folder.size += size
+            folder.files += files
+            folder.pending = len(names)
+            sub_folders.extend(
+                _Folder(f"{folder.path}/{name}", folder.depth + 1, folder)
+                for name in names
+            )
+            if not names:
+                usage = complete(folder)
+        logger.debug(f"{len(folders)} folders listed, {len(sub_folders)} remaining.")
+        folders = sub_folders
+
+    # The root folder is always completed last
+    return usage
@@ -1,8 +1,15 @@
+import contextlib
 import datetime
+import hashlib
+import io
 import logging
 import os
-from typing import Optional, List
+import queue
+import re
+import threading
+from typing import Optional, List, Union, Iterable, Callable, Pattern
 import time
+import weakref
 
 from smb.SMBConnection import (
     SMBConnection,
@@ -11,28 +18,34 @@ from smb.SMBConnection import (
     SMB_FILE_ATTRIBUTE_INCL_NORMAL,
     SMB_FILE_ATTRIBUTE_DIRECTORY,
 )
-from smb.base import SharedFile
+from smb.base import SharedFile, NotConnectedError
 from smb.smb_structs import OperationFailure
 
 from pyndows._exceptions import PyndowsException
+from pyndows import _compression, _retry
+from pyndows._cache import DownloadCache
+from pyndows._listing import FolderListing
+from pyndows._retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+# Number of bytes read at once from a local file when it needs to be transformed (compressed for instance)
+_chunk_size = 1024 * 1024
+
+_regex_type = type(re.compile(""))
+
+# Parameters of connections created by connect, used to reconnect
+_sessions = weakref.WeakKeyDictionary()
+
 
 def connect(
     machine_name: str, ip: str, port: int, domain: str, user_name: str, password: str
 ) -> SMBConnection:
     logger.info(f"Connecting to {machine_name} ({ip}:{port})...")
 
-    connection = SMBConnection(
-        user_name,
-        password,
-        "testclient",
-        machine_name,
-        domain=domain,
-        use_ntlm_v2=True,
-        is_direct_tcp=True,
-    )
+    parameters = (user_name, password, "testclient", machine_name)
+    options = {"domain": domain, "use_ntlm_v2": True, "is_direct_tcp": True}
+    connection = SMBConnection(*parameters, **options)
     try:
         if not connection.connect(ip, port):
             raise PyndowsException(
@@ -46,27 +59,118 @@ def connect(
         )
 
     logger.info(f"Connected to {machine_name} ({ip}:{port}).")
+    _sessions[connection] = ip, port, parameters, options
     return connection
 
 
+def _reconnect(connection: SMBConnection):
+    """Re-establish a connection created by connect (other connections are left untouched)."""
+    session = _sessions.get(connection)
+    if not session:
+        return
+
+    ip, port, parameters, options = session
+    logger.info(f"Reconnecting to {connection.remote_name} ({ip}:{port})...")
+    connection.close()
+    # Start a brand new session as the previous one (tree identifiers, message identifiers, negotiated dialect)
+    # is not known by the server anymore
+    type(connection).__init__(connection, *parameters, **options)
+    if not connection.connect(ip, port):
+        raise NotConnectedError(
+            f"Impossible to reconnect to {connection.remote_name} ({ip}:{port})."
+        )
+
+
 def get(
-    connection: SMBConnection, share_folder: str, file_path: str, output_file_path: str
-):
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    output_file_path: str,
+    checksum: Optional[str] = None,
+    expected_checksum: Optional[str] = None,
+    checksum_file_suffix: Optional[str] = None,
+    compression: Optional[str] = None,
+    retry: Optional[RetryPolicy] = None,
+    cache: Optional[DownloadCache] = None,
+) -> Optional[str]:
+    """
+    Retrieve a Windows file locally.
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param file_path: Full path to the file that should be retrieved.
+    :param output_file_path: Path to the local file that will be created (or overwritten).
+    :param checksum: Name of the hash algorithm used to compute the checksum of the file while it is retrieved.
+    Can be any algorithm provided by hashlib (such as "sha256") or by xxhash if installed (such as "xxh64").
+    Checksum is computed on the local (decompressed) content. Checksum is not computed by default.
+    :param expected_checksum: Hexadecimal checksum that the retrieved file must match (requires checksum).
+    Not checked by default.
+    :param checksum_file_suffix: Suffix of the remote file containing the expected checksum (such as ".sha256").
+    Requires checksum. Not checked by default.
+    :param compression: Decompress the remote file while it is retrieved. Can be gzip, zstd (if zstandard is installed)
+    or infer (to decompress .gz and .zst files only). Not decompressed by default.
+    :param retry: Retry policy to follow in case retrieval fails.
+    Retrieval is resumed from the last received byte (after reconnecting). Not retried by default.
+    :param cache: Provide the file from this cache if it did not change (same size and last write time) since it was
+    retrieved. Not cached by default.
+    :return: Hexadecimal checksum of the retrieved file, None if checksum was not provided.
+    :raises PyndowsException: if the checksum does not match (or cannot be checked). Local file is removed in such a case.
+    Also raised (without retrieving anything) if an expected checksum is provided without checksum.
+    """
     logger.info(
         f"Retrieving file \\\\{connection.remote_name}\\{share_folder}{file_path}..."
     )
 
-    with open(output_file_path, "wb") as file:
+    _check_checksum_parameters(checksum, expected_checksum, checksum_file_suffix)
+    compression = _compression.resolve(compression, file_path)
+    hasher = _hasher(checksum) if checksum else None
+    cache_key = (
+        _cache_key(connection, share_folder, file_path, compression) if cache else None
+    )
+    cached = bool(cache_key) and cache.restore(cache_key, output_file_path)
+    if cached:
+        logger.info(
+            f"File \\\\{connection.remote_name}\\{share_folder}{file_path} did not change, using cached version."
+        )
+        if hasher:
+            _hash_file(hasher, output_file_path)
+    else:
+        with open(output_file_path, "wb") as file:
+            output = _HashingWriter(file, hasher) if hasher else file
+            try:
+                if compression:
+                    _retrieve_decompressed(
+                        connection, share_folder, file_path, output, compression, retry
+                    )
+                else:
+                    _retrieve(connection, share_folder, file_path, output, retry)
+            except OperationFailure:
+                raise PyndowsException(
+                    f"Unable to retrieve \\\\{connection.remote_name}\\{share_folder}{file_path} file"
+                )
+
+    if hasher:
         try:
-            connection.retrieveFile(share_folder, file_path, file)
-        except OperationFailure:
-            raise PyndowsException(
-                f"Unable to retrieve \\\\{connection.remote_name}\\{share_folder}{file_path} file"
+            if checksum_file_suffix:
+                expected_checksum = _remote_checksum(
+                    connection, share_folder, f"{file_path}{checksum_file_suffix}"
+                )
+            _verify_checksum(
+                hasher.hexdigest(),
+                expected_checksum,
+                f"\\\\{connection.remote_name}\\{share_folder}{file_path}",
             )
+        except PyndowsException:
+            os.remove(output_file_path)
+            raise
+
+    if cache_key and not cached:
+        cache.store(cache_key, output_file_path)
 
     logger.info(
         f"File \\\\{connection.remote_name}\\{share_folder}{file_path} stored within {output_file_path}."
     )
+    return hasher.hexdigest() if hasher else None
 
 
 def move(
@@ -77,7 +181,13 @@ def move(
     temp_file_suffix=".tmp",
     timeout=30,
     write_to_new_folder_after=1,
-):
+    checksum: Optional[str] = None,
+    expected_checksum: Optional[str] = None,
+    checksum_file_suffix: Optional[str] = None,
+    compression: Optional[str] = None,
+    retry: Optional[RetryPolicy] = None,
+    skip_identical: bool = False,
+) -> Optional[str]:
     """
     Move a local file to a Windows location.
 
@@ -89,37 +199,774 @@ def move(
     :param timeout: Maximum amount of seconds to write the file. Default to 30 seconds.
     :param write_to_new_folder_after: Number of seconds to wait before writing file if folder needed to be created.
     Useful as Microsoft does not seems to release folder right away. Default to 1 second.
+    :param checksum: Name of the hash algorithm used to compute the checksum of the file while it is written.
+    Can be any algorithm provided by hashlib (such as "sha256") or by xxhash if installed (such as "xxh64").
+    Checksum is computed on the local (uncompressed) content. Checksum is not computed by default.
+    :param expected_checksum: Hexadecimal checksum that the written file must match (requires checksum).
+    Not checked by default.
+    :param checksum_file_suffix: Suffix of the local file containing the expected checksum (such as ".sha256").
+    Requires checksum. Not checked by default.
+    :param compression: Compress the file while it is written. Can be gzip, zstd (if zstandard is installed)
+    or infer (to compress .gz and .zst files only). Not compressed by default.
+    :param retry: Retry policy to follow in case folder creation, writing or renaming fails.
+    Only the failed step is performed again (after reconnecting). Writing is resumed from the last byte written
+    (unless file is compressed). Not retried by default.
+    :param skip_identical: Do not write the file if the remote file is considered identical: it has the same size and
+    was written after the local file was last modified. If checksum_file_suffix is provided, remote checksum file
+    (with the same suffix) must also contain the same checksum as the local one (compressed files are only
+    considered identical in such a case). Local file is removed in any case. Always written by default.
+    :return: Hexadecimal checksum of the written file, None if checksum was not provided.
+    :raises PyndowsException: if the checksum does not match (or is expected without checksum).
+    Temporary file is not renamed and local file is not removed in such a case.
     """
     logger.info(
         f"Moving {input_file_path} file to \\\\{connection.remote_name}\\{share_folder}{file_path}..."
     )
+    hexdigest = _send(
+        connection,
+        share_folder,
+        file_path,
+        input_file_path,
+        temp_file_suffix,
+        timeout,
+        write_to_new_folder_after,
+        checksum,
+        expected_checksum,
+        checksum_file_suffix,
+        compression,
+        retry,
+        skip_identical,
+    )
+
+    logger.info(f"File copied. Removing {input_file_path} file...")
+    os.remove(input_file_path)
+
+    logger.info(
+        f"{input_file_path} file moved within \\\\{connection.remote_name}\\{share_folder}{file_path}."
+    )
+    return hexdigest
+
+
+def _send(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    input_file_path: str,
+    temp_file_suffix=".tmp",
+    timeout=30,
+    write_to_new_folder_after=1,
+    checksum: Optional[str] = None,
+    expected_checksum: Optional[str] = None,
+    checksum_file_suffix: Optional[str] = None,
+    compression: Optional[str] = None,
+    retry: Optional[RetryPolicy] = None,
+    skip_identical: bool = False,
+) -> Optional[str]:
+    """
+    Write a local file to a Windows location (keeping the local file). See move for parameters.
+    """
+    _check_checksum_parameters(checksum, expected_checksum, checksum_file_suffix)
+    compression = _compression.resolve(compression, file_path)
+    skip = skip_identical and _is_identical(
+        connection,
+        share_folder,
+        file_path,
+        input_file_path,
+        compression,
+        checksum_file_suffix,
+    )
+    if skip:
+        logger.info(
+            f"\\\\{connection.remote_name}\\{share_folder}{file_path} is identical to {input_file_path}, skipping."
+        )
+        hasher = _hasher(checksum) if checksum else None
+        if hasher:
+            _hash_file(hasher, input_file_path)
+    else:
+        if _retry.call(
+            retry,
+            lambda: _create_folders(
+                connection, share_folder, os.path.dirname(file_path)
+            ),
+            lambda: _reconnect(connection),
+        ):
+            time.sleep(write_to_new_folder_after)
+        try:
+            hasher = _store(
+                connection,
+                share_folder,
+                f"{file_path}{temp_file_suffix}",
+                input_file_path,
+                timeout,
+                checksum,
+                compression,
+                retry,
+            )
+        except OperationFailure:
+            raise PyndowsException(
+                f"Unable to write \\\\{connection.remote_name}\\{share_folder}{file_path}{temp_file_suffix}"
+            )
+
+    if hasher:
+        if checksum_file_suffix:
+            expected_checksum = _local_checksum(input_file_path, checksum_file_suffix)
+        _verify_checksum(
+            hasher.hexdigest(),
+            expected_checksum,
+            (
+                input_file_path
+                if skip
+                else f"\\\\{connection.remote_name}\\{share_folder}{file_path}{temp_file_suffix}"
+            ),
+        )
+
+    if not skip:
+        _rename_temp_file(connection, share_folder, file_path, temp_file_suffix, retry)
+    return hasher.hexdigest() if hasher else None
+
+
+def _retrieve(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    output,
+    retry: Optional[RetryPolicy],
+):
+    if not retry:
+        connection.retrieveFile(share_folder, file_path, output)
+        return
+
+    output = _CountingWriter(output)
+    _retry.call(
+        retry,
+        # Resume from the last received byte
+        lambda: connection.retrieveFileFromOffset(
+            share_folder, file_path, output, output.written
+        ),
+        lambda: _reconnect(connection),
+    )
+
+
+def _cache_key(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    compression: Optional[str],
+) -> Optional[str]:
+    """
+    :return: None if file does not exist (so that retrieval reports the failure).
+    """
+    file = get_file_desc(connection, share_folder, file_path)
+    if file:
+        return DownloadCache.key(
+            connection.remote_name,
+            share_folder,
+            file_path,
+            file.file_size,
+            file.last_write_time,
+            compression,
+        )
+
+
+def _hash_file(hasher, file_path: str):
+    with open(file_path, "rb") as file:
+        _advise_sequential(file)
+        for chunk in _read_chunks(file):
+            hasher.update(chunk)
+
+
+def _read_chunks(file, size: Optional[int] = None):
+    """
+    Read a local file chunk by chunk, reusing the same buffer.
+    A chunk must be consumed before requesting the next one.
+
+    :param size: Maximum number of bytes to read. Read until the end of file by default.
+    """
+    buffer = memoryview(bytearray(_chunk_size))
+    while size is None or size > 0:
+        read = file.readinto(
+            buffer if size is None else buffer[: min(size, _chunk_size)]
+        )
+        if not read:
+            return
+        if size is not None:
+            size -= read
+        yield buffer[:read]
+
+
+def _advise_sequential(file):
+    """Let the operating system read ahead more aggressively (if supported)."""
+    # This is only a hint, pipes for instance do not support it
+    with contextlib.suppress(OSError):
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+class _CountingWriter:
+    """
+    Count the number of bytes written to the underlying file.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        self.written += len(data)
+        return self._file.write(data)
+
+
+def _retrieve_decompressed(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    output,
+    compression: str,
+    retry: Optional[RetryPolicy],
+):
+    decompressor = _compression.decompressor(compression)
+    pipe = _Pipe(buffers=8)
+
+    # Decompress in a dedicated thread so that CPU work overlaps network I/O
+    def decompress():
+        for chunk in iter(pipe.read_chunk, b""):
+            output.write(decompressor.decompress(chunk))
+        output.write(decompressor.flush())
+
+    consumer = _consume_in_background(pipe, decompress)
+    try:
+        _retrieve(connection, share_folder, file_path, pipe, retry)
+    except PyndowsException:
+        pass  # Pipe was closed due to a decompression failure (reported below)
+    finally:
+        pipe.end()
+        consumer.join()
+
+    if pipe.failure:
+        raise PyndowsException(
+            f"Unable to decompress ({compression}) \\\\{connection.remote_name}\\{share_folder}{file_path} file"
+        ) from pipe.failure
+
+
+def _is_identical(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    input_file_path: str,
+    compression: Optional[str],
+    checksum_file_suffix: Optional[str],
+) -> bool:
+    remote_file = get_file_desc(connection, share_folder, file_path)
+    if not remote_file or remote_file.isDirectory:
+        return False
+
+    local_file = os.stat(input_file_path)
+    if remote_file.last_write_time < local_file.st_mtime:
+        return False
+    # Compressed size cannot be compared, only checksum can tell
+    if not compression and remote_file.file_size != local_file.st_size:
+        return False
+    if not checksum_file_suffix:
+        return not compression
 
-    if _create_folders(connection, share_folder, os.path.dirname(file_path)):
-        time.sleep(write_to_new_folder_after)
     try:
+        remote_checksum = _remote_checksum(
+            connection, share_folder, f"{file_path}{checksum_file_suffix}"
+        )
+    except PyndowsException:
+        return False
+    return _normalize_checksum(remote_checksum) == _normalize_checksum(
+        _local_checksum(input_file_path, checksum_file_suffix)
+    )
+
+
+def _local_checksum(input_file_path: str, checksum_file_suffix: str) -> str:
+    with open(f"{input_file_path}{checksum_file_suffix}") as checksum_file:
+        return checksum_file.read()
+
+
+def _store(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    input_file_path: str,
+    timeout: int,
+    checksum: Optional[str],
+    compression: Optional[str],
+    retry: Optional[RetryPolicy],
+):
+    """
+    :return: The hasher fed with the whole local file content (None if checksum is not provided).
+    """
+    attempts = []
+
+    def store():
+        # Resume from the last byte written on a new attempt (compressed content cannot be resumed)
+        offset = (
+            _remote_file_size(connection, share_folder, file_path)
+            if attempts and not compression
+            else 0
+        )
+        attempts.append(offset)
+        hasher = _hasher(checksum) if checksum else None
         with open(input_file_path, "rb") as input_file:
-            connection.storeFile(
-                share_folder, f"{file_path}{temp_file_suffix}", input_file, timeout
+            _advise_sequential(input_file)
+            # Content that was already written must still be part of the checksum
+            if hasher:
+                for chunk in _read_chunks(input_file, offset):
+                    hasher.update(chunk)
+            # Only seek when resuming, as some files (such as pipes) cannot be seeked
+            elif offset:
+                input_file.seek(offset)
+            source = _HashingReader(input_file, hasher) if hasher else input_file
+            if compression:
+                _store_compressed(
+                    connection, share_folder, file_path, source, timeout, compression
+                )
+            elif offset:
+                connection.storeFileFromOffset(
+                    share_folder, file_path, source, offset, False, timeout
+                )
+            else:
+                connection.storeFile(share_folder, file_path, source, timeout)
+        return hasher
+
+    return _retry.call(retry, store, lambda: _reconnect(connection))
+
+
+def _remote_file_size(
+    connection: SMBConnection, share_folder: str, file_path: str
+) -> int:
+    file = get_file_desc(connection, share_folder, file_path)
+    return file.file_size if file else 0
+
+
+def _store_compressed(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    source,
+    timeout: int,
+    compression: str,
+):
+    compressor = _compression.compressor(compression)
+    pipe = _Pipe(buffers=8)
+
+    # Compress in a dedicated thread so that CPU work overlaps network I/O
+    def compress():
+        for chunk in _read_chunks(source):
+            pipe.write(compressor.compress(chunk))
+        pipe.write(compressor.flush())
+
+    producer = _produce_in_background(pipe, compress)
+    try:
+        connection.storeFile(share_folder, file_path, pipe, timeout)
+    finally:
+        pipe.close()
+        producer.join()
+
+    if pipe.failure:
+        raise PyndowsException(
+            f"Unable to compress ({compression}) \\\\{connection.remote_name}\\{share_folder}{file_path} file"
+        ) from pipe.failure
+
+
+def _check_checksum_parameters(
+    checksum: Optional[str],
+    expected_checksum: Optional[str],
+    checksum_file_suffix: Optional[str],
+):
+    # Expected checksum would be silently ignored as it is compared to the computed one
+    if not checksum and (expected_checksum is not None or checksum_file_suffix):
+        raise PyndowsException(
+            "checksum (hash algorithm name) must be provided to check a checksum."
+        )
+
+
+def _hasher(checksum: str):
+    if checksum.startswith("xxh"):
+        try:
+            import xxhash
+        except ImportError:
+            raise PyndowsException(
+                f"xxhash module must be installed to compute {checksum} checksum."
             )
+        return getattr(xxhash, checksum)()
+    return hashlib.new(checksum)
+
+
+def _verify_checksum(
+    actual_checksum: str, expected_checksum: Optional[str], description: str
+):
+    if expected_checksum is None:
+        return
+
+    expected_checksum = _normalize_checksum(expected_checksum)
+    if actual_checksum != expected_checksum:
+        raise PyndowsException(
+            f"Checksum mismatch for {description}: expected {expected_checksum} but was {actual_checksum}"
+        )
+
+
+def _normalize_checksum(checksum: str) -> str:
+    # Checksum files usually contains the checksum followed by the file name
+    return (checksum.split() or [""])[0].lower()
+
+
+def _remote_checksum(
+    connection: SMBConnection, share_folder: str, checksum_file_path: str
+) -> str:
+    checksum_file = io.BytesIO()
+    try:
+        connection.retrieveFile(share_folder, checksum_file_path, checksum_file)
     except OperationFailure:
         raise PyndowsException(
-            f"Unable to write \\\\{connection.remote_name}\\{share_folder}{file_path}{temp_file_suffix}"
+            f"Unable to retrieve \\\\{connection.remote_name}\\{share_folder}{checksum_file_path} file"
+        )
+    return checksum_file.getvalue().decode()
+
+
+class _HashingWriter:
+    """
+    Update a hash with every chunk written to the underlying file.
+    """
+
+    def __init__(self, file, hasher):
+        self._file = file
+        self._hasher = hasher
+
+    def write(self, data: bytes) -> int:
+        self._hasher.update(data)
+        return self._file.write(data)
+
+
+class _HashingReader:
+    """
+    Update a hash with every chunk read from the underlying file.
+    """
+
+    def __init__(self, file, hasher):
+        self._file = file
+        self._hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self._hasher.update(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        read = self._file.readinto(buffer)
+        self._hasher.update(buffer[:read])
+        return read
+
+
+def copy(
+    connection: SMBConnection,
+    share_folder: str,
+    source_file_path: str,
+    destination_file_path: str,
+    temp_file_suffix=".tmp",
+    timeout=30,
+    write_to_new_folder_after=1,
+    chunk_size: int = 1024 * 1024,
+) -> int:
+    """
+    Copy a file to another location of the same shared folder, without storing it locally.
+
+    pysmb does not provide server-side copy (FSCTL_SRV_COPYCHUNK), so content is streamed through memory,
+    one chunk at a time, using offset reads and writes.
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param source_file_path: Full path to the file that should be copied.
+    :param destination_file_path: Expected full path to the file that should be created. Folders will be created if needed.
+    :param temp_file_suffix: Suffix of the file while being copied. Default to ".tmp".
+    :param timeout: Maximum amount of seconds to read or write a chunk. Default to 30 seconds.
+    :param write_to_new_folder_after: Number of seconds to wait before writing file if folder needed to be created.
+    Useful as Microsoft does not seems to release folder right away. Default to 1 second.
+    :param chunk_size: Maximum number of bytes held in memory at once. Default to 1MB.
+    :return: Number of bytes copied.
+    """
+    logger.info(
+        f"Copying \\\\{connection.remote_name}\\{share_folder}{source_file_path} "
+        f"to \\\\{connection.remote_name}\\{share_folder}{destination_file_path} (streamed)..."
+    )
+
+    if _create_folders(
+        connection, share_folder, os.path.dirname(destination_file_path)
+    ):
+        time.sleep(write_to_new_folder_after)
+
+    buffer = io.BytesIO()
+    offset = 0
+    # Temp file might exist (partially written) as soon as a first chunk was stored
+    storing = False
+    try:
+        while True:
+            buffer.seek(0)
+            buffer.truncate()
+            try:
+                _, read = connection.retrieveFileFromOffset(
+                    share_folder, source_file_path, buffer, offset, chunk_size, timeout
+                )
+            except OperationFailure:
+                raise PyndowsException(
+                    f"Unable to retrieve \\\\{connection.remote_name}\\{share_folder}{source_file_path} file"
+                )
+
+            buffer.seek(0)
+            storing = True
+            try:
+                connection.storeFileFromOffset(
+                    share_folder,
+                    f"{destination_file_path}{temp_file_suffix}",
+                    buffer,
+                    offset,
+                    offset == 0,
+                    timeout,
+                )
+            except OperationFailure:
+                raise PyndowsException(
+                    f"Unable to write \\\\{connection.remote_name}\\{share_folder}{destination_file_path}{temp_file_suffix}"
+                )
+
+            offset += read
+            if read < chunk_size:
+                break
+    except PyndowsException:
+        if storing:
+            _remove_temp_file(
+                connection, share_folder, destination_file_path, temp_file_suffix
+            )
+        raise
+
+    _rename_temp_file(connection, share_folder, destination_file_path, temp_file_suffix)
+
+    logger.info(
+        f"{offset} bytes copied within \\\\{connection.remote_name}\\{share_folder}{destination_file_path}."
+    )
+    return offset
+
+
+def transfer(
+    source_connection: SMBConnection,
+    source_share_folder: str,
+    source_file_path: str,
+    destination_connection: SMBConnection,
+    destination_share_folder: str,
+    destination_file_path: str,
+    temp_file_suffix=".tmp",
+    timeout=30,
+    write_to_new_folder_after=1,
+    buffers: int = 8,
+) -> int:
+    """
+    Transfer a file from a Windows location to another (usually on another computer), without storing it locally.
+
+    Content is read from the source connection while being written to the destination connection.
+
+    :param source_connection: Samba connection to read the file from, as returned by connect function.
+    :param source_share_folder: Shared folder name on the source connection.
+    :param source_file_path: Full path to the file that should be transferred.
+    :param destination_connection: Samba connection to write the file to, as returned by connect function.
+    Must not be the same connection as source_connection (use copy function instead).
+    :param destination_share_folder: Shared folder name on the destination connection.
+    :param destination_file_path: Expected full path to the file that should be created. Folders will be created if needed.
+    :param temp_file_suffix: Suffix of the file while being copied. Default to ".tmp".
+    :param timeout: Maximum amount of seconds to write the file. Default to 30 seconds.
+    :param write_to_new_folder_after: Number of seconds to wait before writing file if folder needed to be created.
+    Useful as Microsoft does not seems to release folder right away. Default to 1 second.
+    :param buffers: Maximum number of chunks read but not yet written. Default to 8.
+    :return: Number of bytes transferred.
+    """
+    source = (
+        f"\\\\{source_connection.remote_name}\\{source_share_folder}{source_file_path}"
+    )
+    destination = f"\\\\{destination_connection.remote_name}\\{destination_share_folder}{destination_file_path}"
+    logger.info(f"Transferring {source} to {destination}...")
+
+    if _create_folders(
+        destination_connection,
+        destination_share_folder,
+        os.path.dirname(destination_file_path),
+    ):
+        time.sleep(write_to_new_folder_after)
+
+    pipe = _Pipe(buffers)
+    reader = _produce_in_background(
+        pipe,
+        lambda: source_connection.retrieveFile(
+            source_share_folder, source_file_path, pipe
+        ),
+    )
+    try:
+        destination_connection.storeFile(
+            destination_share_folder,
+            f"{destination_file_path}{temp_file_suffix}",
+            pipe,
+            timeout,
+        )
+    except OperationFailure:
+        _remove_temp_file(
+            destination_connection,
+            destination_share_folder,
+            destination_file_path,
+            temp_file_suffix,
         )
+        raise PyndowsException(f"Unable to write {destination}{temp_file_suffix}")
+    finally:
+        pipe.close()
+        reader.join()
+
+    if pipe.failure:
+        # Destination received an end of file, what was written is not the source content
+        _remove_temp_file(
+            destination_connection,
+            destination_share_folder,
+            destination_file_path,
+            temp_file_suffix,
+        )
+        raise PyndowsException(f"Unable to retrieve {source} file") from pipe.failure
+
+    _rename_temp_file(
+        destination_connection,
+        destination_share_folder,
+        destination_file_path,
+        temp_file_suffix,
+    )
+
+    logger.info(f"{pipe.transferred} bytes transferred within {destination}.")
+    return pipe.transferred
+
+
+class _Pipe:
+    """
+    Bounded in-memory pipe between a thread writing chunks (retrieveFile) and a reader (storeFile).
+    """
+
+    def __init__(self, buffers: int):
+        self._chunks = queue.Queue(maxsize=buffers)
+        self._pending = b""
+        # Position of the first unread byte within the pending chunk
+        self._offset = 0
+        self._eof = False
+        self._closed = threading.Event()
+        self.failure: Optional[Exception] = None
+        self.transferred = 0
 
+    def _put(self, chunk: Optional[bytes]) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._chunks.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def write(self, data: bytes) -> int:
+        if not self._put(bytes(data)):
+            raise PyndowsException("Pipe was closed by reader.")
+        return len(data)
+
+    def end(self, failure: Optional[Exception] = None):
+        """Signal that nothing else will be written (in case of failure as well)."""
+        if failure:
+            self.failure = failure
+        self._put(None)
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            return b"".join(iter(self.read_chunk, b""))
+        return self.read_chunk(size)
+
+    def read_chunk(self, size: Optional[int] = None) -> bytes:
+        """Return at most size bytes (a whole written chunk by default), empty bytes once everything was read."""
+        while self._offset >= len(self._pending) and not self._eof:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._pending, self._offset = chunk, 0
+
+        # Only the returned bytes are copied (a whole chunk is returned as is)
+        end = len(self._pending) if size is None else self._offset + size
+        data = self._pending[self._offset : end]
+        self._offset += len(data)
+        self.transferred += len(data)
+        return data
+
+    def close(self):
+        """Signal that nothing else will be read."""
+        self._closed.set()
+
+
+def _produce_in_background(pipe: _Pipe, produce: callable) -> threading.Thread:
+    """Write to the pipe in a dedicated thread. Failure is stored within the pipe."""
+
+    def run():
+        try:
+            produce()
+            pipe.end()
+        except Exception as e:
+            pipe.end(e)
+
+    producer = threading.Thread(target=run, daemon=True)
+    producer.start()
+    return producer
+
+
+def _consume_in_background(pipe: _Pipe, consume: callable) -> threading.Thread:
+    """Read from the pipe in a dedicated thread. Failure is stored within the pipe."""
+
+    def run():
+        try:
+            consume()
+        except Exception as e:
+            pipe.failure = e
+        finally:
+            pipe.close()
+
+    consumer = threading.Thread(target=run, daemon=True)
+    consumer.start()
+    return consumer
+
+
+def _rename_temp_file(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    temp_file_suffix: str,
+    retry: Optional[RetryPolicy] = None,
+):
     if temp_file_suffix:
         try:
-            connection.rename(share_folder, f"{file_path}{temp_file_suffix}", file_path)
+            _retried_rename(
+                connection,
+                share_folder,
+                f"{file_path}{temp_file_suffix}",
+                file_path,
+                retry,
+            )
         except OperationFailure:
             raise PyndowsException(
                 f"Unable to rename temp file into \\\\{connection.remote_name}\\{share_folder}{file_path}"
             )
 
-    logger.info(f"File copied. Removing {input_file_path} file...")
-    os.remove(input_file_path)
 
-    logger.info(
-        f"{input_file_path} file moved within \\\\{connection.remote_name}\\{share_folder}{file_path}."
-    )
+def _remove_temp_file(
+    connection: SMBConnection,
+    share_folder: str,
+    file_path: str,
+    temp_file_suffix: str,
+):
+    """Remove what was written of a file that could not be fully written. Failure to do so is only logged."""
+    if temp_file_suffix:
+        try:
+            connection.deleteFiles(share_folder, f"{file_path}{temp_file_suffix}")
+        except OperationFailure:
+            logger.exception(
+                f"Unable to remove \\\\{connection.remote_name}\\{share_folder}{file_path}{temp_file_suffix}"
+            )
 
 
 def _create_folders(
@@ -152,10 +999,28 @@ def _create_folder(
 
 
 def rename(
-    connection: SMBConnection, share_folder: str, old_file_path: str, new_file_path: str
+    connection: SMBConnection,
+    share_folder: str,
+    old_file_path: str,
+    new_file_path: str,
+    retry: Optional[RetryPolicy] = None,
 ):
-    if get_file_desc(connection, share_folder, old_file_path):
-        _rename(connection, share_folder, old_file_path, new_file_path)
+    """
+    Rename a file or a folder.
+
+    :param connection: Samba connection as returned by connect function.
+    :param share_folder: Shared folder name.
+    :param old_file_path: Full path to the file that should be renamed.
+    :param new_file_path: Full path to the renamed file.
+    :param retry: Retry policy to follow in case renaming fails (after reconnecting). Not retried by default.
+    :raises FileNotFoundError: if file does not exist.
+    """
+    if _retry.call(
+        retry,
+        lambda: get_file_desc(connection, share_folder, old_file_path),
+        lambda: _reconnect(connection),
+    ):
+        _rename(connection, share_folder, old_file_path, new_file_path, retry)
     else:
         raise FileNotFoundError(
             f"\\\\{connection.remote_name}\\{share_folder}{old_file_path} doesn't exist"
@@ -163,14 +1028,18 @@ def rename(
 
 
 def _rename(
-    connection: SMBConnection, share_folder: str, old_file_path: str, new_file_path: str
+    connection: SMBConnection,
+    share_folder: str,
+    old_file_path: str,
+    new_file_path: str,
+    retry: Optional[RetryPolicy] = None,
 ):
     logger.info(
         f"Renaming \\\\{connection.remote_name}\\{share_folder}{old_file_path} "
         f"into \\\\{connection.remote_name}\\{share_folder}{new_file_path}..."
     )
     try:
-        connection.rename(share_folder, old_file_path, new_file_path)
+        _retried_rename(connection, share_folder, old_file_path, new_file_path, retry)
         logger.info("File renamed...")
     except OperationFailure:
         raise PyndowsException(
@@ -179,13 +1048,37 @@ def _rename(
         )
 
 
+def _retried_rename(
+    connection: SMBConnection,
+    share_folder: str,
+    old_file_path: str,
+    new_file_path: str,
+    retry: Optional[RetryPolicy],
+):
+    attempts = []
+
+    def rename():
+        # A previous attempt may have succeeded with only its response being lost
+        if (
+            attempts
+            and not get_file_desc(connection, share_folder, old_file_path)
+            and get_file_desc(connection, share_folder, new_file_path)
+        ):
+            return
+        attempts.append(old_file_path)
+        connection.rename(share_folder, old_file_path, new_file_path)
+
+    _retry.call(retry, rename, lambda: _reconnect(connection))
+
+
 def get_folder_content(
     connection: SMBConnection,
     share_folder: str,
     folder_path: str = "",
     include_folders: bool = True,
-    pattern: str = "*",
-) -> List[SharedFile]:
+    pattern: Union[str, Iterable[str], Pattern, Callable[[SharedFile], bool]] = "*",
+    compact: bool = False,
+) -> Union[List[SharedFile], FolderListing]:
     """
     Returns a list of files or folders matching given pattern within a folder (non-recursively).
 
@@ -199,7 +1092,12 @@ def get_folder_content(
     :param pattern: Filter out files or sub folders based on this pattern (`*` character means all).
     Include everything but . and .. by default (*).
     Respects the MS-CIFS protocol. https://docs.microsoft.com/en-us/openspecs/windows_protocols/ms-cifs/dc92d939-ec45-40c8-96e5-4c4091e4ab43
-    :return: A List of SharedFile objects, empty if the given folder does not exist.
+    Can also be a list of patterns (with * and ? wildcards, case-insensitive), a compiled regular expression
+    (that file names must fully match) or a function returning True for the SharedFile objects to keep.
+    A single pattern is matched by the server, otherwise the folder is listed once and filtered locally.
+    :param compact: Return a FolderListing instead of a list of SharedFile objects.
+    Use it for folders containing a huge number of files as it requires a lot less memory.
+    :return: A List of SharedFile objects (or a FolderListing), empty if the given folder does not exist.
     """
     search = (
         SMB_FILE_ATTRIBUTE_READONLY
@@ -208,19 +1106,61 @@ def get_folder_content(
     )
     if include_folders:
         search = search | SMB_FILE_ATTRIBUTE_DIRECTORY
+    pattern, matches = _listing_pattern(pattern)
     logger.info(
         f"Listing the content of \\\\{connection.remote_name}\\{share_folder}\\{folder_path} ..."
     )
     try:
-        return [
-            file
-            for file in connection.listPath(
-                share_folder, folder_path, pattern=pattern, search=search
-            )
-            if file.filename not in (".", "..")
-        ]
+        files = connection.listPath(
+            share_folder, folder_path, pattern=pattern, search=search
+        )
     except OperationFailure:
-        return []
+        return FolderListing() if compact else []
+
+    files = (file for file in files if file.filename not in (".", ".."))
+    if matches:
+        files = filter(matches, files)
+    return FolderListing(files) if compact else list(files)
+
+
+def _listing_pattern(pattern) -> (str, Optional[callable]):
+    """
+    :return: The pattern to provide to the server and the function filtering listed files (None if not needed).
+    """
+    if isinstance(pattern, str):
+        return pattern, None
+    if isinstance(pattern, _regex_type):
+        return "*", lambda file: pattern.fullmatch(file.filename)
+    if callable(pattern):
+        return "*", pattern
+
+    patterns = list(pattern)
+    # A single pattern is selective enough to let the server filter
+    if len(patterns) == 1:
+        return patterns[0], None
+    # Every file is requested anyway
+    if "*" in patterns:
+        return "*", None
+    matches = _pattern_regex(*patterns).fullmatch
+    return "*", lambda file: matches(file.filename)
+
+
+def _pattern_regex(*patterns: str):
+    """Convert * and ? wildcards into a (case-insensitive) regular expression matching any of the patterns."""
+    return re.compile(
+        "|".join(
+            "".join(
+                (
+                    ".*"
+                    if character == "*"
+                    else "." if character == "?" else re.escape(character)
+                )
+                for character in pattern
+            )
+            for pattern in patterns
+        ),
+        re.IGNORECASE | re.DOTALL,
+    )
 
 
 def get_file_desc(
@@ -266,14 +1206,20 @@ def check(computer_name: str, connection: SMBConnection) -> (str, dict):
             },
         )
     except Exception as e:
-        return (
-            "fail",
-            {
-                f"{computer_name}:echo": {
-                    "componentType": connection.remote_name,
-                    "status": "fail",
-                    "time": datetime.datetime.utcnow().isoformat(),
-                    "output": str(e),
-                }
-            },
-        )
+        return _failed_check(computer_name, connection.remote_name, e)
+
+
+def _failed_check(
+    computer_name: str, remote_name: str, error: Exception
+) -> (str, dict):
+    return (
+        "fail",
+        {
+            f"{computer_name}:echo": {
+                "componentType": remote_name,
+                "status": "fail",
+                "time": datetime.datetime.utcnow().isoformat(),
+                "output": str(error),
+            }
+        },
+    )
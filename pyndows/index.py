@@ -0,0 +1,268 @@
+"""
+Local (SQLite) index of the content of shared folders.
+
+Once refreshed, files can be searched by path, size, time or name without any remote call.
+"""
+
+import datetime
+import logging
+import sqlite3
+from collections import namedtuple
+from typing import Optional, List, Union
+
+from smb.SMBConnection import SMBConnection
+from smb.smb_structs import OperationFailure
+
+from pyndows._listing import _timestamp
+from pyndows._windows import get_folder_content
+
+logger = logging.getLogger(__name__)
+
+IndexedFile = namedtuple(
+    "IndexedFile",
+    [
+        "path",
+        "is_directory",
+        "file_size",
+        "create_time",
+        "last_write_time",
+        "file_attributes",
+    ],
+)
+
+_schema = """
+CREATE TABLE IF NOT EXISTS folders (
+    share TEXT NOT NULL,
+    path TEXT NOT NULL,
+    last_write_time REAL,
+    PRIMARY KEY (share, path)
+);
+CREATE TABLE IF NOT EXISTS files (
+    share TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_directory INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    create_time REAL NOT NULL,
+    last_write_time REAL NOT NULL,
+    file_attributes INTEGER NOT NULL,
+    PRIMARY KEY (share, path)
+);
+CREATE INDEX IF NOT EXISTS files_folder ON files (share, folder);
+CREATE INDEX IF NOT EXISTS files_size ON files (share, file_size);
+CREATE INDEX IF NOT EXISTS files_time ON files (share, last_write_time);
+"""
+
+
+class Index:
+    """
+    Local index of the content of shared folders, stored in a SQLite database.
+    """
+
+    def __init__(self, database_path: str):
+        """
+        :param database_path: Path to the SQLite database (created if needed). Use ":memory:" for a transient index.
+        """
+        self._database = sqlite3.connect(database_path)
+        self._database.executescript(_schema)
+
+    def refresh(
+        self,
+        connection: SMBConnection,
+        share_folder: str,
+        folder_path: str = "",
+        full: bool = False,
+    ) -> int:
+        """
+        Update the index with the content of a folder (recursively).
+
+        Only folders with a different last write time are listed again,
+        other folders only cost a single (lightweight) attributes request.
+        Note that Windows does not update the last write time of a folder when an existing file is modified,
+        use full to list every folder once again.
+
+        :param connection: Samba connection as returned by connect function.
+        :param share_folder: Shared folder name.
+        :param folder_path: Folder to index. Default to the root of the shared folder. This folder is always listed.
+        :param full: List every folder, even if its last write time did not change. Default to False.
+        :return: Number of folders that were listed.
+        """
+        logger.info(
+            f"Indexing \\\\{connection.remote_name}\\{share_folder}{folder_path}..."
+        )
+        listed = 0
+        pending = [(_normalize(folder_path), None)]
+        while pending:
+            folder, last_write_time = pending.pop()
+            if (
+                not full
+                and last_write_time is not None
+                and last_write_time == self._folder_write_time(share_folder, folder)
+            ):
+                pending.extend(
+                    self._unchanged_sub_folders(connection, share_folder, folder)
+                )
+                continue
+
+            sub_folders = self._update_folder(
+                connection, share_folder, folder, last_write_time
+            )
+            pending.extend(sub_folders)
+            listed += 1
+
+        self._database.commit()
+        logger.info(
+            f"\\\\{connection.remote_name}\\{share_folder}{folder_path} indexed ({listed} folders listed)."
+        )
+        return listed
+
+    def _folder_write_time(self, share_folder: str, folder: str) -> Optional[float]:
+        row = self._database.execute(
+            "SELECT last_write_time FROM folders WHERE share = ? AND path = ?",
+            (share_folder, folder),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _unchanged_sub_folders(
+        self, connection: SMBConnection, share_folder: str, folder: str
+    ) -> list:
+        sub_folders = []
+        for (sub_folder,) in self._database.execute(
+            "SELECT path FROM files WHERE share = ? AND folder = ? AND is_directory = 1",
+            (share_folder, folder),
+        ).fetchall():
+            try:
+                attributes = connection.getAttributes(share_folder, sub_folder)
+            except OperationFailure:
+                self._remove(share_folder, sub_folder)
+                continue
+            sub_folders.append((sub_folder, attributes.last_write_time))
+        return sub_folders
+
+    def _update_folder(
+        self,
+        connection: SMBConnection,
+        share_folder: str,
+        folder: str,
+        last_write_time: Optional[float],
+    ) -> list:
+        files = get_folder_content(connection, share_folder, folder)
+        rows = [
+            (
+                share_folder,
+                folder,
+                f"{folder}/{file.filename}",
+                file.filename,
+                int(file.isDirectory),
+                file.file_size,
+                file.create_time,
+                file.last_write_time,
+                file.file_attributes,
+            )
+            for file in files
+        ]
+        paths = {row[2] for row in rows}
+        for (previous_path,) in self._database.execute(
+            "SELECT path FROM files WHERE share = ? AND folder = ?",
+            (share_folder, folder),
+        ).fetchall():
+            if previous_path not in paths:
+                self._remove(share_folder, previous_path)
+
+        self._database.executemany(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self._database.execute(
+            "INSERT OR REPLACE INTO folders VALUES (?, ?, ?)",
+            (share_folder, folder, last_write_time),
+        )
+        return [(row[2], row[7]) for row in rows if row[4]]
+
+    def _remove(self, share_folder: str, path: str):
+        """Remove a file or a folder (and its content) from the index."""
+        content = f"{_escape(path)}/%"
+        self._database.execute(
+            "DELETE FROM files WHERE share = ? AND (path = ? OR path LIKE ? ESCAPE '\\')",
+            (share_folder, path, content),
+        )
+        self._database.execute(
+            "DELETE FROM folders WHERE share = ? AND (path = ? OR path LIKE ? ESCAPE '\\')",
+            (share_folder, path, content),
+        )
+
+    def search(
+        self,
+        share_folder: str,
+        folder_path: str = "",
+        pattern: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_after: Union[datetime.datetime, float, None] = None,
+        modified_before: Union[datetime.datetime, float, None] = None,
+        include_folders: bool = False,
+    ) -> List[IndexedFile]:
+        """
+        Search indexed files (recursively) without any remote call.
+
+        :param share_folder: Shared folder name.
+        :param folder_path: Only return files within this folder (recursively). Default to the root of the shared folder.
+        :param pattern: Only return files with a name matching this pattern (* and ? wildcards, case-insensitive).
+        :param min_size: Only return files of at least this number of bytes.
+        :param max_size: Only return files of at most this number of bytes.
+        :param modified_after: Only return files modified at (or after) this time (datetime or number of seconds since epoch).
+        :param modified_before: Only return files modified before this time (datetime or number of seconds since epoch).
+        :param include_folders: Should folders be included in the results. Only files are returned by default.
+        :return: Matching files, sorted by path.
+        """
+        clauses = ["share = ?", "path LIKE ? ESCAPE '\\'"]
+        parameters = [share_folder, f"{_escape(_normalize(folder_path))}/%"]
+        if pattern:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            parameters.append(_to_like(pattern))
+        if min_size is not None:
+            clauses.append("file_size >= ?")
+            parameters.append(min_size)
+        if max_size is not None:
+            clauses.append("file_size <= ?")
+            parameters.append(max_size)
+        if modified_after is not None:
+            clauses.append("last_write_time >= ?")
+            parameters.append(_timestamp(modified_after))
+        if modified_before is not None:
+            clauses.append("last_write_time < ?")
+            parameters.append(_timestamp(modified_before))
+        if not include_folders:
+            clauses.append("is_directory = 0")
+
+        rows = self._database.execute(
+            "SELECT path, is_directory, file_size, create_time, last_write_time, file_attributes "
+            f"FROM files WHERE {' AND '.join(clauses)} ORDER BY path",
+            parameters,
+        ).fetchall()
+        return [
+            IndexedFile(path, bool(is_directory), *values)
+            for path, is_directory, *values in rows
+        ]
+
+    def close(self):
+        self._database.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _normalize(folder_path: str) -> str:
+    return folder_path.rstrip("/")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _to_like(pattern: str) -> str:
+    """Convert * and ? wildcards into a LIKE pattern."""
+    return _escape(pattern).replace("*", "%").replace("?", "_")
@@ -0,0 +1,154 @@
+"""
+Record interactions with a Samba server (and how long they took), so that they can be replayed offline.
+
+Recordings are gzip compressed files containing one JSON object per interaction.
+Only payload sizes are recorded (not the content of files).
+"""
+
+import gzip
+import json
+import threading
+import time
+from typing import List
+
+from smb.SMBConnection import SMBConnection
+from smb.smb_structs import OperationFailure
+
+recorded_methods = (
+    "listPath",
+    "storeFile",
+    "retrieveFile",
+    "rename",
+    "createDirectory",
+    "echo",
+)
+
+# Attributes of a listed SharedFile, in the order they are recorded
+shared_file_attributes = (
+    "filename",
+    "isDirectory",
+    "file_size",
+    "alloc_size",
+    "create_time",
+    "last_access_time",
+    "last_write_time",
+    "last_attr_change_time",
+    "file_attributes",
+)
+
+
+class RecordingConnection:
+    """
+    Wrap a Samba connection to record listPath, storeFile, retrieveFile, rename, createDirectory and echo calls.
+
+    Can be used in place of the wrapped connection (other methods are not recorded).
+    """
+
+    def __init__(self, connection: SMBConnection, recording_file_path: str):
+        """
+        :param connection: Samba connection as returned by connect function.
+        :param recording_file_path: File that will contain the recorded calls (overwritten if it exists).
+        """
+        self._connection = connection
+        self._recording = gzip.open(recording_file_path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        try:
+            self._connection.close()
+        finally:
+            with self._lock:
+                self._recording.close()
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._connection, name)
+        if name not in recorded_methods:
+            return attribute
+
+        def record(*args, **kwargs):
+            return self._record(name, attribute, args, kwargs)
+
+        return record
+
+    def _record(self, name: str, method: callable, args: tuple, kwargs: dict):
+        interaction = {"method": name, "args": call_key(args, kwargs)}
+        file = None
+        if name in ("storeFile", "retrieveFile"):
+            # Content is transferred through the file object (provided as third parameter or as file_obj)
+            if len(args) > 2:
+                file = _CountingFile(args[2])
+                args = (*args[:2], file, *args[3:])
+            else:
+                file = _CountingFile(kwargs["file_obj"])
+                kwargs = {**kwargs, "file_obj": file}
+
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except OperationFailure as e:
+            self._write(interaction, time.perf_counter() - start, file, error=e.message)
+            raise
+        duration = time.perf_counter() - start
+
+        if name == "listPath":
+            interaction["files"] = [
+                [
+                    getattr(shared_file, attribute)
+                    for attribute in shared_file_attributes
+                ]
+                for shared_file in result
+            ]
+        self._write(interaction, duration, file)
+        return result
+
+    def _write(self, interaction: dict, duration: float, file, **details):
+        interaction["duration"] = round(duration, 6)
+        if file is not None:
+            interaction["size"] = file.size
+        interaction.update(details)
+        line = json.dumps(interaction, separators=(",", ":"))
+        with self._lock:
+            self._recording.write(f"{line}\n")
+
+
+class _CountingFile:
+    """File object counting the number of bytes read or written."""
+
+    def __init__(self, file):
+        self.file = file
+        self.size = 0
+
+    def read(self, *args) -> bytes:
+        data = self.file.read(*args)
+        self.size += len(data)
+        return data
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return self.file.write(data)
+
+    def __getattr__(self, name: str):
+        return getattr(self.file, name)
+
+
+def call_key(args: tuple, kwargs: dict) -> List[str]:
+    """Identify a call thanks to its textual parameters (share folder name, paths, pattern)."""
+    return [argument for argument in args if isinstance(argument, str)] + [
+        f"{name}={value}"
+        for name, value in sorted(kwargs.items())
+        if isinstance(value, str)
+    ]
+
+
+def load(recording_file_path: str) -> List[dict]:
+    """
+    :return: Recorded interactions (in the order they ended).
+    """
+    with gzip.open(recording_file_path, "rt", encoding="utf-8") as recording:
+        return [json.loads(line) for line in recording]
@@ -1,15 +1,60 @@
+import inspect
 import shutil
+import threading
+import time
 from typing import List
-from collections import namedtuple
+from collections import namedtuple, defaultdict, deque
 import datetime
 import pathlib
 
 import pytest
 
-from smb.smb_structs import OperationFailure, SMB_FILE_ATTRIBUTE_DIRECTORY
+from smb.smb_structs import (
+    OperationFailure,
+    SMB_FILE_ATTRIBUTE_DIRECTORY,
+    SMB_FILE_ATTRIBUTE_ARCHIVE,
+)
 from smb.base import SharedFile
 
-SharedFileMock = namedtuple("SharedFileMock", ["filename", "isDirectory"])
+from pyndows import recording
+
+
+class SharedFileMock(namedtuple("SharedFileMock", ["filename", "isDirectory"])):
+    """
+    Mock a Samba SharedFile object.
+
+    Only filename and isDirectory are compared, other attributes are provided by SMBConnectionMock.listPath.
+    """
+
+    file_size = 0
+    alloc_size = 0
+    create_time = 0.0
+    last_access_time = 0.0
+    last_write_time = 0.0
+    last_attr_change_time = 0.0
+    file_attributes = SMB_FILE_ATTRIBUTE_ARCHIVE
+
+    @classmethod
+    def from_path(cls, path: pathlib.Path) -> "SharedFileMock":
+        shared_file = cls(path.name, path.is_dir())
+        stat = path.stat()
+        shared_file.file_size = shared_file.alloc_size = (
+            0 if shared_file.isDirectory else stat.st_size
+        )
+        shared_file.create_time = stat.st_ctime
+        shared_file.last_access_time = stat.st_atime
+        shared_file.last_write_time = stat.st_mtime
+        shared_file.last_attr_change_time = stat.st_ctime
+        if shared_file.isDirectory:
+            shared_file.file_attributes = SMB_FILE_ATTRIBUTE_DIRECTORY
+        return shared_file
+
+    @classmethod
+    def from_recording(cls, values: list) -> "SharedFileMock":
+        shared_file = cls(*values[:2])
+        for attribute, value in zip(recording.shared_file_attributes[2:], values[2:]):
+            setattr(shared_file, attribute, value)
+        return shared_file
 
 
 def try_get(path: pathlib.Path, timeout=1):
@@ -48,9 +93,14 @@ class SMBConnectionMock:
     def connect(self, *args):
         return True
 
-    def storeFile(self, share_drive_path: str, file_path: str, file, timeout=30) -> int:
+    def close(self):
+        pass
+
+    def storeFile(
+        self, share_drive_path: str, file_path: str, file_obj, timeout=30
+    ) -> int:
         if self.path(share_drive_path, file_path).parent.exists():
-            self.path(share_drive_path, file_path).write_bytes(file.read())
+            self.path(share_drive_path, file_path).write_bytes(file_obj.read())
             return 0
 
         raise OperationFailure(
@@ -58,6 +108,27 @@ class SMBConnectionMock:
             [],
         )
 
+    def storeFileFromOffset(
+        self,
+        share_drive_path: str,
+        file_path: str,
+        file_obj,
+        offset: int = 0,
+        truncate: bool = False,
+        timeout=30,
+    ) -> int:
+        path = self.path(share_drive_path, file_path)
+        if path.parent.exists():
+            with path.open("r+b" if path.exists() and not truncate else "wb") as stored:
+                stored.seek(offset)
+                stored.write(file_obj.read())
+                return stored.tell()
+
+        raise OperationFailure(
+            f"Failed to store {file_path} on {share_drive_path}: Unable to open file",
+            [],
+        )
+
     def createDirectory(self, share_drive_path: str, folder_path: str, timeout=30):
         try:
             self.path(share_drive_path, folder_path).mkdir()
@@ -70,13 +141,54 @@ class SMBConnectionMock:
     def rename(
         self, share_drive_path: str, initial_file_path: str, new_file_path: str
     ) -> None:
-        self.path(share_drive_path, initial_file_path).rename(
-            self.path(share_drive_path, new_file_path)
-        )
+        try:
+            self.path(share_drive_path, initial_file_path).rename(
+                self.path(share_drive_path, new_file_path)
+            )
+        except OSError:
+            raise OperationFailure(
+                f"Failed to rename {initial_file_path} on {share_drive_path}: Unable to open file",
+                [],
+            )
+
+    def deleteFiles(
+        self,
+        service_name: str,
+        path_file_pattern: str,
+        delete_matching_folders: bool = False,
+        timeout=30,
+    ) -> None:
+        folder_path, pattern = path_file_pattern.rsplit("/", maxsplit=1)
+        files = [
+            file
+            for file in self.path(service_name, folder_path).glob(pattern)
+            if delete_matching_folders or file.is_file()
+        ]
+        if not files:
+            raise OperationFailure(
+                f"Delete failed for {path_file_pattern} on {service_name}: Unable to open file",
+                [],
+            )
+        for file in files:
+            if file.is_dir():
+                shutil.rmtree(file)
+            else:
+                file.unlink()
 
-    def retrieveFile(self, share_drive_path: str, file_path: str, file) -> (int, int):
+    def deleteDirectory(self, service_name: str, path: str, timeout=30) -> None:
+        try:
+            self.path(service_name, path).rmdir()
+        except OSError:
+            raise OperationFailure(
+                f"Failed to delete directory {path} on {service_name}: Unable to open directory",
+                [],
+            )
+
+    def retrieveFile(
+        self, share_drive_path: str, file_path: str, file_obj
+    ) -> (int, int):
         if self.path(share_drive_path, file_path).exists():
-            file.write(self.path(share_drive_path, file_path).read_bytes())
+            file_obj.write(self.path(share_drive_path, file_path).read_bytes())
             return 0, 0
 
         raise OperationFailure(
@@ -84,6 +196,38 @@ class SMBConnectionMock:
             [],
         )
 
+    def retrieveFileFromOffset(
+        self,
+        share_drive_path: str,
+        file_path: str,
+        file_obj,
+        offset: int = 0,
+        max_length: int = -1,
+        timeout=30,
+    ) -> (int, int):
+        if self.path(share_drive_path, file_path).is_file():
+            with self.path(share_drive_path, file_path).open("rb") as stored:
+                stored.seek(offset)
+                data = stored.read(max_length)
+            file_obj.write(data)
+            return 0, len(data)
+
+        raise OperationFailure(
+            f"Failed to retrieve {file_path} on {share_drive_path}: Unable to open file",
+            [],
+        )
+
+    def getAttributes(
+        self, service_name: str, path: str, timeout: int = 30
+    ) -> SharedFile:
+        if self.path(service_name, path).exists():
+            return SharedFileMock.from_path(self.path(service_name, path))
+
+        raise OperationFailure(
+            f"Failed to get attributes for {path} on {service_name}: Unable to open file",
+            [],
+        )
+
     def listPath(
         self,
         service_name: str,
@@ -92,7 +236,7 @@ class SMBConnectionMock:
         pattern: str = "*",
     ) -> List[SharedFile]:
         files = [
-            SharedFileMock(file.name, file.is_dir())
+            SharedFileMock.from_path(file)
             for file in self.path(service_name, path).glob(pattern)
             if search | SMB_FILE_ATTRIBUTE_DIRECTORY == search or file.is_file()
         ]
@@ -124,6 +268,63 @@ class SMBConnectionMock:
     def add_callback(cls, method_name: str, callback: callable):
         cls.monkeypatch.setattr(cls, method_name, callback)
 
+    @classmethod
+    def track_calls(cls, method_name: str) -> List[dict]:
+        """
+        Record parameters of every call to a method (the call is still performed).
+
+        :return: Parameters (by name, including default values) of every call, filled as calls are performed.
+        """
+        calls = []
+        method = getattr(cls, method_name)
+        signature = inspect.signature(method)
+
+        def track(self, *args, **kwargs):
+            parameters = signature.bind(self, *args, **kwargs)
+            parameters.apply_defaults()
+            calls.append(dict(list(parameters.arguments.items())[1:]))
+            return method(self, *args, **kwargs)
+
+        cls.add_callback(method_name, track)
+        return calls
+
+    @classmethod
+    def replay(cls, recording_file_path: str, speed: float = 1):
+        """
+        Answer listPath, storeFile, retrieveFile, rename, createDirectory and echo calls as they were recorded
+        (using pyndows.recording.RecordingConnection), taking the same time.
+
+        Calls with the same parameters are answered in the order they were recorded.
+        Retrieved files contain as many null bytes as the recorded ones.
+
+        :param recording_file_path: File containing recorded calls.
+        :param speed: Recorded durations are divided by this factor. Default to the recorded durations.
+        :raises LookupError: when performing a call that was not recorded (or not as many times).
+        """
+        interactions = defaultdict(deque)
+        for interaction in recording.load(recording_file_path):
+            interactions[(interaction["method"], *interaction["args"])].append(
+                interaction
+            )
+        lock = threading.Lock()
+
+        def replayer(method_name: str) -> callable:
+            def replay(self, *args, **kwargs):
+                key = (method_name, *recording.call_key(args, kwargs))
+                with lock:
+                    if not interactions[key]:
+                        raise LookupError(f"{method_name}{key[1:]} was not recorded.")
+                    interaction = interactions[key].popleft()
+                time.sleep(interaction["duration"] / speed)
+                if "error" in interaction:
+                    raise OperationFailure(interaction["error"], [])
+                return _replayed_result(method_name, interaction, args, kwargs)
+
+            return replay
+
+        for method_name in recording.recorded_methods:
+            cls.add_callback(method_name, replayer(method_name))
+
     @classmethod
     def cleanup(cls):
         mock_path = pathlib.Path(cls.tmpdir, "pyndows_samba_mock")
@@ -131,16 +332,38 @@ class SMBConnectionMock:
             shutil.rmtree(mock_path)
 
 
+def _replayed_result(method_name: str, interaction: dict, args: tuple, kwargs: dict):
+    if method_name == "listPath":
+        return [
+            SharedFileMock.from_recording(values) for values in interaction["files"]
+        ]
+    if method_name == "retrieveFile":
+        file = args[2] if len(args) > 2 else kwargs["file_obj"]
+        size = interaction["size"]
+        for offset in range(0, size, 1024 * 1024):
+            file.write(bytes(min(size - offset, 1024 * 1024)))
+        return 0, size
+    if method_name == "storeFile":
+        file = args[2] if len(args) > 2 else kwargs["file_obj"]
+        size = 0
+        for data in iter(lambda: file.read(1024 * 1024), b""):
+            size += len(data)
+        return size
+    if method_name == "echo":
+        return args[0] if args else kwargs["data"]
+
+
 @pytest.fixture
 def samba_mock(monkeypatch, tmpdir) -> SMBConnectionMock:
     import smb.SMBConnection
 
+    # Imported before pysmb is mocked, so that the actual SMBConnection is restored afterwards
+    import pyndows._windows
+
     SMBConnectionMock.tmpdir = tmpdir
     SMBConnectionMock.monkeypatch = monkeypatch
 
     monkeypatch.setattr(smb.SMBConnection, "SMBConnection", SMBConnectionMock)
-    import pyndows
-
     monkeypatch.setattr(pyndows._windows, "SMBConnection", SMBConnectionMock)
 
     yield SMBConnectionMock
@@ -33,11 +33,24 @@ setup(
     keywords=["windows", "samba", "linux", "remote"],
     packages=find_packages(exclude=["tests*"]),
     install_requires=["pysmb==1.*"],
+    entry_points={"console_scripts": ["pyndows=pyndows._cli:main"]},
     extras_require={
         "testing": [
             # Used to launch tests and check coverage
             "pytest-cov==2.*",
-        ]
+            # Used to check xxhash checksums
+            "xxhash==3.*",
+            # Used to check zstd compression
+            "zstandard==0.*",
+        ],
+        "xxhash": [
+            # Used to compute xxhash checksums
+            "xxhash==3.*",
+        ],
+        "zstd": [
+            # Used to compress and decompress zstd files
+            "zstandard==0.*",
+        ],
     },
     python_requires=">=3.6",
     project_urls={
@@ -0,0 +1,608 @@
+import datetime
+import os
+
+import pytest
+from smb.base import NotConnectedError, SMBTimeout
+from smb.smb_structs import OperationFailure
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def test_rename_many(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1.tmp").write_text("Test Rename 1")
+    samba_mock.path("TestShare", "/A/2.tmp").write_text("Test Rename 2")
+    samba_mock.path("TestShare", "/3.tmp").write_text("Test Rename 3")
+
+    assert pyndows.rename_many(
+        connection,
+        "TestShare",
+        [("/A/1.tmp", "/A/1"), ("/A/2.tmp", "/A/2"), ("/3.tmp", "/3")],
+    ) == [None, None, None]
+
+    assert samba_mock.path("TestShare", "/A/1").read_text() == "Test Rename 1"
+    assert samba_mock.path("TestShare", "/A/2").read_text() == "Test Rename 2"
+    assert samba_mock.path("TestShare", "/3").read_text() == "Test Rename 3"
+    assert not samba_mock.path("TestShare", "/A/1.tmp").exists()
+
+
+def test_rename_many_lists_each_folder_once(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    for index in range(10):
+        samba_mock.path("TestShare", f"/{index}.tmp").write_text("Test Rename")
+
+    listed = samba_mock.track_calls("listPath")
+    pyndows.rename_many(
+        connection,
+        "TestShare",
+        [(f"/{index}.tmp", f"/{index}") for index in range(10)],
+    )
+
+    assert [call["path"] for call in listed] == ["/"]
+
+
+def test_rename_many_using_a_pool(samba_mock: SMBConnectionMock):
+    samba_mock.path("TestShare", "/A").mkdir()
+    for index in range(20):
+        samba_mock.path("TestShare", f"/A/{index}.tmp").write_text(f"{index}")
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        assert (
+            pyndows.rename_many(
+                pool,
+                "TestShare",
+                [(f"/A/{index}.tmp", f"/A/{index}") for index in range(20)],
+            )
+            == [None] * 20
+        )
+
+    for index in range(20):
+        assert samba_mock.path("TestShare", f"/A/{index}").read_text() == f"{index}"
+
+
+def test_rename_many_does_not_stop_on_failure(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/1.tmp").write_text("Test Rename 1")
+    samba_mock.path("TestShare", "/3.tmp").write_text("Test Rename 3")
+
+    outcomes = pyndows.rename_many(
+        connection,
+        "TestShare",
+        [("/1.tmp", "/1"), ("/B/2.tmp", "/B/2"), ("/3.tmp", "/A/3")],
+    )
+
+    assert outcomes[0] is None
+    assert isinstance(outcomes[1], FileNotFoundError)
+    assert str(outcomes[1]) == r"\\TestComputer\TestShare/B/2.tmp doesn't exist"
+    assert isinstance(outcomes[2], pyndows.PyndowsException)
+    assert (
+        str(outcomes[2])
+        == r"Unable to rename \\TestComputer\TestShare/3.tmp into \\TestComputer\TestShare/A/3"
+    )
+    assert samba_mock.path("TestShare", "/1").read_text() == "Test Rename 1"
+
+
+def test_delete_many(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("1")
+    samba_mock.path("TestShare", "/2.csv").write_text("2")
+    samba_mock.path("TestShare", "/3.csv").write_text("3")
+
+    assert pyndows.delete_many(connection, "TestShare", ["/A/1.csv", "/2.csv"]) == [
+        None,
+        None,
+    ]
+
+    assert not samba_mock.path("TestShare", "/A/1.csv").exists()
+    assert not samba_mock.path("TestShare", "/2.csv").exists()
+    assert samba_mock.path("TestShare", "/3.csv").exists()
+
+
+def test_delete_many_using_a_pool(samba_mock: SMBConnectionMock):
+    samba_mock.path("TestShare", "/A").mkdir()
+    for index in range(20):
+        samba_mock.path("TestShare", f"/A/{index}.csv").write_text(f"{index}")
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        assert (
+            pyndows.delete_many(
+                pool, "TestShare", [f"/A/{index}.csv" for index in range(20)]
+            )
+            == [None] * 20
+        )
+
+    assert list(samba_mock.path("TestShare", "/A").iterdir()) == []
+
+
+def test_delete_many_does_not_stop_on_failure(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/1.csv").write_text("1")
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/3.csv").write_text("3")
+
+    outcomes = pyndows.delete_many(
+        connection, "TestShare", ["/1.csv", "/2.csv", "/A", "/3.csv"]
+    )
+
+    assert outcomes[0] is None
+    assert isinstance(outcomes[1], FileNotFoundError)
+    assert str(outcomes[1]) == r"\\TestComputer\TestShare/2.csv doesn't exist"
+    assert isinstance(outcomes[2], pyndows.PyndowsException)
+    assert str(outcomes[2]) == r"Unable to delete \\TestComputer\TestShare/A"
+    assert outcomes[3] is None
+    assert samba_mock.path("TestShare", "/A").exists()
+
+
+def create_expired_files(samba_mock: SMBConnectionMock):
+    """Files ending with old are older than 2000-01-01."""
+    for path in [
+        "/keep.csv",
+        "/1_old.csv",
+        "/A/2_old.csv",
+        "/A/B/3_old.csv",
+        "/A/B/4_old.txt",
+        "/A/C/5_old.csv",
+        "/A/C/keep.csv",
+        "/D/6_old.csv",
+    ]:
+        samba_mock.path("TestShare", path).parent.mkdir(parents=True, exist_ok=True)
+        samba_mock.path("TestShare", path).write_text("1234567890")
+        if path.endswith("_old.csv") or path.endswith("_old.txt"):
+            os.utime(samba_mock.path("TestShare", path), (900_000_000, 900_000_000))
+    samba_mock.path("TestShare", "/E").mkdir()
+
+
+def remaining_files(samba_mock: SMBConnectionMock) -> list:
+    root = samba_mock.path("TestShare", "/")
+    return sorted(f"/{path.relative_to(root).as_posix()}" for path in root.rglob("*"))
+
+
+def test_purge(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_expired_files(samba_mock)
+
+    assert pyndows.purge(
+        connection,
+        "TestShare",
+        older_than=datetime.datetime(2000, 1, 1),
+        pattern="*.CSV",
+    ) == {"deleted": 1, "bytes_freed": 10, "failed": 0, "removed_folders": 0}
+
+    assert "/1_old.csv" not in remaining_files(samba_mock)
+    assert "/A/2_old.csv" in remaining_files(samba_mock)
+
+
+def test_purge_recursively(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_expired_files(samba_mock)
+
+    assert pyndows.purge(
+        connection,
+        "TestShare",
+        "/A/",
+        older_than=datetime.timedelta(days=365),
+        pattern="?_old.csv",
+        recursive=True,
+        remove_empty_folders=True,
+    ) == {"deleted": 3, "bytes_freed": 30, "failed": 0, "removed_folders": 0}
+
+    assert remaining_files(samba_mock) == [
+        "/1_old.csv",
+        "/A",
+        "/A/B",
+        "/A/B/4_old.txt",
+        "/A/C",
+        "/A/C/keep.csv",
+        "/D",
+        "/D/6_old.csv",
+        "/E",
+        "/keep.csv",
+    ]
+
+
+def test_purge_removes_emptied_folders(samba_mock: SMBConnectionMock):
+    create_expired_files(samba_mock)
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        assert pyndows.purge(
+            pool,
+            "TestShare",
+            "/",
+            older_than=datetime.datetime(2000, 1, 1),
+            recursive=True,
+            remove_empty_folders=True,
+        ) == {"deleted": 6, "bytes_freed": 60, "failed": 0, "removed_folders": 2}
+
+    # Folders that were already empty are kept
+    assert remaining_files(samba_mock) == [
+        "/A",
+        "/A/C",
+        "/A/C/keep.csv",
+        "/E",
+        "/keep.csv",
+    ]
+
+
+def test_purge_failures(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_expired_files(samba_mock)
+    delete_files = SMBConnectionMock.deleteFiles
+
+    def fail_on_3(self, service_name, path_file_pattern, *args, **kwargs):
+        if path_file_pattern == "/A/B/3_old.csv":
+            raise OperationFailure("Access denied", [])
+        return delete_files(self, service_name, path_file_pattern, *args, **kwargs)
+
+    def fail_delete_directory(self, service_name, path, *args, **kwargs):
+        raise OperationFailure("Access denied", [])
+
+    samba_mock.add_callback("deleteFiles", fail_on_3)
+    samba_mock.add_callback("deleteDirectory", fail_delete_directory)
+
+    assert pyndows.purge(
+        connection,
+        "TestShare",
+        older_than=datetime.datetime(2000, 1, 1),
+        recursive=True,
+        remove_empty_folders=True,
+    ) == {"deleted": 5, "bytes_freed": 50, "failed": 1, "removed_folders": 0}
+
+    assert remaining_files(samba_mock) == [
+        "/A",
+        "/A/B",
+        "/A/B/3_old.csv",
+        "/A/C",
+        "/A/C/keep.csv",
+        "/D",
+        "/E",
+        "/keep.csv",
+    ]
+
+
+def test_purge_every_matching_file(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_expired_files(samba_mock)
+
+    assert pyndows.purge(connection, "TestShare", "/A/C", pattern="*.csv") == {
+        "deleted": 2,
+        "bytes_freed": 20,
+        "failed": 0,
+        "removed_folders": 0,
+    }
+    assert list(samba_mock.path("TestShare", "/A/C").iterdir()) == []
+
+
+def create_local_files(tmpdir, count: int) -> list:
+    file_paths = []
+    for index in range(count):
+        local_file = tmpdir.join(f"{index}.csv")
+        local_file.write_text(f"Test Move {index}", encoding="utf-8")
+        file_paths.append(
+            (str(local_file), f"/A/{'B' if index % 2 else 'C'}/{index}.csv")
+        )
+    return file_paths
+
+
+def test_move_many(samba_mock: SMBConnectionMock, tmpdir):
+    file_paths = create_local_files(tmpdir, 10)
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        pyndows.move_many(
+            pool,
+            "TestShare",
+            file_paths,
+            manifest_file_path="/A/batch.done",
+            write_to_new_folder_after=0,
+        )
+
+    for index, (local_file_path, remote_file_path) in enumerate(file_paths):
+        assert (
+            samba_mock.path("TestShare", remote_file_path).read_text()
+            == f"Test Move {index}"
+        )
+        assert not samba_mock.path("TestShare", f"{remote_file_path}.tmp").exists()
+        assert not os.path.exists(local_file_path)
+    assert samba_mock.path("TestShare", "/A/batch.done").read_text() == "".join(
+        f"{remote_file_path}\n" for _, remote_file_path in file_paths
+    )
+    assert not samba_mock.path("TestShare", "/A/batch.done.tmp").exists()
+
+
+def test_move_many_renames_once_everything_is_written(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    file_paths = create_local_files(tmpdir, 5)
+    events = []
+    store_file = SMBConnectionMock.storeFile
+    rename = SMBConnectionMock.rename
+
+    def track_store(self, share_drive_path, file_path, *args):
+        events.append(("store", file_path))
+        return store_file(self, share_drive_path, file_path, *args)
+
+    def track_rename(self, share_drive_path, old_file_path, new_file_path):
+        events.append(("rename", new_file_path))
+        return rename(self, share_drive_path, old_file_path, new_file_path)
+
+    samba_mock.add_callback("storeFile", track_store)
+    samba_mock.add_callback("rename", track_rename)
+    pyndows.move_many(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        "TestShare",
+        file_paths,
+        manifest_file_path="/A/batch.done",
+        write_to_new_folder_after=0,
+    )
+
+    # Folders are renamed into their final name when created
+    events = [event for event in events if event[1] not in ("/A", "/A/B", "/A/C")]
+    assert events == [
+        *[("store", f"{file_path}.tmp") for _, file_path in file_paths],
+        *[("rename", file_path) for _, file_path in file_paths],
+        ("store", "/A/batch.done.tmp"),
+        ("rename", "/A/batch.done"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "failure, failed_files",
+    [
+        (OperationFailure("Mock for store failure.", []), "/A/B/1.csv.tmp"),
+        # Connection cannot be used for the remaining files
+        (SMBTimeout(), "/A/B/1.csv.tmp, /A/C/2.csv.tmp, /A/B/3.csv.tmp"),
+        (NotConnectedError(), "/A/B/1.csv.tmp, /A/C/2.csv.tmp, /A/B/3.csv.tmp"),
+    ],
+)
+def test_move_many_write_failure(
+    samba_mock: SMBConnectionMock, tmpdir, failure, failed_files
+):
+    file_paths = create_local_files(tmpdir, 4)
+    store_file = SMBConnectionMock.storeFile
+
+    def fail_on_second_file(self, share_drive_path, file_path, *args):
+        if file_path == "/A/B/1.csv.tmp":
+            raise failure
+        return store_file(self, share_drive_path, file_path, *args)
+
+    samba_mock.add_callback("storeFile", fail_on_second_file)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move_many(
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+            "TestShare",
+            file_paths,
+            manifest_file_path="/A/batch.done",
+            write_to_new_folder_after=0,
+        )
+
+    assert (
+        str(exception_info.value)
+        == rf"Unable to write {failed_files} within \\TestComputer\TestShare"
+    )
+    # Nothing was made available and written files were removed
+    assert sorted(
+        path.name for path in samba_mock.path("TestShare", "/A").rglob("*")
+    ) == ["B", "C"]
+    assert all(os.path.exists(local_file_path) for local_file_path, _ in file_paths)
+
+
+def test_move_many_connection_lost_using_a_pool(samba_mock: SMBConnectionMock, tmpdir):
+    file_paths = create_local_files(tmpdir, 10)
+    store_file = SMBConnectionMock.storeFile
+
+    def fail_on_second_file(self, share_drive_path, file_path, *args):
+        if file_path == "/A/B/1.csv.tmp":
+            raise NotConnectedError()
+        return store_file(self, share_drive_path, file_path, *args)
+
+    samba_mock.add_callback("storeFile", fail_on_second_file)
+    closed = samba_mock.track_calls("close")
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        with pytest.raises(pyndows.PyndowsException) as exception_info:
+            pyndows.move_many(
+                pool,
+                "TestShare",
+                file_paths,
+                manifest_file_path="/A/batch.done",
+                write_to_new_folder_after=0,
+            )
+        # Lost connection was not given back to the pool
+        assert len(closed) == 1
+
+    assert str(exception_info.value).startswith("Unable to write /A/B/1.csv.tmp")
+    # Nothing was made available and written files were removed
+    assert sorted(
+        path.name for path in samba_mock.path("TestShare", "/A").rglob("*")
+    ) == ["B", "C"]
+    assert all(os.path.exists(local_file_path) for local_file_path, _ in file_paths)
+
+
+def test_move_many_missing_local_file(samba_mock: SMBConnectionMock, tmpdir):
+    file_paths = create_local_files(tmpdir, 2)
+    file_paths.append((os.path.join(tmpdir, "missing.csv"), "/A/missing.csv"))
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move_many(
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+            "TestShare",
+            file_paths,
+            write_to_new_folder_after=0,
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to write /A/missing.csv.tmp within \\TestComputer\TestShare"
+    )
+    # Written files were removed and nothing was made available
+    assert sorted(
+        path.name for path in samba_mock.path("TestShare", "/A").rglob("*")
+    ) == ["B", "C"]
+    assert all(os.path.exists(local_file_path) for local_file_path, _ in file_paths[:2])
+
+
+def test_move_many_write_failure_cleanup_failure(samba_mock: SMBConnectionMock, tmpdir):
+    file_paths = create_local_files(tmpdir, 2)
+    store_file = SMBConnectionMock.storeFile
+
+    def fail_on_second_file(self, share_drive_path, file_path, *args):
+        if file_path == "/A/B/1.csv.tmp":
+            raise OperationFailure("Mock for store failure.", [])
+        return store_file(self, share_drive_path, file_path, *args)
+
+    def fail_delete(*args, **kwargs):
+        raise OperationFailure("Mock for delete failure.", [])
+
+    samba_mock.add_callback("storeFile", fail_on_second_file)
+    samba_mock.add_callback("deleteFiles", fail_delete)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move_many(
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+            "TestShare",
+            file_paths,
+            write_to_new_folder_after=0,
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to write /A/B/1.csv.tmp within \\TestComputer\TestShare"
+    )
+    assert samba_mock.path("TestShare", "/A/C/0.csv.tmp").exists()
+
+
+def test_move_many_rename_failure(samba_mock: SMBConnectionMock, tmpdir):
+    file_paths = create_local_files(tmpdir, 2)
+    rename = SMBConnectionMock.rename
+
+    def fail_on_second_file(self, share_drive_path, old_file_path, new_file_path):
+        if new_file_path == "/A/B/1.csv":
+            raise OperationFailure("Mock for rename failure.", [])
+        return rename(self, share_drive_path, old_file_path, new_file_path)
+
+    samba_mock.add_callback("rename", fail_on_second_file)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move_many(
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+            "TestShare",
+            file_paths,
+            manifest_file_path="/A/batch.done",
+            write_to_new_folder_after=0,
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to rename temp files into /A/B/1.csv within \\TestComputer\TestShare"
+    )
+    assert not samba_mock.path("TestShare", "/A/batch.done").exists()
+    assert all(os.path.exists(local_file_path) for local_file_path, _ in file_paths)
+
+
+def test_move_many_manifest_failure(samba_mock: SMBConnectionMock, tmpdir):
+    file_paths = create_local_files(tmpdir, 2)
+    store_file = SMBConnectionMock.storeFile
+
+    def fail_on_manifest(self, share_drive_path, file_path, *args):
+        if file_path == "/A/batch.done.tmp":
+            raise OperationFailure("Mock for store failure.", [])
+        return store_file(self, share_drive_path, file_path, *args)
+
+    samba_mock.add_callback("storeFile", fail_on_manifest)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move_many(
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+            "TestShare",
+            file_paths,
+            manifest_file_path="/A/batch.done",
+            write_to_new_folder_after=0,
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to write /A/batch.done.tmp within \\TestComputer\TestShare"
+    )
+    assert all(os.path.exists(local_file_path) for local_file_path, _ in file_paths)
+
+
+def test_move_many_waits_for_new_folders(
+    samba_mock: SMBConnectionMock, tmpdir, monkeypatch
+):
+    file_paths = create_local_files(tmpdir, 1)
+    slept = []
+    monkeypatch.setattr(pyndows._bulk.time, "sleep", slept.append)
+
+    pyndows.move_many(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        "TestShare",
+        file_paths,
+        write_to_new_folder_after=3,
+    )
+
+    assert slept == [3]
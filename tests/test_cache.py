@@ -0,0 +1,245 @@
+import gzip
+import os
+import shutil
+
+import pytest
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def test_unchanged_file_is_not_retrieved_again(samba_mock: SMBConnectionMock, tmpdir):
+    retrieved = samba_mock.track_calls("retrieveFile")
+    samba_mock.path("TestShare", "/reference.csv").write_text("Content")
+    cache = pyndows.DownloadCache(os.path.join(tmpdir, "cache"))
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/reference.csv",
+        os.path.join(tmpdir, "1"),
+        cache=cache,
+    )
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/reference.csv",
+        os.path.join(tmpdir, "2"),
+        cache=cache,
+    )
+
+    assert [call["file_path"] for call in retrieved] == ["/reference.csv"]
+    assert open(os.path.join(tmpdir, "2")).read() == "Content"
+    # Cached file is provided as a hard link
+    assert os.stat(os.path.join(tmpdir, "2")).st_nlink == 2
+    assert cache.statistics() == {"hits": 1, "misses": 1, "files": 1, "size": 7}
+
+
+def test_changed_file_is_retrieved_again(samba_mock: SMBConnectionMock, tmpdir):
+    retrieved = samba_mock.track_calls("retrieveFile")
+    samba_mock.path("TestShare", "/reference.csv").write_text("Content")
+    os.utime(samba_mock.path("TestShare", "/reference.csv"), (1_000_000, 1_000_000))
+    cache = pyndows.DownloadCache(os.path.join(tmpdir, "cache"))
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    output_file_path = os.path.join(tmpdir, "output")
+
+    pyndows.get(
+        connection, "TestShare", "/reference.csv", output_file_path, cache=cache
+    )
+    samba_mock.path("TestShare", "/reference.csv").write_text("Content2")
+    pyndows.get(
+        connection, "TestShare", "/reference.csv", output_file_path, cache=cache
+    )
+    samba_mock.path("TestShare", "/reference.csv").write_text("Content3")
+    os.utime(samba_mock.path("TestShare", "/reference.csv"), (2_000_000, 2_000_000))
+    pyndows.get(
+        connection, "TestShare", "/reference.csv", output_file_path, cache=cache
+    )
+    pyndows.get(
+        connection, "TestShare", "/reference.csv", output_file_path, cache=cache
+    )
+
+    assert [call["file_path"] for call in retrieved] == ["/reference.csv"] * 3
+    assert open(output_file_path).read() == "Content3"
+    assert cache.statistics()["hits"] == 1
+    assert cache.statistics()["misses"] == 3
+
+
+def test_cached_file_is_copied(samba_mock: SMBConnectionMock, tmpdir, monkeypatch):
+    samba_mock.path("TestShare", "/reference.csv").write_text("Content")
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    copy_cache = pyndows.DownloadCache(os.path.join(tmpdir, "copy"), hard_link=False)
+    link_cache = pyndows.DownloadCache(os.path.join(tmpdir, "link"))
+
+    for cache in (copy_cache, copy_cache, link_cache):
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/reference.csv",
+            os.path.join(tmpdir, "output"),
+            cache=cache,
+        )
+    assert os.stat(os.path.join(tmpdir, "output")).st_nlink == 1
+
+    def link_failure(source, destination):
+        raise OSError("Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", link_failure)
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/reference.csv",
+        os.path.join(tmpdir, "output"),
+        cache=link_cache,
+    )
+    assert open(os.path.join(tmpdir, "output")).read() == "Content"
+    assert os.stat(os.path.join(tmpdir, "output")).st_nlink == 1
+    assert link_cache.statistics()["hits"] == 1
+
+
+@pytest.mark.parametrize("hard_link", [True, False])
+def test_file_evicted_while_being_restored(
+    samba_mock: SMBConnectionMock, tmpdir, monkeypatch, hard_link
+):
+    retrieved = samba_mock.track_calls("retrieveFile")
+    samba_mock.path("TestShare", "/reference.csv").write_text("Content")
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    cache_folder_path = os.path.join(tmpdir, "cache")
+    cache = pyndows.DownloadCache(cache_folder_path, hard_link=hard_link)
+    output_file_path = os.path.join(tmpdir, "output")
+    pyndows.get(
+        connection, "TestShare", "/reference.csv", output_file_path, cache=cache
+    )
+
+    def evict_before(provide):
+        def evict_then_provide(source, destination):
+            # Simulate a concurrent store evicting the cached file
+            if os.path.dirname(source) == cache_folder_path:
+                os.remove(source)
+            return provide(source, destination)
+
+        return evict_then_provide
+
+    monkeypatch.setattr(os, "link", evict_before(os.link))
+    monkeypatch.setattr(shutil, "copyfile", evict_before(shutil.copyfile))
+    pyndows.get(
+        connection, "TestShare", "/reference.csv", output_file_path, cache=cache
+    )
+
+    assert [call["file_path"] for call in retrieved] == ["/reference.csv"] * 2
+    assert open(output_file_path).read() == "Content"
+    assert cache.statistics()["hits"] == 0
+    assert cache.statistics()["misses"] == 2
+
+
+def test_checksum_of_cached_file(samba_mock: SMBConnectionMock, tmpdir):
+    samba_mock.path("TestShare", "/reference.csv").write_text("Content")
+    cache = pyndows.DownloadCache(os.path.join(tmpdir, "cache"))
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    output_file_path = os.path.join(tmpdir, "output")
+
+    checksum = pyndows.get(
+        connection,
+        "TestShare",
+        "/reference.csv",
+        output_file_path,
+        checksum="md5",
+        cache=cache,
+    )
+    assert (
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/reference.csv",
+            output_file_path,
+            checksum="md5",
+            cache=cache,
+        )
+        == checksum
+    )
+
+    with pytest.raises(pyndows.PyndowsException):
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/reference.csv",
+            output_file_path,
+            checksum="md5",
+            expected_checksum="0000",
+            cache=cache,
+        )
+    assert not os.path.exists(output_file_path)
+    assert cache.statistics()["hits"] == 2
+
+
+def test_compression_is_part_of_cache_key(samba_mock: SMBConnectionMock, tmpdir):
+    samba_mock.path("TestShare", "/reference.csv.gz").write_bytes(
+        gzip.compress(b"Content")
+    )
+    cache = pyndows.DownloadCache(os.path.join(tmpdir, "cache"))
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    output_file_path = os.path.join(tmpdir, "output")
+
+    pyndows.get(
+        connection, "TestShare", "/reference.csv.gz", output_file_path, cache=cache
+    )
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/reference.csv.gz",
+        output_file_path,
+        compression="infer",
+        cache=cache,
+    )
+
+    assert open(output_file_path, "rb").read() == b"Content"
+    assert cache.statistics()["files"] == 2
+    assert cache.statistics()["hits"] == 0
+
+
+def test_least_recently_used_files_are_evicted(samba_mock: SMBConnectionMock, tmpdir):
+    for name in ("1", "2", "3"):
+        samba_mock.path("TestShare", f"/{name}.csv").write_text("1234567890")
+    cache = pyndows.DownloadCache(os.path.join(tmpdir, "cache"), max_size=25)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    output_file_path = os.path.join(tmpdir, "output")
+
+    for name in ("1", "2", "1", "3", "1", "2"):
+        pyndows.get(
+            connection, "TestShare", f"/{name}.csv", output_file_path, cache=cache
+        )
+
+    assert cache.statistics() == {"hits": 2, "misses": 4, "files": 2, "size": 20}
+
+
+def test_non_existing_file_is_not_cached(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    cache = pyndows.DownloadCache(os.path.join(tmpdir, "cache"))
+
+    with pytest.raises(pyndows.PyndowsException):
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/reference.csv",
+            os.path.join(tmpdir, "output"),
+            cache=cache,
+        )
+
+    assert cache.statistics() == {"hits": 0, "misses": 0, "files": 0, "size": 0}
@@ -0,0 +1,136 @@
+import time
+
+import pytest
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def create_inbound_files(samba_mock: SMBConnectionMock, count: int):
+    samba_mock.path("TestShare", "/inbound").mkdir()
+    for index in range(count):
+        samba_mock.path("TestShare", f"/inbound/{index}.csv").write_text(f"{index}")
+
+
+def inbound_files(samba_mock: SMBConnectionMock) -> list:
+    return sorted(
+        path.name for path in samba_mock.path("TestShare", "/inbound").iterdir()
+    )
+
+
+def test_claim_files(samba_mock: SMBConnectionMock):
+    create_inbound_files(samba_mock, 3)
+    samba_mock.path("TestShare", "/inbound/3.tmp").write_text("3")
+    samba_mock.path("TestShare", "/inbound/folder.csv").mkdir()
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    before = time.time()
+    claims = pyndows.claim_files(
+        connection, "TestShare", "/inbound/", "node1", lease=60, pattern="*.CSV"
+    )
+
+    assert len(claims) == 3
+    for claim in sorted(claims):
+        assert before + 59 <= claim.expires_at <= time.time() + 60
+        assert claim.node == "node1"
+        assert claim.claimed_file_path == (
+            f"{claim.file_path}.node1.{claim.expires_at}.claimed"
+        )
+        assert samba_mock.path("TestShare", claim.claimed_file_path).read_text() == (
+            claim.file_path[len("/inbound/") : -len(".csv")]
+        )
+    assert sorted(claim.file_path for claim in claims) == [
+        "/inbound/0.csv",
+        "/inbound/1.csv",
+        "/inbound/2.csv",
+    ]
+    # Claimed files cannot be claimed again (until claim expires)
+    other_claims = pyndows.claim_files(connection, "TestShare", "/inbound", "node2")
+    assert [(claim.file_path, claim.node) for claim in other_claims] == [
+        ("/inbound/3.tmp", "node2")
+    ]
+
+
+def test_nodes_claim_disjoint_files(samba_mock: SMBConnectionMock):
+    create_inbound_files(samba_mock, 25)
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        claims = [
+            pyndows.claim_files(pool, "TestShare", "/inbound", f"node{node}", 10)
+            for node in range(3)
+        ]
+
+    assert [len(node_claims) for node_claims in claims] == [10, 10, 5]
+    claimed = [claim.file_path for node_claims in claims for claim in node_claims]
+    assert len(set(claimed)) == 25
+
+
+def test_claim_lost_to_another_node(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_inbound_files(samba_mock, 4)
+    rename = SMBConnectionMock.rename
+
+    def other_node_claims_first_file(self, share, old_file_path, new_file_path):
+        if old_file_path == "/inbound/0.csv":
+            rename(
+                self, share, old_file_path, "/inbound/0.csv.other.9999999999.claimed"
+            )
+        return rename(self, share, old_file_path, new_file_path)
+
+    samba_mock.add_callback("rename", other_node_claims_first_file)
+    claims = pyndows.claim_files(connection, "TestShare", "/inbound", "node1", 4)
+
+    assert len(claims) == 3
+    assert "/inbound/0.csv" not in [claim.file_path for claim in claims]
+
+
+def test_expired_claims_are_claimed_again(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_inbound_files(samba_mock, 1)
+    samba_mock.path("TestShare", "/inbound/0.csv").rename(
+        samba_mock.path("TestShare", "/inbound/0.csv.node1.1000.claimed")
+    )
+
+    claims = pyndows.claim_files(connection, "TestShare", "/inbound", "node2")
+
+    assert [claim.file_path for claim in claims] == ["/inbound/0.csv"]
+    assert inbound_files(samba_mock) == [f"0.csv.node2.{claims[0].expires_at}.claimed"]
+
+
+def test_renew_and_release_claim(samba_mock: SMBConnectionMock):
+    create_inbound_files(samba_mock, 1)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    (claim,) = pyndows.claim_files(
+        connection, "TestShare", "/inbound", "node1", lease=1
+    )
+
+    renewed = pyndows.renew_claim(connection, "TestShare", claim, lease=3600)
+    assert renewed.file_path == claim.file_path
+    assert renewed.expires_at >= claim.expires_at + 3598
+    assert inbound_files(samba_mock) == [f"0.csv.node1.{renewed.expires_at}.claimed"]
+
+    with pytest.raises(pyndows.PyndowsException):
+        pyndows.renew_claim(connection, "TestShare", claim)
+
+    pyndows.release_claim(connection, "TestShare", renewed)
+    assert inbound_files(samba_mock) == ["0.csv"]
+
+
+@pytest.mark.parametrize("node", ["", "node.1", "node/1", "node\\1"])
+def test_invalid_node_name(samba_mock: SMBConnectionMock, node: str):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.claim_files(connection, "TestShare", "/inbound", node)
+    assert str(exception_info.value) == f"{node} is not a valid node name."
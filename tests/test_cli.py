@@ -0,0 +1,329 @@
+import json
+import os
+import time
+import runpy
+import sys
+
+import pytest
+from smb.base import NotConnectedError, SMBTimeout
+
+from pyndows._cli import main
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+_connection = [
+    "--machine",
+    "TestComputer",
+    "--ip",
+    "127.0.0.1",
+    "--port",
+    "80",
+    "--domain",
+    "TestDomain",
+    "--user",
+    "TestUser",
+    "--password",
+    "TestPassword",
+    "--share",
+    "TestShare",
+]
+
+
+def test_ls(samba_mock: SMBConnectionMock, capsys):
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/B").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test ls 1")
+    samba_mock.path("TestShare", "/A/2.txt").write_text("Test ls 2")
+    samba_mock.path("TestShare", "/A/B/3.csv").write_text("Test ls 3")
+
+    assert main([*_connection, "--json", "ls", "/A/*.csv"]) == 0
+
+    listed = json.loads(capsys.readouterr().out)
+    assert [(file["path"], file["size"]) for file in listed] == [("/A/1.csv", 9)]
+
+
+def test_ls_recursive(samba_mock: SMBConnectionMock, capsys):
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/B").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test ls 1")
+    samba_mock.path("TestShare", "/A/B/3.csv").write_text("Test ls 3")
+
+    assert main([*_connection, "ls", "-r", "/A/*"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(line.split()[-1] for line in lines) == [
+        "/A/1.csv",
+        "/A/B/",
+        "/A/B/3.csv",
+    ]
+
+
+def test_stat(samba_mock: SMBConnectionMock, capsys):
+    samba_mock.path("TestShare", "/1.csv").write_text("Test stat")
+
+    assert main([*_connection, "--json", "stat", "/1.csv", "/missing.csv"]) == 1
+
+    described = json.loads(capsys.readouterr().out)
+    assert described[0]["path"] == "/1.csv"
+    assert described[0]["size"] == 9
+    assert not described[0]["is_directory"]
+    assert described[1] == {"path": "/missing.csv", "error": "Not found"}
+
+
+def test_stat_text(samba_mock: SMBConnectionMock, capsys):
+    assert main([*_connection, "stat", "/missing.csv"]) == 1
+
+    assert capsys.readouterr().out == "/missing.csv: Not found\n"
+
+
+def test_get(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/B").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test get 1")
+    samba_mock.path("TestShare", "/A/2.txt").write_text("Test get 2")
+    samba_mock.path("TestShare", "/A/B/3.csv").write_text("Test get 3")
+    local = os.path.join(tmpdir, "local")
+
+    assert main([*_connection, "-j", "2", "get", "-r", "/A/*.csv", local]) == 0
+
+    with open(os.path.join(local, "1.csv")) as file:
+        assert file.read() == "Test get 1"
+    with open(os.path.join(local, "B", "3.csv")) as file:
+        assert file.read() == "Test get 3"
+    assert not os.path.exists(os.path.join(local, "2.txt"))
+    output = capsys.readouterr()
+    assert output.out.startswith(
+        "transferred: 2, bytes: 20, seconds: "
+    ) and output.out.endswith(", skipped: 0, failed: 0\n")
+    assert "[2/2]" in output.err
+
+
+def test_get_failure(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    samba_mock.path("TestShare", "/1.csv").write_text("Test get 1")
+    samba_mock.path("TestShare", "/2.csv").write_text("Test get 2")
+
+    def fail_on_second_file(self, service_name, path, *args, **kwargs):
+        if path == "/2.csv":
+            raise OSError("Test failure")
+        return retrieve_file(self, service_name, path, *args, **kwargs)
+
+    retrieve_file = SMBConnectionMock.retrieveFile
+    samba_mock.add_callback("retrieveFile", fail_on_second_file)
+
+    assert main([*_connection, "--json", "-q", "get", "/*.csv", str(tmpdir)]) == 1
+
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["transferred"] == 1
+    assert summary["failed"] == 1
+    assert summary["errors"] == {"/2.csv": "Test failure"}
+
+
+def test_get_failure_text(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    samba_mock.path("TestShare", "/1.csv").write_text("Test get 1")
+
+    def fail(*args, **kwargs):
+        raise OSError("Test failure")
+
+    samba_mock.add_callback("retrieveFile", fail)
+
+    assert main([*_connection, "-q", "get", "/*.csv", str(tmpdir)]) == 1
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "/1.csv: Test failure"
+    assert lines[1].startswith("transferred: 0, bytes: 0, seconds: ")
+
+
+def test_quiet(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    samba_mock.path("TestShare", "/1.csv").write_text("Test get 1")
+
+    assert main([*_connection, "-q", "get", "/*.csv", str(tmpdir)]) == 0
+
+    assert capsys.readouterr().err == ""
+
+
+def test_put(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    local = tmpdir.mkdir("local")
+    local.join("1.csv").write_text("Test put 1", encoding="utf-8")
+    local.join("2.txt").write_text("Test put 2", encoding="utf-8")
+    local.mkdir("B").join("3.csv").write_text("Test put 3", encoding="utf-8")
+
+    assert (
+        main(
+            [
+                *_connection,
+                "--json",
+                "put",
+                "-r",
+                os.path.join(local, "*.csv"),
+                "/A",
+            ]
+        )
+        == 0
+    )
+
+    assert samba_mock.path("TestShare", "/A/1.csv").read_text() == "Test put 1"
+    assert samba_mock.path("TestShare", "/A/B/3.csv").read_text() == "Test put 3"
+    assert not samba_mock.path("TestShare", "/A/2.txt").exists()
+    # Local files are kept
+    assert local.join("1.csv").read_text(encoding="utf-8") == "Test put 1"
+    assert json.loads(capsys.readouterr().out)["transferred"] == 2
+
+
+def test_put_waits_for_new_folders_once(
+    samba_mock: SMBConnectionMock, tmpdir, monkeypatch
+):
+    samba_mock.path("TestShare", "/A").mkdir()
+    local = tmpdir.mkdir("local")
+    for index in range(4):
+        local.join(f"{index}.csv").write_text("Test put", encoding="utf-8")
+    slept = []
+    # Only record actual waits
+    monkeypatch.setattr(time, "sleep", lambda delay: delay and slept.append(delay))
+
+    assert main([*_connection, "-q", "put", os.path.join(local, "*"), "/A"]) == 0
+    # Folder already exists
+    assert slept == []
+
+    assert main([*_connection, "-q", "put", os.path.join(local, "*"), "/B/C"]) == 0
+    assert slept == [1]
+    assert samba_mock.path("TestShare", "/B/C/3.csv").read_text() == "Test put"
+
+
+def test_put_without_sub_folders(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    local = tmpdir.mkdir("local")
+    local.join("1.csv").write_text("Test put 1", encoding="utf-8")
+    local.mkdir("B").join("3.csv").write_text("Test put 3", encoding="utf-8")
+
+    assert main([*_connection, "-q", "put", os.path.join(local, "*"), "/A/"]) == 0
+
+    assert samba_mock.path("TestShare", "/A/1.csv").read_text() == "Test put 1"
+    assert not samba_mock.path("TestShare", "/A/B").exists()
+
+
+def test_sync(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/B").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test sync 1")
+    samba_mock.path("TestShare", "/A/B/2.csv").write_text("Test sync 2")
+    local = os.path.join(tmpdir, "local")
+
+    assert main([*_connection, "--json", "-q", "sync", "/A", local]) == 0
+    assert json.loads(capsys.readouterr().out)["transferred"] == 2
+    with open(os.path.join(local, "B", "2.csv")) as file:
+        assert file.read() == "Test sync 2"
+
+    # Unchanged files are not retrieved again
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test sync 1 changed")
+    assert main([*_connection, "--json", "-q", "sync", "/A", local]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["transferred"] == 1
+    assert summary["skipped"] == 1
+    with open(os.path.join(local, "1.csv")) as file:
+        assert file.read() == "Test sync 1 changed"
+
+
+def test_sync_upload(samba_mock: SMBConnectionMock, tmpdir, capsys):
+    local = tmpdir.mkdir("local")
+    local.join("1.csv").write_text("Test sync 1", encoding="utf-8")
+    local.mkdir("B").join("2.csv").write_text("Test sync 2", encoding="utf-8")
+
+    assert (
+        main([*_connection, "--json", "-q", "sync", "--upload", "/A", str(local)]) == 0
+    )
+    assert json.loads(capsys.readouterr().out)["transferred"] == 2
+    assert samba_mock.path("TestShare", "/A/B/2.csv").read_text() == "Test sync 2"
+
+    # Unchanged files are not sent again
+    local.join("1.csv").write_text("Test sync 1 changed", encoding="utf-8")
+    assert (
+        main([*_connection, "--json", "-q", "sync", "--upload", "/A", str(local)]) == 0
+    )
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["transferred"] == 1
+    assert summary["skipped"] == 1
+    assert samba_mock.path("TestShare", "/A/1.csv").read_text() == "Test sync 1 changed"
+
+
+def test_rm(samba_mock: SMBConnectionMock, capsys):
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test rm 1")
+    samba_mock.path("TestShare", "/A/2.txt").write_text("Test rm 2")
+
+    assert main([*_connection, "rm", "/A/*.csv"]) == 0
+
+    assert not samba_mock.path("TestShare", "/A/1.csv").exists()
+    assert samba_mock.path("TestShare", "/A/2.txt").exists()
+    assert capsys.readouterr().out == "deleted: 1, failed: 0\n"
+
+
+def test_password_from_environment(samba_mock: SMBConnectionMock, monkeypatch, capsys):
+    passwords = []
+
+    def store_password(self, user_name, password, *args, **kwargs):
+        passwords.append(password)
+        self.remote_name = args[1]
+
+    samba_mock.add_callback("__init__", store_password)
+    monkeypatch.setenv("PYNDOWS_PASSWORD", "EnvironmentPassword")
+    without_password = [
+        argument
+        for argument in _connection
+        if argument not in ("--password", "TestPassword")
+    ]
+
+    assert main([*without_password, "ls", "/*"]) == 0
+    assert passwords == ["EnvironmentPassword"]
+
+
+def test_connection_failure(samba_mock: SMBConnectionMock, capsys):
+    samba_mock.add_callback("connect", lambda *args: False)
+
+    assert main([*_connection, "ls", "/*"]) == 2
+
+    assert capsys.readouterr().err == (
+        "pyndows: Impossible to connect to TestComputer (127.0.0.1:80), "
+        "check connectivity or TestDomain\\TestUser rights.\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "failure, message",
+    [
+        (
+            ConnectionRefusedError(111, "Connection refused"),
+            "[Errno 111] Connection refused",
+        ),
+        (NotConnectedError(), "NotConnectedError"),
+        (SMBTimeout(), "SMBTimeout"),
+    ],
+)
+def test_connection_error(samba_mock: SMBConnectionMock, capsys, failure, message):
+    def fail(*args):
+        raise failure
+
+    samba_mock.add_callback("connect", fail)
+
+    assert main([*_connection, "ls", "/*"]) == 2
+
+    assert capsys.readouterr().err == f"pyndows: {message}\n"
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1"])
+def test_invalid_jobs(samba_mock: SMBConnectionMock, capsys, jobs):
+    with pytest.raises(SystemExit) as exception_info:
+        main([*_connection, "-j", jobs, "ls", "/*"])
+
+    assert exception_info.value.code == 2
+    assert (
+        f"argument -j/--jobs: must be at least 1, got {jobs}" in capsys.readouterr().err
+    )
+
+
+def test_module_execution(samba_mock: SMBConnectionMock, monkeypatch, capsys):
+    samba_mock.path("TestShare", "/1.csv").write_text("Test module")
+    monkeypatch.setattr(sys, "argv", ["pyndows", *_connection, "ls", "/*"])
+
+    with pytest.raises(SystemExit) as exception_info:
+        runpy.run_module("pyndows", run_name="__main__")
+
+    assert exception_info.value.code == 0
+    assert capsys.readouterr().out.endswith(" /1.csv\n")
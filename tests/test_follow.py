@@ -0,0 +1,184 @@
+import os
+import threading
+
+import pytest
+from smb.smb_structs import OperationFailure
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+@pytest.fixture
+def create_times(samba_mock: SMBConnectionMock) -> dict:
+    """
+    Creation time of files (by name).
+
+    Mocked files provide their last status change time as creation time, which changes when content is appended.
+    """
+    times = {}
+    list_path = SMBConnectionMock.listPath
+
+    def stable_create_time(self, service_name, path, *args, **kwargs):
+        files = list_path(self, service_name, path, *args, **kwargs)
+        for file in files:
+            file.create_time = times.get(file.filename, 0.0)
+        return files
+
+    samba_mock.add_callback("listPath", stable_create_time)
+    return times
+
+
+def append(samba_mock: SMBConnectionMock, content: bytes):
+    with samba_mock.path("TestShare", "/service.log").open("ab") as log_file:
+        log_file.write(content)
+
+
+def test_follow_appended_content(samba_mock: SMBConnectionMock, create_times: dict):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    append(samba_mock, b"line 1\n")
+    appender = threading.Timer(0.1, append, (samba_mock, b"line 2\n"))
+    appender.start()
+
+    assert list(
+        pyndows.follow(
+            connection,
+            "TestShare",
+            "/service.log",
+            poll_interval=0.01,
+            idle_timeout=1,
+        )
+    ) == [b"line 1\n", b"line 2\n"]
+
+
+def test_follow_by_chunks(samba_mock: SMBConnectionMock, create_times: dict):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    append(samba_mock, b"1234567890")
+
+    assert list(
+        pyndows.follow(
+            connection, "TestShare", "/service.log", idle_timeout=0, chunk_size=4
+        )
+    ) == [b"1234", b"5678", b"90"]
+
+
+def test_follow_resumes_from_checkpoint(
+    samba_mock: SMBConnectionMock, create_times: dict, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    checkpoint = os.path.join(tmpdir, "checkpoint.json")
+    append(samba_mock, b"line 1\n")
+
+    for chunk in pyndows.follow(
+        connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+    ):
+        assert chunk == b"line 1\n"
+
+    append(samba_mock, b"line 2\n")
+    append_chunks = pyndows.follow(
+        connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+    )
+    assert next(append_chunks) == b"line 2\n"
+    # Chunk was not processed, it must be provided again
+    append_chunks.close()
+
+    assert list(
+        pyndows.follow(
+            connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+        )
+    ) == [b"line 2\n"]
+    assert (
+        list(
+            pyndows.follow(
+                connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+            )
+        )
+        == []
+    )
+
+
+def test_follow_truncated_file(
+    samba_mock: SMBConnectionMock, create_times: dict, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    checkpoint = os.path.join(tmpdir, "checkpoint.json")
+    append(samba_mock, b"line 1\nline 2\n")
+    list(
+        pyndows.follow(
+            connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+        )
+    )
+
+    samba_mock.path("TestShare", "/service.log").write_bytes(b"line 3\n")
+
+    assert list(
+        pyndows.follow(
+            connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+        )
+    ) == [b"line 3\n"]
+
+
+def test_follow_rotated_file(samba_mock: SMBConnectionMock, create_times: dict, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    checkpoint = os.path.join(tmpdir, "checkpoint.json")
+    append(samba_mock, b"line 1\n")
+    list(
+        pyndows.follow(
+            connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+        )
+    )
+
+    # New file, bigger than the previous one
+    samba_mock.path("TestShare", "/service.log").rename(
+        samba_mock.path("TestShare", "/service.log.1")
+    )
+    append(samba_mock, b"line 2\nline 3\n")
+    create_times["service.log"] = 1_000_000.0
+
+    assert list(
+        pyndows.follow(
+            connection, "TestShare", "/service.log", checkpoint, idle_timeout=0
+        )
+    ) == [b"line 2\nline 3\n"]
+
+
+def test_follow_file_created_later(samba_mock: SMBConnectionMock, create_times: dict):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    creator = threading.Timer(0.1, append, (samba_mock, b"line 1\n"))
+    creator.start()
+
+    assert list(
+        pyndows.follow(
+            connection, "TestShare", "/service.log", poll_interval=0.01, idle_timeout=1
+        )
+    ) == [b"line 1\n"]
+
+
+def test_follow_retrieval_failure(samba_mock: SMBConnectionMock, create_times: dict):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    append(samba_mock, b"line 1\n")
+
+    def retrieval_failure(*args, **kwargs):
+        raise OperationFailure("Access denied", [])
+
+    samba_mock.add_callback("retrieveFileFromOffset", retrieval_failure)
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        next(pyndows.follow(connection, "TestShare", "/service.log"))
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\TestComputer\TestShare/service.log file"
+    )
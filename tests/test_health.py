@@ -1,9 +1,15 @@
 import os
 import os.path
+import queue
+import threading
 
+import pytest
+from smb.base import NotConnectedError
 from smb.smb_structs import OperationFailure
 
 import pyndows
+import pyndows._health
+from pyndows._health import _Monitored
 from pyndows.testing import samba_mock, SMBConnectionMock, mock_pyndows_health_datetime
 
 
@@ -44,3 +50,271 @@ def test_fail_health_check(samba_mock: SMBConnectionMock, mock_pyndows_health_da
             }
         },
     )
+
+
+def test_health(samba_mock: SMBConnectionMock, mock_pyndows_health_datetime):
+    with pyndows.HealthMonitor(interval=0.01) as monitor:
+        monitor.add(
+            "test1",
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+        )
+        monitor.add(
+            "test2",
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+        )
+        assert monitor.health() == (
+            "pass",
+            {
+                "test1:echo": {
+                    "componentType": "TestComputer",
+                    "observedValue": "",
+                    "status": "pass",
+                    "time": "2018-10-11T15:05:05.663979",
+                },
+                "test2:echo": {
+                    "componentType": "TestComputer",
+                    "observedValue": "",
+                    "status": "pass",
+                    "time": "2018-10-11T15:05:05.663979",
+                },
+            },
+        )
+
+
+def test_health_does_not_perform_remote_calls(samba_mock: SMBConnectionMock):
+    echoes = samba_mock.track_calls("echo")
+    with pyndows.HealthMonitor(interval=60) as monitor:
+        monitor.add(
+            "test",
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+        )
+        for _ in range(1000):
+            assert monitor.health()[0] == "pass"
+
+    assert len(echoes) == 1
+
+
+@pytest.fixture
+def refreshes(monkeypatch) -> queue.Queue:
+    """Filled (with the monitored connection) every time a background refresh is complete."""
+    completed = queue.Queue()
+    refresh = _Monitored.refresh
+
+    def track_refresh(self):
+        refresh(self)
+        completed.put(self)
+
+    monkeypatch.setattr(_Monitored, "refresh", track_refresh)
+    return completed
+
+
+def wait_for_new_refresh(refreshes: queue.Queue):
+    """Wait for a refresh that started after this call."""
+    while not refreshes.empty():
+        refreshes.get()
+    # The first one might have started before this call
+    refreshes.get(timeout=5)
+    refreshes.get(timeout=5)
+
+
+def test_health_is_refreshed(samba_mock: SMBConnectionMock, refreshes: queue.Queue):
+    failing = threading.Event()
+
+    def echo(self, data, timeout=10):
+        if failing.is_set():
+            raise OperationFailure("Mock for echo failure.", [])
+        return data
+
+    samba_mock.add_callback("echo", echo)
+    with pyndows.HealthMonitor(interval=0.01) as monitor:
+        monitor.add(
+            "test",
+            pyndows.connect(
+                "TestComputer",
+                "127.0.0.1",
+                80,
+                "TestDomain",
+                "TestUser",
+                "TestPassword",
+            ),
+        )
+        assert monitor.health()[0] == "pass"
+        failing.set()
+        wait_for_new_refresh(refreshes)
+        status, checks = monitor.health()
+
+    assert status == "fail"
+    assert checks["test:echo"]["status"] == "fail"
+    assert checks["test:echo"]["output"].startswith("Mock for echo failure.")
+
+
+def test_connection_is_reestablished_after_a_failure(
+    samba_mock: SMBConnectionMock, refreshes: queue.Queue
+):
+    echoes = []
+
+    def fail_first_echo(self, data, timeout=10):
+        echoes.append(data)
+        if len(echoes) == 1:
+            raise NotConnectedError()
+        return data
+
+    samba_mock.add_callback("echo", fail_first_echo)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    connections = samba_mock.track_calls("connect")
+    with pyndows.HealthMonitor(interval=0.01) as monitor:
+        monitor.add("test", connection)
+        assert monitor.health()[0] == "fail"
+        wait_for_new_refresh(refreshes)
+        assert monitor.health()[0] == "pass"
+
+    # Connection was re-established once, after the failure
+    assert len(connections) == 1
+
+
+def test_connection_that_cannot_be_reestablished(
+    samba_mock: SMBConnectionMock, refreshes: queue.Queue
+):
+    def fail_echo(self, data, timeout=10):
+        raise NotConnectedError()
+
+    samba_mock.add_callback("echo", fail_echo)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.add_callback("connect", lambda *args: False)
+    with pyndows.HealthMonitor(interval=0.01) as monitor:
+        monitor.add("test", connection)
+        wait_for_new_refresh(refreshes)
+        status, checks = monitor.health()
+
+    assert status == "fail"
+    assert (
+        checks["test:echo"]["output"]
+        == "Impossible to reconnect to TestComputer (127.0.0.1:80)."
+    )
+
+
+def test_failing_pooled_connection_is_replaced(
+    samba_mock: SMBConnectionMock, refreshes: queue.Queue
+):
+    failing = []
+
+    def fail_on_first_connection(self, data, timeout=10):
+        if not failing:
+            failing.append(self)
+        if self is failing[0]:
+            raise NotConnectedError()
+        return data
+
+    samba_mock.add_callback("echo", fail_on_first_connection)
+    closed = samba_mock.track_calls("close")
+    pool = pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with pyndows.HealthMonitor(interval=0.01) as monitor:
+        monitor.add("test", pool)
+        assert monitor.health()[0] == "fail"
+        wait_for_new_refresh(refreshes)
+        assert monitor.health()[0] == "pass"
+
+    # Failing connection was closed and a single connection remains
+    assert len(closed) == 1
+    assert pool._created == 1
+
+
+def test_stale_health(samba_mock: SMBConnectionMock, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(pyndows._health, "_now", lambda: now[0])
+    monitor = pyndows.HealthMonitor(interval=60, warn_after=0.2, fail_after=0.5)
+    monitor.add(
+        "test",
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+    )
+    monitor.add(
+        "other",
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+    )
+    try:
+        now[0] += 0.1
+        assert monitor.health()[0] == "pass"
+
+        now[0] += 0.2
+        status, checks = monitor.health()
+        assert status == "warn"
+        assert checks["test:echo"]["status"] == "warn"
+        assert checks["test:echo"]["output"] == "Last checked 0.3 seconds ago."
+
+        now[0] += 0.3
+        status, checks = monitor.health()
+        assert status == "fail"
+        assert checks["other:echo"]["status"] == "fail"
+        assert checks["other:echo"]["output"] == "Last checked 0.6 seconds ago."
+    finally:
+        monitor.stop()
+
+
+def test_default_staleness():
+    monitor = pyndows.HealthMonitor(interval=5)
+    assert monitor.warn_after == 15
+    assert monitor.fail_after == 30
+
+
+def test_health_using_a_pool(
+    samba_mock: SMBConnectionMock, mock_pyndows_health_datetime
+):
+    pool = pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with pyndows.HealthMonitor(interval=60) as monitor:
+        monitor.add("test", pool)
+        assert monitor.health()[0] == "pass"
+
+
+def test_health_using_a_pool_that_cannot_connect(
+    samba_mock: SMBConnectionMock, mock_pyndows_health_datetime
+):
+    samba_mock.add_callback("connect", lambda *args: False)
+    pool = pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with pyndows.HealthMonitor(interval=60) as monitor:
+        monitor.add("test", pool)
+        assert monitor.health() == (
+            "fail",
+            {
+                "test:echo": {
+                    "componentType": "TestComputer",
+                    "status": "fail",
+                    "time": "2018-10-11T15:05:05.663979",
+                    "output": r"Impossible to connect to TestComputer (127.0.0.1:80), check connectivity or TestDomain\TestUser rights.",
+                }
+            },
+        )
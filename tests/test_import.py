@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+import pytest
+
+import pyndows
+
+# Maximum number of microseconds to import pyndows (loading pysmb takes around 100 milliseconds)
+_import_time_budget = 25_000
+
+
+def run_python(*options: str, code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+def test_import_does_not_load_pysmb():
+    result = run_python(
+        code="import sys, pyndows; print(sorted(name for name in sys.modules if name.split('.')[0] == 'smb'))"
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_attributes_are_loaded_when_accessed():
+    result = run_python(
+        code="import sys, pyndows; pyndows.connect; print('smb.SMBConnection' in sys.modules)"
+    )
+    assert result.stdout.strip() == "True"
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="-X importtime requires Python 3.7"
+)
+def test_import_time():
+    # Best of a few runs to reduce noise
+    timings = []
+    for _ in range(3):
+        result = run_python("-X", "importtime", code="import pyndows")
+        cumulative = [
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.split("|")[-1].strip() == "pyndows"
+        ]
+        timings.append(cumulative[0])
+    assert min(timings) < _import_time_budget
+
+
+def test_lazy_attributes():
+    assert pyndows.get_folder_content is pyndows._windows.get_folder_content
+    assert "Scheduler" in dir(pyndows)
+    assert "Scheduler" in pyndows.__all__
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError) as exception_info:
+        pyndows.unknown
+    assert str(exception_info.value) == "module 'pyndows' has no attribute 'unknown'"
@@ -0,0 +1,187 @@
+import datetime
+import os
+
+import pyndows
+from pyndows.index import Index, IndexedFile
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def create_share(samba_mock: SMBConnectionMock):
+    samba_mock.path("TestShare", "/1.csv").write_bytes(b"1" * 10)
+    samba_mock.path("TestShare", "/archive").mkdir()
+    samba_mock.path("TestShare", "/archive/2020").mkdir()
+    samba_mock.path("TestShare", "/archive/2020/big.csv").write_bytes(b"2" * 2000)
+    samba_mock.path("TestShare", "/archive/2020/small.xml").write_bytes(b"3" * 20)
+    samba_mock.path("TestShare", "/archive/2021").mkdir()
+    samba_mock.path("TestShare", "/archive/2021/big_file.csv").write_bytes(b"4" * 3000)
+    # Use distinct (and old) times so that changes are always detected
+    for path, timestamp in [
+        ("/1.csv", 1_000_000),
+        ("/archive/2020/big.csv", 2_000_000),
+        ("/archive/2020/small.xml", 3_000_000),
+        ("/archive/2021/big_file.csv", 4_000_000),
+        ("/archive/2020", 5_000_000),
+        ("/archive/2021", 5_000_000),
+        ("/archive", 5_000_000),
+    ]:
+        os.utime(samba_mock.path("TestShare", path), (timestamp, timestamp))
+
+
+def paths(files) -> list:
+    return [file.path for file in files]
+
+
+def test_search_indexed_files(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_share(samba_mock)
+
+    with Index(":memory:") as index:
+        assert index.refresh(connection, "TestShare") == 4
+
+        assert paths(index.search("TestShare")) == [
+            "/1.csv",
+            "/archive/2020/big.csv",
+            "/archive/2020/small.xml",
+            "/archive/2021/big_file.csv",
+        ]
+        assert index.search("TestShare", "/archive/2020", pattern="*.XML") == [
+            IndexedFile(
+                path="/archive/2020/small.xml",
+                is_directory=False,
+                file_size=20,
+                create_time=samba_mock.path("TestShare", "/archive/2020/small.xml")
+                .stat()
+                .st_ctime,
+                last_write_time=3_000_000,
+                file_attributes=32,
+            )
+        ]
+        assert paths(index.search("TestShare", min_size=1000)) == [
+            "/archive/2020/big.csv",
+            "/archive/2021/big_file.csv",
+        ]
+        assert paths(index.search("TestShare", max_size=20)) == [
+            "/1.csv",
+            "/archive/2020/small.xml",
+        ]
+        assert paths(
+            index.search(
+                "TestShare",
+                modified_after=2_000_000,
+                modified_before=datetime.datetime.fromtimestamp(4_000_000),
+            )
+        ) == ["/archive/2020/big.csv", "/archive/2020/small.xml"]
+        assert paths(index.search("TestShare", "/archive/", pattern="big_*")) == [
+            "/archive/2021/big_file.csv"
+        ]
+        assert paths(index.search("TestShare", pattern="?.csv")) == ["/1.csv"]
+        assert paths(index.search("TestShare", include_folders=True)) == [
+            "/1.csv",
+            "/archive",
+            "/archive/2020",
+            "/archive/2020/big.csv",
+            "/archive/2020/small.xml",
+            "/archive/2021",
+            "/archive/2021/big_file.csv",
+        ]
+        assert index.search("AnotherShare") == []
+
+
+def test_only_changed_folders_are_listed_again(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_share(samba_mock)
+
+    with Index(":memory:") as index:
+        index.refresh(connection, "TestShare")
+        assert index.refresh(connection, "TestShare") == 1
+
+        samba_mock.path("TestShare", "/archive/2021/new.csv").write_bytes(b"5")
+        samba_mock.path("TestShare", "/archive/2020/small.xml").unlink()
+        listed = samba_mock.track_calls("listPath")
+        assert index.refresh(connection, "TestShare") == 3
+
+        assert sorted(call["path"] for call in listed) == [
+            "",
+            "/archive/2020",
+            "/archive/2021",
+        ]
+        assert paths(index.search("TestShare")) == [
+            "/1.csv",
+            "/archive/2020/big.csv",
+            "/archive/2021/big_file.csv",
+            "/archive/2021/new.csv",
+        ]
+
+
+def test_removed_folders_are_removed_from_index(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_share(samba_mock)
+    database_path = os.path.join(tmpdir, "index.sqlite")
+
+    with Index(database_path) as index:
+        index.refresh(connection, "TestShare")
+
+    samba_mock.path("TestShare", "/archive/2021/big_file.csv").unlink()
+    samba_mock.path("TestShare", "/archive/2021").rmdir()
+    # Keep the same last write time so that archive folder is not listed again
+    os.utime(samba_mock.path("TestShare", "/archive"), (5_000_000, 5_000_000))
+
+    # Index is persisted
+    with Index(database_path) as index:
+        assert index.refresh(connection, "TestShare") == 1
+        assert paths(index.search("TestShare", include_folders=True)) == [
+            "/1.csv",
+            "/archive",
+            "/archive/2020",
+            "/archive/2020/big.csv",
+            "/archive/2020/small.xml",
+        ]
+
+        samba_mock.path("TestShare", "/archive/2020/big.csv").unlink()
+        samba_mock.path("TestShare", "/archive/2020/small.xml").unlink()
+        samba_mock.path("TestShare", "/archive/2020").rmdir()
+        os.utime(samba_mock.path("TestShare", "/archive"), (6_000_000, 6_000_000))
+
+        assert index.refresh(connection, "TestShare") == 2
+        assert paths(index.search("TestShare", include_folders=True)) == [
+            "/1.csv",
+            "/archive",
+        ]
+
+
+def test_full_refresh(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_share(samba_mock)
+
+    with Index(":memory:") as index:
+        index.refresh(connection, "TestShare")
+        samba_mock.path("TestShare", "/archive/2020/big.csv").write_bytes(b"2" * 5000)
+        os.utime(samba_mock.path("TestShare", "/archive/2020"), (5_000_000, 5_000_000))
+
+        assert index.refresh(connection, "TestShare") == 1
+        assert index.search("TestShare", pattern="big.csv")[0].file_size == 2000
+
+        assert index.refresh(connection, "TestShare", full=True) == 4
+        assert index.search("TestShare", pattern="big.csv")[0].file_size == 5000
+
+
+def test_refresh_sub_folder(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_share(samba_mock)
+
+    with Index(":memory:") as index:
+        assert index.refresh(connection, "TestShare", "/archive/2020/") == 1
+        assert paths(index.search("TestShare")) == [
+            "/archive/2020/big.csv",
+            "/archive/2020/small.xml",
+        ]
@@ -0,0 +1,115 @@
+import datetime
+import os
+
+import pytest
+from smb.SMBConnection import SMB_FILE_ATTRIBUTE_DIRECTORY, SMB_FILE_ATTRIBUTE_ARCHIVE
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def create_folder(samba_mock: SMBConnectionMock):
+    for name, size, timestamp in [
+        ("small.csv", 10, 1_000_000),
+        ("big.csv", 2000, 2_000_000),
+        ("élève.xml", 20, 3_000_000),
+    ]:
+        path = samba_mock.path("TestShare", f"/folder/{name}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"1" * size)
+        os.utime(path, (timestamp, timestamp))
+    samba_mock.path("TestShare", "/folder/sub_folder").mkdir()
+    os.utime(samba_mock.path("TestShare", "/folder/sub_folder"), (4_000_000,) * 2)
+
+
+def test_compact_folder_content(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_folder(samba_mock)
+
+    listing = pyndows.get_folder_content(
+        connection, "TestShare", "/folder", compact=True
+    )
+
+    assert isinstance(listing, pyndows.FolderListing)
+    assert len(listing) == 4
+    assert sorted(listing.names()) == [
+        "big.csv",
+        "small.csv",
+        "sub_folder",
+        "élève.xml",
+    ]
+    assert sorted(listing.file_size) == [0, 10, 20, 2000]
+
+    files = {file.filename: file for file in listing}
+    assert files["élève.xml"].file_size == 20
+    assert files["élève.xml"].alloc_size == 20
+    assert files["élève.xml"].last_write_time == 3_000_000
+    assert files["élève.xml"].file_attributes == SMB_FILE_ATTRIBUTE_ARCHIVE
+    assert not files["élève.xml"].isDirectory
+    assert files["sub_folder"].isDirectory
+
+    last = listing[-1]
+    assert last.filename == listing.name(len(listing) - 1)
+    assert listing.is_directory(-1) == last.isDirectory
+
+
+def test_compact_folder_content_index_out_of_range(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_folder(samba_mock)
+    listing = pyndows.get_folder_content(
+        connection, "TestShare", "/folder", compact=True
+    )
+
+    with pytest.raises(IndexError):
+        listing[4]
+    with pytest.raises(IndexError):
+        listing.name(-5)
+
+
+def test_compact_folder_content_non_existing_folder(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    listing = pyndows.get_folder_content(
+        connection, "TestShare", "/non_existing", compact=True
+    )
+
+    assert len(listing) == 0
+    assert list(listing) == []
+
+
+def test_select_compact_folder_content(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_folder(samba_mock)
+    listing = pyndows.get_folder_content(
+        connection, "TestShare", "/folder", compact=True
+    )
+
+    assert sorted(listing.select().names()) == sorted(listing.names())
+    assert sorted(listing.select(min_size=20).names()) == ["big.csv", "élève.xml"]
+    assert sorted(listing.select(max_size=10).names()) == ["small.csv", "sub_folder"]
+    assert sorted(
+        listing.select(
+            modified_after=2_000_000,
+            modified_before=datetime.datetime.fromtimestamp(4_000_000),
+        ).names()
+    ) == ["big.csv", "élève.xml"]
+    assert list(listing.select(attributes=SMB_FILE_ATTRIBUTE_DIRECTORY).names()) == [
+        "sub_folder"
+    ]
+    files = listing.select(excluded_attributes=SMB_FILE_ATTRIBUTE_DIRECTORY)
+    assert sorted(files.names()) == ["big.csv", "small.csv", "élève.xml"]
+
+    # Selections can be chained and keep every attribute
+    big = files.select(min_size=1000)
+    assert len(big) == 1
+    assert big[0].filename == "big.csv"
+    assert big[0].file_size == 2000
+    assert big[0].last_write_time == 2_000_000
+    assert list(listing.select(min_size=1, max_size=5)) == []
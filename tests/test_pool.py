@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+from smb.base import NotConnectedError
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def test_connections_are_reused(samba_mock: SMBConnectionMock):
+    pool = pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    assert pool.remote_name == "TestComputer"
+
+    with pool.connection() as first_connection:
+        pass
+    with pool.connection() as second_connection:
+        assert second_connection is first_connection
+
+
+def test_connections_are_created_up_to_size(samba_mock: SMBConnectionMock):
+    pool = pyndows.ConnectionPool(
+        "TestComputer",
+        "127.0.0.1",
+        80,
+        "TestDomain",
+        "TestUser",
+        "TestPassword",
+        size=2,
+    )
+    acquired = []
+
+    def acquire_third():
+        with pool.connection() as connection:
+            acquired.append(connection)
+
+    with pool.connection() as first_connection:
+        with pool.connection() as second_connection:
+            assert second_connection is not first_connection
+            waiting = threading.Thread(target=acquire_third)
+            waiting.start()
+            waiting.join(timeout=0.2)
+            # Third connection must wait for a connection to be released
+            assert not acquired
+    waiting.join()
+    assert acquired[0] in (first_connection, second_connection)
+
+
+def test_connection_failure_does_not_count_in_size(samba_mock: SMBConnectionMock):
+    pool = pyndows.ConnectionPool(
+        "TestComputer",
+        "127.0.0.1",
+        80,
+        "TestDomain",
+        "TestUser",
+        "TestPassword",
+        size=1,
+    )
+    samba_mock.add_callback("connect", lambda *args: False)
+    with pytest.raises(pyndows.PyndowsException):
+        with pool.connection():
+            pass
+
+    samba_mock.add_callback("connect", lambda *args: True)
+    with pool.connection() as connection:
+        assert connection is not None
+
+
+def test_idle_connections_are_closed(samba_mock: SMBConnectionMock):
+    closed = []
+    samba_mock.add_callback("close", lambda connection: closed.append(connection))
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        with pool.connection() as first_connection:
+            with pool.connection() as second_connection:
+                pass
+
+    assert sorted(closed, key=id) == sorted(
+        [first_connection, second_connection], key=id
+    )
+
+
+def test_connection_is_not_reused_after_a_failure(samba_mock: SMBConnectionMock):
+    closed = []
+    samba_mock.add_callback("close", lambda connection: closed.append(connection))
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        with pytest.raises(NotConnectedError):
+            with pool.connection() as failed_connection:
+                raise NotConnectedError()
+        assert closed == [failed_connection]
+
+        with pool.connection() as connection:
+            assert connection is not failed_connection
+
+    assert closed == [failed_connection, connection]
+
+
+def test_waiting_for_a_connection_that_failed(samba_mock: SMBConnectionMock):
+    pool = pyndows.ConnectionPool(
+        "TestComputer",
+        "127.0.0.1",
+        80,
+        "TestDomain",
+        "TestUser",
+        "TestPassword",
+        size=1,
+    )
+    acquired = []
+
+    def acquire_second():
+        with pool.connection() as connection:
+            acquired.append(connection)
+
+    with pytest.raises(NotConnectedError):
+        with pool.connection() as failed_connection:
+            waiting = threading.Thread(target=acquire_second)
+            waiting.start()
+            waiting.join(timeout=0.2)
+            # Second connection must wait for the connection to be released
+            assert not acquired
+            raise NotConnectedError()
+    waiting.join()
+    # A new connection was created instead of the failed one
+    assert acquired[0] is not failed_connection
@@ -0,0 +1,222 @@
+import io
+import os
+import time
+
+import pytest
+from smb.smb_structs import OperationFailure
+
+import pyndows
+import pyndows.testing
+from pyndows.recording import RecordingConnection, load
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def record_interactions(samba_mock: SMBConnectionMock, tmpdir) -> str:
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test Record 1")
+    local_file = tmpdir.join("2.csv")
+    local_file.write_text("Test Record 22", encoding="utf-8")
+    recording_file_path = os.path.join(tmpdir, "recording.gz")
+
+    with RecordingConnection(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        recording_file_path,
+    ) as connection:
+        pyndows.get(connection, "TestShare", "/A/1.csv", os.path.join(tmpdir, "1.csv"))
+        pyndows.move(connection, "TestShare", "/B/2.csv", str(local_file))
+        assert [
+            file.filename
+            for file in pyndows.get_folder_content(connection, "TestShare", "/A")
+        ] == ["1.csv"]
+        pyndows.check("test", connection)
+        pyndows.rename(connection, "TestShare", "/B/2.csv", "/B/3.csv")
+    return recording_file_path
+
+
+def test_record(samba_mock: SMBConnectionMock, tmpdir):
+    recording_file_path = record_interactions(samba_mock, tmpdir)
+
+    interactions = load(recording_file_path)
+    assert [
+        (interaction["method"], interaction["args"]) for interaction in interactions
+    ] == [
+        ("retrieveFile", ["TestShare", "/A/1.csv"]),
+        ("listPath", ["TestShare", "/", "pattern=B"]),
+        ("createDirectory", ["TestShare", "/Btemp"]),
+        ("rename", ["TestShare", "/Btemp", "/B"]),
+        ("storeFile", ["TestShare", "/B/2.csv.tmp"]),
+        ("rename", ["TestShare", "/B/2.csv.tmp", "/B/2.csv"]),
+        ("listPath", ["TestShare", "/A", "pattern=*"]),
+        ("echo", []),
+        ("listPath", ["TestShare", "/B", "pattern=2.csv"]),
+        ("rename", ["TestShare", "/B/2.csv", "/B/3.csv"]),
+    ]
+    assert interactions[0]["size"] == 13
+    # B folder did not exist yet
+    assert (
+        interactions[1]["error"]
+        == "Failed to list / on TestShare: Unable to open directory"
+    )
+    assert interactions[4]["size"] == 14
+    assert [file[:3] for file in interactions[6]["files"]] == [
+        [".", False, 0],
+        ["..", False, 0],
+        ["1.csv", False, 13],
+    ]
+    assert all(interaction["duration"] >= 0 for interaction in interactions)
+
+
+def test_replay(samba_mock: SMBConnectionMock, tmpdir):
+    recording_file_path = record_interactions(samba_mock, tmpdir)
+    samba_mock.cleanup()
+    samba_mock.replay(recording_file_path)
+    local_file = tmpdir.join("2.csv")
+    local_file.write_text("Test Record 22", encoding="utf-8")
+
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    pyndows.get(connection, "TestShare", "/A/1.csv", os.path.join(tmpdir, "1.csv"))
+    with open(os.path.join(tmpdir, "1.csv"), "rb") as retrieved:
+        assert retrieved.read() == bytes(13)
+    pyndows.move(connection, "TestShare", "/B/2.csv", str(local_file))
+    listed = pyndows.get_folder_content(connection, "TestShare", "/A")
+    assert [(file.filename, file.file_size) for file in listed] == [("1.csv", 13)]
+    assert pyndows.check("test", connection)[0] == "pass"
+    pyndows.rename(connection, "TestShare", "/B/2.csv", "/B/3.csv")
+
+    # Nothing was actually performed
+    assert not samba_mock.path("TestShare", "/B/2.csv").exists()
+
+
+def test_replay_durations(samba_mock: SMBConnectionMock, tmpdir, monkeypatch):
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test Record")
+    list_path = SMBConnectionMock.listPath
+
+    def slow_list_path(self, *args, **kwargs):
+        time.sleep(0.05)
+        return list_path(self, *args, **kwargs)
+
+    samba_mock.add_callback("listPath", slow_list_path)
+    recording_file_path = os.path.join(tmpdir, "recording.gz")
+    with RecordingConnection(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        recording_file_path,
+    ) as connection:
+        connection.listPath("TestShare", "/A")
+        connection.listPath("TestShare", "/A")
+    assert [
+        interaction["duration"] >= 0.05 for interaction in load(recording_file_path)
+    ] == [True, True]
+
+    slept = []
+    monkeypatch.setattr(pyndows.testing.time, "sleep", slept.append)
+    samba_mock.replay(recording_file_path, speed=2)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    connection.listPath("TestShare", "/A")
+    connection.listPath("TestShare", "/A")
+
+    assert [
+        duration / 2
+        for duration in (
+            interaction["duration"] for interaction in load(recording_file_path)
+        )
+    ] == slept
+
+
+def test_replay_unrecorded_call(samba_mock: SMBConnectionMock, tmpdir):
+    recording_file_path = os.path.join(tmpdir, "recording.gz")
+    with RecordingConnection(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        recording_file_path,
+    ) as connection:
+        connection.echo(b"data")
+
+    samba_mock.replay(recording_file_path)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    assert connection.echo(data=b"data") == b"data"
+    with pytest.raises(LookupError) as exception_info:
+        connection.echo(b"data")
+    assert str(exception_info.value) == "echo() was not recorded."
+    with pytest.raises(LookupError) as exception_info:
+        connection.listPath("TestShare", "/A")
+    assert str(exception_info.value) == "listPath('TestShare', '/A') was not recorded."
+
+
+def test_replay_file_keyword(samba_mock: SMBConnectionMock, tmpdir):
+    recording_file_path = os.path.join(tmpdir, "recording.gz")
+    with RecordingConnection(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        recording_file_path,
+    ) as connection:
+        connection.storeFile("TestShare", "/1.csv", file_obj=io.BytesIO(b"Test Record"))
+        connection.retrieveFile("TestShare", "/1.csv", file_obj=io.BytesIO())
+
+    assert [interaction["size"] for interaction in load(recording_file_path)] == [
+        11,
+        11,
+    ]
+    samba_mock.cleanup()
+    samba_mock.replay(recording_file_path)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    assert (
+        connection.storeFile("TestShare", "/1.csv", file_obj=io.BytesIO(b"Test Record"))
+        == 11
+    )
+    retrieved = io.BytesIO()
+    assert connection.retrieveFile("TestShare", "/1.csv", file_obj=retrieved) == (
+        0,
+        11,
+    )
+    assert retrieved.getvalue() == bytes(11)
+
+
+def test_replay_error(samba_mock: SMBConnectionMock, tmpdir):
+    recording_file_path = os.path.join(tmpdir, "recording.gz")
+    with RecordingConnection(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        recording_file_path,
+    ) as connection:
+        with pytest.raises(OperationFailure):
+            connection.createDirectory("TestShare", "/A/B")
+
+    samba_mock.replay(recording_file_path)
+    with pytest.raises(OperationFailure) as exception_info:
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ).createDirectory("TestShare", "/A/B")
+    assert exception_info.value.message.startswith("Failed to create directory /A/B")
+
+
+def test_record_keeps_file_attributes(samba_mock: SMBConnectionMock, tmpdir):
+    local_file = tmpdir.join("1.csv")
+    local_file.write_text("Test Record", encoding="utf-8")
+    stored = samba_mock.track_calls("storeFile")
+    recording_file_path = os.path.join(tmpdir, "recording.gz")
+    with RecordingConnection(
+        pyndows.connect(
+            "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+        ),
+        recording_file_path,
+    ) as connection, open(local_file, "rb") as file:
+        connection.storeFile("TestShare", "/1.csv", file)
+
+    assert [call["file_obj"].name for call in stored] == [str(local_file)]
+    assert load(recording_file_path)[0]["size"] == 11
@@ -0,0 +1,165 @@
+import io
+import zipfile
+
+import pytest
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def test_random_access(samba_mock: SMBConnectionMock):
+    retrieved = samba_mock.track_calls("retrieveFileFromOffset")
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    content = bytes(range(256)) * 40
+    samba_mock.path("TestShare", "/folder/file.bin").parent.mkdir()
+    samba_mock.path("TestShare", "/folder/file.bin").write_bytes(content)
+
+    with pyndows.open_remote(
+        connection, "TestShare", "/folder/file.bin", block_size=1000
+    ) as file:
+        assert file.readable()
+        assert file.seekable()
+        assert not file.writable()
+        assert file.size == 10240
+
+        assert file.seek(-20, io.SEEK_END) == 10220
+        assert file.read(100) == content[-20:]
+        assert file.read(100) == b""
+        assert file.seek(5000) == 5000
+        assert file.read(10) == content[5000:5010]
+        assert file.seek(-10, io.SEEK_CUR) == 5000
+        assert file.read(10) == content[5000:5010]
+        assert file.tell() == 5010
+
+    # Only requested blocks were retrieved (once)
+    assert [(call["offset"], call["max_length"]) for call in retrieved] == [
+        (10000, 1000),
+        (5000, 1000),
+    ]
+
+
+def test_sequential_access_reads_ahead(samba_mock: SMBConnectionMock):
+    retrieved = samba_mock.track_calls("retrieveFileFromOffset")
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    content = b"1234567890" * 1000
+    samba_mock.path("TestShare", "/file.bin").write_bytes(content)
+
+    with pyndows.open_remote(
+        connection, "TestShare", "/file.bin", block_size=1000, read_ahead=3
+    ) as file:
+        assert file.read(1500) == content[:1500]
+        assert file.read() == content[1500:]
+
+    assert [(call["offset"], call["max_length"]) for call in retrieved] == [
+        (0, 1000),
+        (1000, 4000),
+        (5000, 4000),
+        (9000, 1000),
+    ]
+
+
+def test_least_recently_used_blocks_are_evicted(samba_mock: SMBConnectionMock):
+    retrieved = samba_mock.track_calls("retrieveFileFromOffset")
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/file.bin").write_bytes(b"1" * 10000)
+
+    with pyndows.open_remote(
+        connection, "TestShare", "/file.bin", block_size=1000, cache_size=2
+    ) as file:
+        for position in (0, 5000, 0, 8000, 0, 5000):
+            file.seek(position)
+            file.read(1)
+
+    assert [(call["offset"], call["max_length"]) for call in retrieved] == [
+        (0, 1000),
+        (5000, 1000),
+        (8000, 1000),
+        (5000, 1000),
+    ]
+
+
+def test_read_zip_central_directory(samba_mock: SMBConnectionMock):
+    retrieved = samba_mock.track_calls("retrieveFileFromOffset")
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("big.txt", b"0" * 500_000)
+        zip_file.writestr("small.txt", b"content")
+    samba_mock.path("TestShare", "/archive.zip").write_bytes(archive.getvalue())
+
+    with pyndows.open_remote(
+        connection, "TestShare", "/archive.zip", block_size=4096
+    ) as file:
+        with zipfile.ZipFile(io.BufferedReader(file)) as zip_file:
+            assert zip_file.namelist() == ["big.txt", "small.txt"]
+            assert zip_file.read("small.txt") == b"content"
+
+    assert sum(call["max_length"] for call in retrieved) < 500_000
+
+
+def test_invalid_seek(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/file.bin").write_bytes(b"content")
+
+    with pyndows.open_remote(connection, "TestShare", "/file.bin") as file:
+        with pytest.raises(ValueError) as exception_info:
+            file.seek(-1)
+        assert str(exception_info.value) == "Negative seek position -1"
+
+        with pytest.raises(ValueError) as exception_info:
+            file.seek(0, 3)
+        assert str(exception_info.value) == "Invalid whence (3)"
+
+    with pytest.raises(ValueError):
+        file.read()
+    with pytest.raises(ValueError):
+        file.tell()
+
+
+def test_open_non_existing_file(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with pytest.raises(FileNotFoundError) as exception_info:
+        pyndows.open_remote(connection, "TestShare", "/file.bin")
+    assert (
+        str(exception_info.value)
+        == "\\\\TestComputer\\TestShare/file.bin doesn't exist"
+    )
+
+
+def test_file_removed_while_reading(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/file.bin").write_bytes(b"content")
+
+    with pyndows.open_remote(connection, "TestShare", "/file.bin") as file:
+        samba_mock.path("TestShare", "/file.bin").unlink()
+        with pytest.raises(pyndows.PyndowsException) as exception_info:
+            file.read()
+    assert (
+        str(exception_info.value)
+        == "Unable to read \\\\TestComputer\\TestShare/file.bin file"
+    )
+
+
+def test_file_truncated_while_reading(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/file.bin").write_bytes(b"content")
+
+    with pyndows.open_remote(connection, "TestShare", "/file.bin") as file:
+        samba_mock.path("TestShare", "/file.bin").write_bytes(b"")
+        assert file.read() == b""
@@ -0,0 +1,472 @@
+import gzip
+import hashlib
+import os
+
+import pytest
+from smb.SMBConnection import SMBConnection
+from smb.base import SMBTimeout, NotConnectedError
+from smb.smb_structs import OperationFailure
+
+import pyndows
+from pyndows._windows import _reconnect
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def no_wait(max_attempts: int = 3) -> pyndows.RetryPolicy:
+    return pyndows.RetryPolicy(max_attempts=max_attempts, backoff=0)
+
+
+def fail_once(method_name: str, failure: Exception, calls: list):
+    """Make method fail on the first call only. Provided list stores the parameters of every call."""
+    method = getattr(SMBConnectionMock, method_name)
+
+    def fail_first_call(self, *args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise failure
+        return method(self, *args, **kwargs)
+
+    return fail_first_call
+
+
+def test_retry_delay():
+    policy = pyndows.RetryPolicy(backoff=1, max_backoff=5, jitter=0)
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+    policy = pyndows.RetryPolicy(backoff=10, jitter=0.1)
+    for _ in range(20):
+        assert 9 <= policy.delay(1) <= 11
+
+
+def test_file_retrieval_is_resumed(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_bytes(b"0123456789")
+    offsets = []
+    reconnections = []
+    retrieve = SMBConnectionMock.retrieveFileFromOffset
+
+    def fail_after_4_bytes(self, share_drive_path, file_path, file, offset=0, *args):
+        offsets.append(offset)
+        if len(offsets) == 1:
+            retrieve(self, share_drive_path, file_path, file, offset, 4)
+            raise SMBTimeout()
+        return retrieve(self, share_drive_path, file_path, file, offset)
+
+    samba_mock.add_callback("retrieveFileFromOffset", fail_after_4_bytes)
+    samba_mock.add_callback("connect", lambda *args: reconnections.append(args) or True)
+
+    assert pyndows.get(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        checksum="sha256",
+        retry=no_wait(),
+    ) == (hashlib.sha256(b"0123456789").hexdigest())
+
+    with open(os.path.join(tmpdir, "local_file"), "rb") as local_file:
+        assert local_file.read() == b"0123456789"
+    assert offsets == [0, 4]
+    assert len(reconnections) == 1
+
+
+def test_compressed_file_retrieval_is_resumed(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath.gz").write_bytes(
+        gzip.compress(b"0123456789" * 100)
+    )
+    offsets = []
+    retrieve = SMBConnectionMock.retrieveFileFromOffset
+
+    def fail_after_10_bytes(self, share_drive_path, file_path, file, offset=0, *args):
+        offsets.append(offset)
+        if len(offsets) == 1:
+            retrieve(self, share_drive_path, file_path, file, offset, 10)
+            raise ConnectionResetError()
+        return retrieve(self, share_drive_path, file_path, file, offset)
+
+    samba_mock.add_callback("retrieveFileFromOffset", fail_after_10_bytes)
+
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/TestFilePath.gz",
+        os.path.join(tmpdir, "local_file"),
+        compression="infer",
+        retry=no_wait(),
+    )
+
+    with open(os.path.join(tmpdir, "local_file"), "rb") as local_file:
+        assert local_file.read() == b"0123456789" * 100
+    assert offsets == [0, 10]
+
+
+def test_file_retrieval_retries_are_exhausted(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            retry=no_wait(max_attempts=2),
+        )
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\TestComputer\TestShare/TestFilePath file"
+    )
+
+
+def test_non_retryable_failure_is_not_retried(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+    calls = []
+    samba_mock.add_callback(
+        "retrieveFileFromOffset", fail_once("retrieveFileFromOffset", KeyError(), calls)
+    )
+
+    with pytest.raises(KeyError):
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            retry=no_wait(),
+        )
+    assert len(calls) == 1
+
+
+def test_failed_reconnection_is_retried(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+    calls = []
+    reconnections = []
+    samba_mock.add_callback(
+        "retrieveFileFromOffset",
+        fail_once("retrieveFileFromOffset", SMBTimeout(), calls),
+    )
+    # First reconnection fails
+    samba_mock.add_callback(
+        "connect", lambda *args: reconnections.append(args) or len(reconnections) > 1
+    )
+
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        retry=no_wait(),
+    )
+
+    assert len(calls) == 2
+    assert len(reconnections) == 2
+
+
+def test_failed_reconnection_exhausting_retries(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    calls = []
+    samba_mock.add_callback(
+        "retrieveFileFromOffset",
+        fail_once("retrieveFileFromOffset", SMBTimeout(), calls),
+    )
+    samba_mock.add_callback("connect", lambda *args: False)
+
+    with pytest.raises(NotConnectedError) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            retry=no_wait(max_attempts=2),
+        )
+    assert (
+        str(exception_info.value)
+        == "Impossible to reconnect to TestComputer (127.0.0.1:80)."
+    )
+
+
+def test_connection_not_created_by_pyndows_is_not_reconnected(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = SMBConnectionMock("TestUser", "TestPassword", "test", "TestComputer")
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+    calls = []
+    samba_mock.add_callback(
+        "retrieveFileFromOffset",
+        fail_once("retrieveFileFromOffset", SMBTimeout(), calls),
+    )
+    samba_mock.add_callback("close", lambda self: pytest.fail("Should not close."))
+
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        retry=no_wait(),
+    )
+
+    with open(os.path.join(tmpdir, "local_file")) as local_file:
+        assert local_file.read() == "Test Content"
+
+
+@pytest.mark.parametrize(
+    "checksum, expected_checksum",
+    [("sha256", hashlib.sha256(b"0123456789").hexdigest()), (None, None)],
+)
+def test_file_move_is_resumed(
+    samba_mock: SMBConnectionMock, tmpdir, checksum, expected_checksum
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="wb") as local_file:
+        local_file.write(b"0123456789")
+    offsets = []
+
+    def fail_after_4_bytes(self, share_drive_path, file_path, file, timeout=30):
+        self.path(share_drive_path, file_path).write_bytes(file.read(4))
+        raise SMBTimeout()
+
+    store_from_offset = SMBConnectionMock.storeFileFromOffset
+
+    def store_resumed(self, share_drive_path, file_path, file, offset, *args):
+        offsets.append(offset)
+        return store_from_offset(self, share_drive_path, file_path, file, offset)
+
+    samba_mock.add_callback("storeFile", fail_after_4_bytes)
+    samba_mock.add_callback("storeFileFromOffset", store_resumed)
+
+    assert (
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum=checksum,
+            retry=no_wait(),
+        )
+        == expected_checksum
+    )
+
+    assert samba_mock.path("TestShare", "/TestFilePath").read_bytes() == b"0123456789"
+    assert offsets == [4]
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_compressed_file_move_is_restarted(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="wb") as local_file:
+        local_file.write(b"0123456789")
+    calls = []
+    samba_mock.add_callback(
+        "storeFile", fail_once("storeFile", OperationFailure("Mock", []), calls)
+    )
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath.gz",
+        os.path.join(tmpdir, "local_file"),
+        compression="infer",
+        retry=no_wait(),
+    )
+
+    assert (
+        gzip.decompress(samba_mock.path("TestShare", "/TestFilePath.gz").read_bytes())
+        == b"0123456789"
+    )
+    assert len(calls) == 2
+
+
+def test_file_move_only_retries_failed_step(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as local_file:
+        local_file.write("Test Content Move")
+    stored = []
+    renamed = []
+    store = SMBConnectionMock.storeFile
+    samba_mock.add_callback(
+        "storeFile", lambda self, *args: stored.append(args) or store(self, *args)
+    )
+    rename = SMBConnectionMock.rename
+
+    def fail_first_file_rename(
+        self, share_drive_path, initial_file_path, new_file_path
+    ):
+        renamed.append(initial_file_path)
+        if renamed == ["/Folder/TestFilePath.tmp"]:
+            raise OperationFailure("Mock", [])
+        return rename(self, share_drive_path, initial_file_path, new_file_path)
+
+    # Folder is created without using rename
+    samba_mock.path("TestShare", "/Folder").mkdir()
+    samba_mock.add_callback("rename", fail_first_file_rename)
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/Folder/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        retry=no_wait(),
+    )
+
+    assert (
+        samba_mock.path("TestShare", "/Folder/TestFilePath").read_text()
+        == "Test Content Move"
+    )
+    assert len(stored) == 1
+    assert renamed == ["/Folder/TestFilePath.tmp", "/Folder/TestFilePath.tmp"]
+
+
+def test_folder_creation_is_retried(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as local_file:
+        local_file.write("Test Content Move")
+    listed = []
+    samba_mock.add_callback(
+        "listPath", fail_once("listPath", ConnectionResetError(), listed)
+    )
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/Folder/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        write_to_new_folder_after=0,
+        retry=no_wait(),
+    )
+
+    assert (
+        samba_mock.path("TestShare", "/Folder/TestFilePath").read_text()
+        == "Test Content Move"
+    )
+
+
+def test_file_rename_is_retried(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/file_to_rename").write_text("Test Rename")
+    listed = []
+    renamed = []
+    samba_mock.add_callback("listPath", fail_once("listPath", SMBTimeout(), listed))
+    samba_mock.add_callback(
+        "rename", fail_once("rename", OperationFailure("Mock", []), renamed)
+    )
+
+    pyndows.rename(
+        connection,
+        "TestShare",
+        "/file_to_rename",
+        "/file_new_name",
+        retry=no_wait(),
+    )
+
+    assert samba_mock.path("TestShare", "/file_new_name").read_text() == "Test Rename"
+    # Once before renaming, then to check if the failed rename was performed
+    assert len(listed) == 3
+    assert len(renamed) == 2
+
+
+def test_reconnection_starts_a_new_session(monkeypatch):
+    connected = []
+    monkeypatch.setattr(
+        SMBConnection, "connect", lambda self, ip, port: connected.append(ip) or True
+    )
+    monkeypatch.setattr(SMBConnection, "close", lambda self: None)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    # Simulate a session established with a SMB2 server
+    connection.has_negotiated = True
+    connection.is_using_smb2 = True
+    connection.session_id = 12
+    connection.mid = 42
+    connection.connected_trees["TestShare"] = 5
+
+    _reconnect(connection)
+
+    assert connected == ["127.0.0.1", "127.0.0.1"]
+    assert not connection.has_negotiated
+    assert not connection.is_using_smb2
+    assert connection.session_id == 0
+    assert connection.mid == 0
+    assert connection.connected_trees == {}
+    assert connection.username == "TestUser"
+    assert connection.is_direct_tcp
+
+
+def rename_then_fail_once(calls: list):
+    """Rename but lose the response of the first call."""
+    rename = SMBConnectionMock.rename
+
+    def lose_first_response(self, *args):
+        calls.append(args)
+        rename(self, *args)
+        if len(calls) == 1:
+            raise SMBTimeout()
+
+    return lose_first_response
+
+
+def test_file_rename_that_succeeded_is_not_retried(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/file_to_rename").write_text("Test Rename")
+    renamed = []
+    samba_mock.add_callback("rename", rename_then_fail_once(renamed))
+
+    pyndows.rename(
+        connection,
+        "TestShare",
+        "/file_to_rename",
+        "/file_new_name",
+        retry=no_wait(),
+    )
+
+    assert samba_mock.path("TestShare", "/file_new_name").read_text() == "Test Rename"
+    assert len(renamed) == 1
+
+
+def test_temp_file_rename_that_succeeded_is_not_retried(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as local_file:
+        local_file.write("Test Move")
+    renamed = []
+    samba_mock.add_callback("rename", rename_then_fail_once(renamed))
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        retry=no_wait(),
+    )
+
+    assert samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Move"
+    assert not samba_mock.path("TestShare", "/TestFilePath.tmp").exists()
+    assert len(renamed) == 1
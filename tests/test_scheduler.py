@@ -0,0 +1,233 @@
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+
+import pyndows
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def pool(remote_name: str, size: int = 4) -> pyndows.ConnectionPool:
+    return pyndows.ConnectionPool(
+        remote_name,
+        "127.0.0.1",
+        80,
+        "TestDomain",
+        "TestUser",
+        "TestPassword",
+        size=size,
+    )
+
+
+def test_job_result(samba_mock: SMBConnectionMock, tmpdir):
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"))
+        future = scheduler.submit(
+            "TestComputer",
+            lambda connection: pyndows.get(
+                connection,
+                "TestShare",
+                "/TestFilePath",
+                os.path.join(tmpdir, "local_file"),
+                checksum="md5",
+            ),
+        )
+        assert future.result(timeout=5) == hashlib.md5(b"Test Content").hexdigest()
+
+    with open(os.path.join(tmpdir, "local_file")) as local_file:
+        assert local_file.read() == "Test Content"
+
+
+def test_job_failure(samba_mock: SMBConnectionMock, tmpdir):
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"))
+        future = scheduler.submit(
+            "TestComputer",
+            lambda connection: pyndows.get(
+                connection,
+                "TestShare",
+                "/TestFilePath",
+                os.path.join(tmpdir, "local_file"),
+            ),
+        )
+        with pytest.raises(pyndows.PyndowsException) as exception_info:
+            future.result(timeout=5)
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\TestComputer\TestShare/TestFilePath file"
+    )
+
+
+def test_max_sessions_per_host(samba_mock: SMBConnectionMock):
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def job(connection):
+        with lock:
+            running.append(connection)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(connection)
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"), max_sessions=2)
+        for _ in range(6):
+            scheduler.submit("TestComputer", job)
+
+    assert max(max_running) == 2
+
+
+def test_highest_priority_first(samba_mock: SMBConnectionMock):
+    release = threading.Event()
+    started = []
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"), max_sessions=1)
+        scheduler.submit("TestComputer", lambda connection: release.wait(5))
+        for priority in (1, 5, 3, 5):
+            scheduler.submit(
+                "TestComputer",
+                lambda connection, priority=priority: started.append(priority),
+                priority=priority,
+            )
+        release.set()
+
+    assert started == [5, 5, 3, 1]
+
+
+def test_busy_host_does_not_block_other_hosts(samba_mock: SMBConnectionMock):
+    release = threading.Event()
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("BusyComputer"), max_sessions=1)
+        scheduler.add_host(pool("IdleComputer"), max_sessions=1)
+        for _ in range(5):
+            scheduler.submit("BusyComputer", lambda connection: release.wait(5))
+        future = scheduler.submit(
+            "IdleComputer", lambda connection: connection.remote_name
+        )
+
+        assert future.result(timeout=1) == "IdleComputer"
+        assert scheduler.metrics()["BusyComputer"]["queued"] == 4
+        release.set()
+
+
+def test_bandwidth_per_host(samba_mock: SMBConnectionMock):
+    started = []
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"), bytes_per_second=10000)
+        for _ in range(3):
+            scheduler.submit(
+                "TestComputer",
+                lambda connection: started.append(time.monotonic()),
+                size=5000,
+            )
+
+    # Burst allows the first 10000 bytes right away, then 10000 bytes per second
+    assert started[1] - started[0] < 0.2
+    assert started[2] - started[0] >= 0.4
+
+
+def test_job_bigger_than_bandwidth(samba_mock: SMBConnectionMock):
+    started = []
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"), bytes_per_second=10000)
+        for _ in range(2):
+            scheduler.submit(
+                "TestComputer",
+                lambda connection: started.append(time.monotonic()),
+                size=15000,
+            )
+
+    assert started[1] - started[0] >= 1.4
+
+
+def test_metrics(samba_mock: SMBConnectionMock):
+    release = threading.Event()
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"), max_sessions=1)
+        assert scheduler.metrics() == {
+            "TestComputer": {
+                "queued": 0,
+                "running": 0,
+                "started": 0,
+                "average_wait": 0.0,
+                "max_wait": 0.0,
+            }
+        }
+        first = scheduler.submit("TestComputer", lambda connection: release.wait(5))
+        scheduler.submit("TestComputer", lambda connection: None)
+        time.sleep(0.1)
+        metrics = scheduler.metrics()["TestComputer"]
+        assert metrics["queued"] == 1
+        assert metrics["running"] == 1
+        assert metrics["started"] == 1
+        release.set()
+        first.result(timeout=5)
+
+    metrics = scheduler.metrics()["TestComputer"]
+    assert metrics["queued"] == 0
+    assert metrics["running"] == 0
+    assert metrics["started"] == 2
+    assert metrics["max_wait"] >= 0.1
+    assert 0 < metrics["average_wait"] <= metrics["max_wait"]
+
+
+def test_unknown_host(samba_mock: SMBConnectionMock):
+    with pyndows.Scheduler() as scheduler:
+        with pytest.raises(pyndows.PyndowsException) as exception_info:
+            scheduler.submit("TestComputer", lambda connection: None)
+
+    assert str(exception_info.value) == "TestComputer was not added to the scheduler."
+
+
+def test_submit_after_shutdown(samba_mock: SMBConnectionMock):
+    scheduler = pyndows.Scheduler()
+    scheduler.add_host(pool("TestComputer"))
+    scheduler.shutdown()
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        scheduler.submit("TestComputer", lambda connection: None)
+
+    assert str(exception_info.value) == "Scheduler is shut down."
+
+
+def test_shutdown_without_waiting_cancels_queued_jobs(samba_mock: SMBConnectionMock):
+    release = threading.Event()
+    scheduler = pyndows.Scheduler()
+    scheduler.add_host(pool("TestComputer"), max_sessions=1)
+    running = scheduler.submit("TestComputer", lambda connection: release.wait(5))
+    queued = scheduler.submit("TestComputer", lambda connection: None)
+    time.sleep(0.1)
+
+    scheduler.shutdown(wait=False)
+
+    assert queued.cancelled()
+    release.set()
+    assert running.result(timeout=5) is True
+
+
+def test_job_cancelled_while_queued(samba_mock: SMBConnectionMock):
+    release = threading.Event()
+    started = []
+
+    with pyndows.Scheduler() as scheduler:
+        scheduler.add_host(pool("TestComputer"), max_sessions=1)
+        scheduler.submit("TestComputer", lambda connection: release.wait(5))
+        cancelled = scheduler.submit(
+            "TestComputer", lambda connection: started.append(connection)
+        )
+        assert cancelled.cancel()
+        release.set()
+
+    assert not started
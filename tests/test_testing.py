@@ -5,6 +5,7 @@ import threading
 import time
 
 import pytest
+from smb.smb_structs import OperationFailure
 
 import pyndows
 from pyndows.testing import samba_mock, SMBConnectionMock, try_get
@@ -164,3 +165,64 @@ def test_retrieval_of_stored_non_text_file(samba_mock: SMBConnectionMock, tmpdir
         gzip.decompress(samba_mock.path("TestShare", "/TestFilePath").read_bytes())
         == b"Test Content Move"
     )
+
+
+def test_delete_files(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/A/B").mkdir(parents=True)
+    samba_mock.path("TestShare", "/A/B/1").write_text("1")
+    samba_mock.path("TestShare", "/A/1").write_text("1")
+
+    with pytest.raises(OperationFailure):
+        connection.deleteFiles("TestShare", "/A/C*")
+
+    connection.deleteFiles("TestShare", "/A/*")
+    assert samba_mock.path("TestShare", "/A/B/1").exists()
+    assert not samba_mock.path("TestShare", "/A/1").exists()
+
+    connection.deleteFiles("TestShare", "/A/*", delete_matching_folders=True)
+    assert not samba_mock.path("TestShare", "/A/B").exists()
+
+
+def test_delete_directory(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1").write_text("1")
+
+    with pytest.raises(OperationFailure):
+        connection.deleteDirectory("TestShare", "/A")
+
+    samba_mock.path("TestShare", "/A/1").unlink()
+    connection.deleteDirectory("TestShare", "/A")
+    assert not samba_mock.path("TestShare", "/A").exists()
+
+
+def test_track_calls(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1.csv").write_text("Test Content")
+    renamed = []
+    samba_mock.add_callback("rename", lambda self, *args: renamed.append(args) or None)
+    listed = samba_mock.track_calls("listPath")
+    tracked_renames = samba_mock.track_calls("rename")
+
+    assert connection.listPath("TestShare", "/A", pattern="*.csv")
+    connection.rename("TestShare", "/A/1.csv", "/A/2.csv")
+
+    assert listed == [
+        {
+            "service_name": "TestShare",
+            "path": "/A",
+            "search": 16,
+            "pattern": "*.csv",
+        }
+    ]
+    # Tracking does not prevent previous callbacks from being called
+    assert tracked_renames == [{"args": ("TestShare", "/A/1.csv", "/A/2.csv")}]
+    assert renamed == [("TestShare", "/A/1.csv", "/A/2.csv")]
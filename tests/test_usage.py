@@ -0,0 +1,104 @@
+import pyndows
+from pyndows import FolderUsage
+from pyndows.testing import samba_mock, SMBConnectionMock
+
+
+def create_tree(samba_mock: SMBConnectionMock):
+    samba_mock.path("TestShare", "/A").mkdir()
+    samba_mock.path("TestShare", "/A/1").write_text("1")
+    samba_mock.path("TestShare", "/A/B").mkdir()
+    samba_mock.path("TestShare", "/A/B/22").write_text("22")
+    samba_mock.path("TestShare", "/A/B/C").mkdir()
+    samba_mock.path("TestShare", "/A/B/C/333").write_text("333")
+    samba_mock.path("TestShare", "/A/B/C/4444").write_text("4444")
+    samba_mock.path("TestShare", "/A/D").mkdir()
+    samba_mock.path("TestShare", "/A/D/E").mkdir()
+    samba_mock.path("TestShare", "/A/F").mkdir()
+    samba_mock.path("TestShare", "/A/F/55555").write_text("55555")
+
+
+def test_du(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_tree(samba_mock)
+
+    assert pyndows.du(connection, "TestShare", "/A") == FolderUsage(
+        "/A",
+        15,
+        5,
+        [
+            FolderUsage("/A/B", 9, 3, [FolderUsage("/A/B/C", 7, 2, [])]),
+            FolderUsage("/A/D", 0, 0, [FolderUsage("/A/D/E", 0, 0, [])]),
+            FolderUsage("/A/F", 5, 1, []),
+        ],
+    )
+
+
+def test_du_max_depth(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_tree(samba_mock)
+
+    assert pyndows.du(connection, "TestShare", "/A/", max_depth=1) == FolderUsage(
+        "/A",
+        15,
+        5,
+        [
+            FolderUsage("/A/B", 9, 3, []),
+            FolderUsage("/A/D", 0, 0, []),
+            FolderUsage("/A/F", 5, 1, []),
+        ],
+    )
+    assert pyndows.du(connection, "TestShare", "/A", max_depth=0) == FolderUsage(
+        "/A", 15, 5, []
+    )
+
+
+def test_du_progress(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_tree(samba_mock)
+    completed = []
+
+    pyndows.du(
+        connection,
+        "TestShare",
+        "/A",
+        max_depth=0,
+        progress=lambda usage: completed.append((usage.path, usage.size)),
+    )
+
+    # Sub folders are provided before their parent
+    assert completed == [
+        ("/A/F", 5),
+        ("/A/B/C", 7),
+        ("/A/B", 9),
+        ("/A/D/E", 0),
+        ("/A/D", 0),
+        ("/A", 15),
+    ]
+
+
+def test_du_of_an_empty_share(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    assert pyndows.du(connection, "TestShare") == FolderUsage("", 0, 0, [])
+
+
+def test_du_using_a_pool(samba_mock: SMBConnectionMock):
+    create_tree(samba_mock)
+    for index in range(20):
+        samba_mock.path("TestShare", f"/A/F/{index}").mkdir()
+        samba_mock.path("TestShare", f"/A/F/{index}/file").write_text("1" * index)
+
+    with pyndows.ConnectionPool(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    ) as pool:
+        usage = pyndows.du(pool, "TestShare", "/A", max_depth=1)
+
+    assert (usage.size, usage.files) == (15 + sum(range(20)), 25)
+    assert usage.folders[2] == FolderUsage("/A/F", 5 + sum(range(20)), 21, [])
@@ -1,5 +1,11 @@
+import gzip
+import hashlib
 import os
 import os.path
+import re
+import sys
+import threading
+import tracemalloc
 
 import pytest
 from smb.base import SMBTimeout
@@ -72,6 +78,268 @@ def test_operation_failure_during_file_retrieval(samba_mock: SMBConnectionMock,
     )
 
 
+def test_file_retrieval_with_checksum(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+
+    assert (
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="sha256",
+        )
+        == hashlib.sha256(b"Test Content").hexdigest()
+    )
+    with open(os.path.join(tmpdir, "local_file")) as local_file:
+        assert local_file.read() == "Test Content"
+
+
+def test_file_retrieval_with_xxhash_checksum(samba_mock: SMBConnectionMock, tmpdir):
+    import xxhash
+
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+
+    assert (
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="xxh64",
+            expected_checksum=xxhash.xxh64(b"Test Content").hexdigest().upper(),
+        )
+        == xxhash.xxh64(b"Test Content").hexdigest()
+    )
+
+
+def test_file_retrieval_with_xxhash_checksum_without_xxhash(
+    samba_mock: SMBConnectionMock, tmpdir, monkeypatch
+):
+    monkeypatch.setitem(sys.modules, "xxhash", None)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="xxh64",
+        )
+    assert (
+        str(exception_info.value)
+        == "xxhash module must be installed to compute xxh64 checksum."
+    )
+
+
+def test_file_retrieval_with_checksum_file(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+    samba_mock.path("TestShare", "/TestFilePath.sha256").write_text(
+        f"{hashlib.sha256(b'Test Content').hexdigest()}  TestFilePath\n"
+    )
+
+    assert (
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="sha256",
+            checksum_file_suffix=".sha256",
+        )
+        == hashlib.sha256(b"Test Content").hexdigest()
+    )
+
+
+def test_file_retrieval_with_checksum_mismatch(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="md5",
+            expected_checksum="",
+        )
+    assert (
+        str(exception_info.value)
+        == rf"Checksum mismatch for \\TestComputer\TestShare/TestFilePath: expected  but was {hashlib.md5(b'Test Content').hexdigest()}"
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_file_retrieval_with_missing_checksum_file(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="sha256",
+            checksum_file_suffix=".sha256",
+        )
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\TestComputer\TestShare/TestFilePath.sha256 file"
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_gzip_file_retrieval(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath.gz").write_bytes(
+        gzip.compress(b"Test Content")
+    )
+
+    assert pyndows.get(
+        connection,
+        "TestShare",
+        "/TestFilePath.gz",
+        os.path.join(tmpdir, "local_file"),
+        checksum="sha256",
+        compression="infer",
+    ) == (hashlib.sha256(b"Test Content").hexdigest())
+    with open(os.path.join(tmpdir, "local_file")) as local_file:
+        assert local_file.read() == "Test Content"
+
+
+def test_zstd_file_retrieval(samba_mock: SMBConnectionMock, tmpdir):
+    import zstandard
+
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_bytes(
+        zstandard.ZstdCompressor().compress(b"Test Content")
+    )
+
+    pyndows.get(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        compression="zstd",
+    )
+    with open(os.path.join(tmpdir, "local_file")) as local_file:
+        assert local_file.read() == "Test Content"
+
+
+def test_zstd_file_retrieval_without_zstandard(
+    samba_mock: SMBConnectionMock, tmpdir, monkeypatch
+):
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath.zst").write_bytes(b"")
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath.zst",
+            os.path.join(tmpdir, "local_file"),
+            compression="infer",
+        )
+    assert (
+        str(exception_info.value)
+        == "zstandard module must be installed to use zstd compression."
+    )
+
+
+def test_file_retrieval_with_unsupported_compression(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath.7z",
+            os.path.join(tmpdir, "local_file"),
+            compression="7z",
+        )
+    assert (
+        str(exception_info.value)
+        == "7z compression is not supported. Use gzip, zstd or infer."
+    )
+
+
+def test_gzip_file_retrieval_of_non_gzip_file(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    def retrieve_in_chunks(self, share_drive_path, file_path, file):
+        for _ in range(100):
+            file.write(b"Not a gzip content")
+        return 0, 1800
+
+    samba_mock.add_callback("retrieveFile", retrieve_in_chunks)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            compression="gzip",
+        )
+    assert (
+        str(exception_info.value)
+        == r"Unable to decompress (gzip) \\TestComputer\TestShare/TestFilePath file"
+    )
+
+
+def test_operation_failure_during_gzip_file_retrieval(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath.gz",
+            os.path.join(tmpdir, "local_file"),
+            compression="infer",
+        )
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\TestComputer\TestShare/TestFilePath.gz file"
+    )
+
+
 def test_file_move(samba_mock: SMBConnectionMock, tmpdir):
     connection = pyndows.connect(
         "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
@@ -84,7 +352,481 @@ def test_file_move(samba_mock: SMBConnectionMock, tmpdir):
     )
 
     assert (
-        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Move"
+        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Move"
+    )
+
+
+def test_file_move_with_checksum(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+
+    assert (
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="sha256",
+            expected_checksum=hashlib.sha256(b"Test Content Move").hexdigest(),
+        )
+        == hashlib.sha256(b"Test Content Move").hexdigest()
+    )
+
+    assert (
+        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Move"
+    )
+
+
+def test_file_move_with_checksum_file_mismatch(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+    with open(os.path.join(tmpdir, "local_file.sha256"), mode="w") as checksum_file:
+        checksum_file.write(f"{hashlib.sha256(b'Other').hexdigest()}  local_file")
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="sha256",
+            checksum_file_suffix=".sha256",
+        )
+
+    assert (
+        str(exception_info.value)
+        == rf"Checksum mismatch for \\TestComputer\TestShare/TestFilePath.tmp: expected {hashlib.sha256(b'Other').hexdigest()} but was {hashlib.sha256(b'Test Content Move').hexdigest()}"
+    )
+    assert not samba_mock.path("TestShare", "/TestFilePath").exists()
+    assert os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [{"expected_checksum": "deadbeef"}, {"checksum_file_suffix": ".sha256"}],
+)
+def test_file_retrieval_with_expected_checksum_without_checksum(
+    samba_mock: SMBConnectionMock, tmpdir, parameters
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content")
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.get(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            **parameters,
+        )
+    assert (
+        str(exception_info.value)
+        == "checksum (hash algorithm name) must be provided to check a checksum."
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [{"expected_checksum": "deadbeef"}, {"checksum_file_suffix": ".sha256"}],
+)
+def test_file_move_with_expected_checksum_without_checksum(
+    samba_mock: SMBConnectionMock, tmpdir, parameters
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            **parameters,
+        )
+
+    assert (
+        str(exception_info.value)
+        == "checksum (hash algorithm name) must be provided to check a checksum."
+    )
+    assert not samba_mock.path("TestShare", "/TestFilePath.tmp").exists()
+    assert os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def identical_remote_file(
+    samba_mock: SMBConnectionMock, tmpdir, remote_content: bytes = b"Test Content Mov_"
+) -> list:
+    """
+    Create a local file older than remote one.
+
+    :return: Path of every stored file.
+    """
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as local_file:
+        local_file.write("Test Content Move")
+    os.utime(os.path.join(tmpdir, "local_file"), (1_000_000, 1_000_000))
+    samba_mock.path("TestShare", "/TestFilePath").write_bytes(remote_content)
+    return samba_mock.track_calls("storeFile")
+
+
+def test_file_move_skip_identical(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    stored = identical_remote_file(samba_mock, tmpdir)
+
+    assert (
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="sha256",
+            skip_identical=True,
+        )
+        == hashlib.sha256(b"Test Content Move").hexdigest()
+    )
+
+    assert [call["file_path"] for call in stored] == []
+    assert (
+        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Mov_"
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_file_move_skip_identical_with_different_size(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    stored = identical_remote_file(samba_mock, tmpdir, b"Other")
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        skip_identical=True,
+    )
+
+    assert [call["file_path"] for call in stored] == ["/TestFilePath.tmp"]
+    assert (
+        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Move"
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_file_move_skip_identical_with_older_remote_file(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    stored = identical_remote_file(samba_mock, tmpdir)
+    os.utime(samba_mock.path("TestShare", "/TestFilePath"), (500_000, 500_000))
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        skip_identical=True,
+    )
+
+    assert [call["file_path"] for call in stored] == ["/TestFilePath.tmp"]
+    assert (
+        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Move"
+    )
+
+
+def test_file_move_skip_identical_without_remote_file(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    stored = identical_remote_file(samba_mock, tmpdir)
+    samba_mock.path("TestShare", "/TestFilePath").unlink()
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        skip_identical=True,
+    )
+
+    assert [call["file_path"] for call in stored] == ["/TestFilePath.tmp"]
+    assert (
+        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Move"
+    )
+
+
+def test_file_move_skip_identical_with_remote_folder(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w"):
+        pass
+    os.utime(os.path.join(tmpdir, "local_file"), (1_000_000, 1_000_000))
+    samba_mock.path("TestShare", "/TestFilePath").mkdir()
+
+    with pytest.raises(pyndows.PyndowsException):
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            skip_identical=True,
+        )
+
+    assert samba_mock.path("TestShare", "/TestFilePath.tmp").exists()
+
+
+@pytest.mark.parametrize(
+    "remote_checksum, skipped",
+    [
+        (
+            f"{hashlib.sha256(b'Test Content Move').hexdigest().upper()}  local_file",
+            True,
+        ),
+        (hashlib.sha256(b"Other").hexdigest(), False),
+        (None, False),
+    ],
+)
+def test_file_move_skip_identical_with_checksum_file(
+    samba_mock: SMBConnectionMock, tmpdir, remote_checksum, skipped
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    stored = identical_remote_file(samba_mock, tmpdir)
+    with open(os.path.join(tmpdir, "local_file.sha256"), mode="w") as checksum_file:
+        checksum_file.write(hashlib.sha256(b"Test Content Move").hexdigest())
+    if remote_checksum:
+        samba_mock.path("TestShare", "/TestFilePath.sha256").write_text(remote_checksum)
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        checksum="sha256",
+        checksum_file_suffix=".sha256",
+        skip_identical=True,
+    )
+
+    assert [call["file_path"] for call in stored] == (
+        [] if skipped else ["/TestFilePath.tmp"]
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+@pytest.mark.parametrize(
+    "checksum_file_suffix, skipped", [(".sha256", True), (None, False)]
+)
+def test_gzip_file_move_skip_identical(
+    samba_mock: SMBConnectionMock, tmpdir, checksum_file_suffix, skipped
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as local_file:
+        local_file.write("Test Content Move")
+    with open(os.path.join(tmpdir, "local_file.sha256"), mode="w") as checksum_file:
+        checksum_file.write(hashlib.sha256(b"Test Content Move").hexdigest())
+    os.utime(os.path.join(tmpdir, "local_file"), (1_000_000, 1_000_000))
+    samba_mock.path("TestShare", "/TestFilePath.gz").write_bytes(
+        gzip.compress(b"Test Content Move")
+    )
+    samba_mock.path("TestShare", "/TestFilePath.gz.sha256").write_text(
+        hashlib.sha256(b"Test Content Move").hexdigest()
+    )
+    stored = samba_mock.track_calls("storeFile")
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath.gz",
+        os.path.join(tmpdir, "local_file"),
+        checksum="sha256",
+        checksum_file_suffix=checksum_file_suffix,
+        compression="infer",
+        skip_identical=True,
+    )
+
+    assert [call["file_path"] for call in stored] == (
+        [] if skipped else ["/TestFilePath.gz.tmp"]
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_file_move_skip_identical_with_checksum_mismatch(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    identical_remote_file(samba_mock, tmpdir)
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            checksum="sha256",
+            expected_checksum=hashlib.sha256(b"Other").hexdigest(),
+            skip_identical=True,
+        )
+
+    assert str(exception_info.value) == (
+        f"Checksum mismatch for {os.path.join(tmpdir, 'local_file')}: "
+        f"expected {hashlib.sha256(b'Other').hexdigest()} but was {hashlib.sha256(b'Test Content Move').hexdigest()}"
+    )
+    assert os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_gzip_file_move(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+
+    assert pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath.gz",
+        os.path.join(tmpdir, "local_file"),
+        checksum="sha256",
+        compression="infer",
+    ) == (hashlib.sha256(b"Test Content Move").hexdigest())
+
+    assert (
+        gzip.decompress(samba_mock.path("TestShare", "/TestFilePath.gz").read_bytes())
+        == b"Test Content Move"
+    )
+    assert not os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_zstd_file_move(samba_mock: SMBConnectionMock, tmpdir):
+    import zstandard
+
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        os.path.join(tmpdir, "local_file"),
+        compression="zstd",
+    )
+
+    assert (
+        zstandard.ZstdDecompressor()
+        .decompressobj()
+        .decompress(samba_mock.path("TestShare", "/TestFilePath").read_bytes())
+        == b"Test Content Move"
+    )
+
+
+def test_file_move_without_inferred_compression(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+
+    pyndows.move(
+        connection,
+        "TestShare",
+        "/TestFilePath.csv",
+        os.path.join(tmpdir, "local_file"),
+        compression="infer",
+    )
+
+    assert (
+        samba_mock.path("TestShare", "/TestFilePath.csv").read_text()
+        == "Test Content Move"
+    )
+
+
+def test_compression_failure_during_file_move(
+    samba_mock: SMBConnectionMock, tmpdir, monkeypatch
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+
+    class FailingCompressor:
+        def compress(self, data):
+            raise MemoryError()
+
+    monkeypatch.setattr(
+        pyndows._compression, "compressor", lambda compression: FailingCompressor()
+    )
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            compression="gzip",
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to compress (gzip) \\TestComputer\TestShare/TestFilePath.tmp file"
+    )
+    assert not samba_mock.path("TestShare", "/TestFilePath").exists()
+    assert os.path.exists(os.path.join(tmpdir, "local_file"))
+
+
+def test_store_file_operation_failure_during_gzip_file_move(
+    samba_mock: SMBConnectionMock, tmpdir
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    with open(os.path.join(tmpdir, "local_file"), mode="w") as distant_file:
+        distant_file.write("Test Content Move")
+
+    def raise_failure(*args):
+        raise OperationFailure("Mock for storeFile failure.", [])
+
+    samba_mock.add_callback("storeFile", raise_failure)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.move(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            os.path.join(tmpdir, "local_file"),
+            compression="gzip",
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to write \\TestComputer\TestShare/TestFilePath.tmp"
     )
 
 
@@ -227,6 +969,435 @@ def test_rename_operation_failure_during_file_move(
     )
 
 
+def test_file_copy(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content Copy")
+
+    assert (
+        pyndows.copy(connection, "TestShare", "/TestFilePath", "/TestFilePathCopy")
+        == 17
+    )
+
+    assert samba_mock.path("TestShare", "/TestFilePath").read_text() == (
+        "Test Content Copy"
+    )
+    assert samba_mock.path("TestShare", "/TestFilePathCopy").read_text() == (
+        "Test Content Copy"
+    )
+    assert not samba_mock.path("TestShare", "/TestFilePathCopy.tmp").exists()
+
+
+def test_file_copy_in_chunks(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_bytes(b"0123456789AB")
+    samba_mock.path("TestShare", "/TestFilePathCopy").write_bytes(
+        b"Previous content, longer than the copied one"
+    )
+
+    assert (
+        pyndows.copy(
+            connection,
+            "TestShare",
+            "/TestFilePath",
+            "/TestFilePathCopy",
+            chunk_size=4,
+        )
+        == 12
+    )
+
+    assert samba_mock.path("TestShare", "/TestFilePathCopy").read_bytes() == (
+        b"0123456789AB"
+    )
+
+
+def test_empty_file_copy(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_bytes(b"")
+
+    assert (
+        pyndows.copy(connection, "TestShare", "/TestFilePath", "/TestFilePathCopy") == 0
+    )
+
+    assert samba_mock.path("TestShare", "/TestFilePathCopy").read_bytes() == b""
+
+
+def test_file_copy_with_folder_creation(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content Copy")
+
+    pyndows.copy(
+        connection,
+        "TestShare",
+        "/TestFilePath",
+        "/Folder1/Folder2/TestFilePath",
+        write_to_new_folder_after=0,
+    )
+
+    assert (
+        samba_mock.path("TestShare", "/Folder1/Folder2/TestFilePath").read_text()
+        == "Test Content Copy"
+    )
+
+
+def test_file_copy_source_does_not_exist(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.copy(connection, "TestShare", "/TestFilePath", "/TestFilePathCopy")
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\TestComputer\TestShare/TestFilePath file"
+    )
+    assert not samba_mock.path("TestShare", "/TestFilePathCopy.tmp").exists()
+
+
+def test_file_copy_source_failure_while_reading(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_bytes(b"0123456789AB")
+    retrieve_file_from_offset = SMBConnectionMock.retrieveFileFromOffset
+
+    def fail_after_first_chunk(
+        self, share_drive_path, file_path, file_obj, offset, *args
+    ):
+        if offset:
+            raise OperationFailure("Mock for retrieveFileFromOffset failure.", [])
+        return retrieve_file_from_offset(
+            self, share_drive_path, file_path, file_obj, offset, *args
+        )
+
+    samba_mock.add_callback("retrieveFileFromOffset", fail_after_first_chunk)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.copy(
+            connection, "TestShare", "/TestFilePath", "/TestFilePathCopy", chunk_size=4
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\TestComputer\TestShare/TestFilePath file"
+    )
+    # Partially written file was removed
+    assert [path.name for path in samba_mock.path("TestShare", "/").iterdir()] == [
+        "TestFilePath"
+    ]
+
+
+def test_file_copy_folder_creation_failure(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content Copy")
+
+    def raise_failure(*args):
+        raise OperationFailure("Unable to create directory", [])
+
+    samba_mock.add_callback("createDirectory", raise_failure)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.copy(
+            connection, "TestShare", "/TestFilePath", "/Folder1/TestFilePathCopy"
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to write \\TestComputer\TestShare/Folder1/TestFilePathCopy.tmp"
+    )
+
+
+def test_rename_operation_failure_during_file_copy(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("TestShare", "/TestFilePath").write_text("Test Content Copy")
+
+    def raise_failure(*args):
+        raise OperationFailure("Mock for rename failure.", [])
+
+    samba_mock.add_callback("rename", raise_failure)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.copy(connection, "TestShare", "/TestFilePath", "/TestFilePathCopy")
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to rename temp file into \\TestComputer\TestShare/TestFilePathCopy"
+    )
+
+
+def test_file_transfer(samba_mock: SMBConnectionMock):
+    source = pyndows.connect(
+        "SourceComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    destination = pyndows.connect(
+        "DestinationComputer", "127.0.0.2", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    samba_mock.path("SourceShare", "/TestFilePath").write_text("Test Content Transfer")
+
+    assert (
+        pyndows.transfer(
+            source,
+            "SourceShare",
+            "/TestFilePath",
+            destination,
+            "DestinationShare",
+            "/Folder1/TestFilePath",
+            write_to_new_folder_after=0,
+        )
+        == 21
+    )
+
+    assert (
+        samba_mock.path("DestinationShare", "/Folder1/TestFilePath").read_text()
+        == "Test Content Transfer"
+    )
+    assert not samba_mock.path("DestinationShare", "/Folder1/TestFilePath.tmp").exists()
+
+
+def test_file_transfer_in_chunks(samba_mock: SMBConnectionMock):
+    source = pyndows.connect(
+        "SourceComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    destination = pyndows.connect(
+        "DestinationComputer", "127.0.0.2", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    def retrieve_in_chunks(self, share_drive_path, file_path, file):
+        for chunk in (b"0123", b"4567", b"89"):
+            file.write(chunk)
+        return 0, 10
+
+    def store_in_chunks(self, share_drive_path, file_path, file, timeout=30):
+        content = b""
+        for data in iter(lambda: file.read(3), b""):
+            assert len(data) <= 3
+            content += data
+        self.path(share_drive_path, file_path).write_bytes(content)
+        return len(content)
+
+    samba_mock.add_callback("retrieveFile", retrieve_in_chunks)
+    samba_mock.add_callback("storeFile", store_in_chunks)
+    assert (
+        pyndows.transfer(
+            source,
+            "SourceShare",
+            "/TestFilePath",
+            destination,
+            "DestinationShare",
+            "/TestFilePath",
+            buffers=1,
+        )
+        == 10
+    )
+
+    assert (
+        samba_mock.path("DestinationShare", "/TestFilePath").read_bytes()
+        == b"0123456789"
+    )
+
+
+def test_file_transfer_reading_small_parts_of_big_chunks(
+    samba_mock: SMBConnectionMock,
+):
+    source = pyndows.connect(
+        "SourceComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    destination = pyndows.connect(
+        "DestinationComputer", "127.0.0.2", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    chunk = os.urandom(4 * 1024 * 1024)
+    stored = hashlib.sha256()
+
+    def retrieve_in_one_chunk(self, share_drive_path, file_path, file_obj):
+        file_obj.write(chunk)
+        return 0, len(chunk)
+
+    def store_by_kilobyte(self, share_drive_path, file_path, file_obj, timeout=30):
+        for data in iter(lambda: file_obj.read(1024), b""):
+            assert len(data) <= 1024
+            stored.update(data)
+        self.path(share_drive_path, file_path).write_bytes(b"")
+        return len(chunk)
+
+    samba_mock.add_callback("retrieveFile", retrieve_in_one_chunk)
+    samba_mock.add_callback("storeFile", store_by_kilobyte)
+    tracemalloc.start()
+    try:
+        pyndows.transfer(
+            source,
+            "SourceShare",
+            "/TestFilePath",
+            destination,
+            "DestinationShare",
+            "/TestFilePath",
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert stored.hexdigest() == hashlib.sha256(chunk).hexdigest()
+    # Only requested bytes were copied (the remaining part of the chunk was never copied)
+    assert peak < len(chunk) / 4
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="Named pipes are not available")
+def test_file_move_from_named_pipe(samba_mock: SMBConnectionMock, tmpdir):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    pipe_path = os.path.join(tmpdir, "pipe")
+    os.mkfifo(pipe_path)
+
+    def write_to_pipe():
+        with open(pipe_path, "wb") as pipe:
+            pipe.write(b"Test Content Move")
+
+    writer = threading.Thread(target=write_to_pipe)
+    writer.start()
+    pyndows.move(connection, "TestShare", "/TestFilePath", pipe_path, checksum="md5")
+    writer.join()
+
+    assert (
+        samba_mock.path("TestShare", "/TestFilePath").read_text() == "Test Content Move"
+    )
+
+
+def test_file_transfer_source_does_not_exist(samba_mock: SMBConnectionMock):
+    source = pyndows.connect(
+        "SourceComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    destination = pyndows.connect(
+        "DestinationComputer", "127.0.0.2", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.transfer(
+            source,
+            "SourceShare",
+            "/TestFilePath",
+            destination,
+            "DestinationShare",
+            "/TestFilePath",
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\SourceComputer\SourceShare/TestFilePath file"
+    )
+    assert not samba_mock.path("DestinationShare", "/TestFilePath").exists()
+    assert not samba_mock.path("DestinationShare", "/TestFilePath.tmp").exists()
+
+
+def test_file_transfer_source_failure_while_reading(samba_mock: SMBConnectionMock):
+    source = pyndows.connect(
+        "SourceComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    destination = pyndows.connect(
+        "DestinationComputer", "127.0.0.2", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    def fail_after_first_chunk(self, share_drive_path, file_path, file):
+        file.write(b"0123")
+        raise OperationFailure("Mock for retrieveFile failure.", [])
+
+    samba_mock.add_callback("retrieveFile", fail_after_first_chunk)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.transfer(
+            source,
+            "SourceShare",
+            "/TestFilePath",
+            destination,
+            "DestinationShare",
+            "/TestFilePath",
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\SourceComputer\SourceShare/TestFilePath file"
+    )
+    # Partially written file was removed
+    assert list(samba_mock.path("DestinationShare", "/").iterdir()) == []
+
+
+def test_file_transfer_source_failure_and_removal_failure(
+    samba_mock: SMBConnectionMock,
+):
+    source = pyndows.connect(
+        "SourceComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    destination = pyndows.connect(
+        "DestinationComputer", "127.0.0.2", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+
+    def raise_failure(*args):
+        raise OperationFailure("Mock for deleteFiles failure.", [])
+
+    samba_mock.add_callback("deleteFiles", raise_failure)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.transfer(
+            source,
+            "SourceShare",
+            "/TestFilePath",
+            destination,
+            "DestinationShare",
+            "/TestFilePath",
+        )
+
+    # Original failure is reported
+    assert (
+        str(exception_info.value)
+        == r"Unable to retrieve \\SourceComputer\SourceShare/TestFilePath file"
+    )
+
+
+def test_store_file_operation_failure_during_file_transfer(
+    samba_mock: SMBConnectionMock,
+):
+    source = pyndows.connect(
+        "SourceComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    destination = pyndows.connect(
+        "DestinationComputer", "127.0.0.2", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    retrieved = []
+
+    def retrieve_endlessly(self, share_drive_path, file_path, file):
+        while True:
+            retrieved.append(file.write(b"0123"))
+
+    def raise_failure(*args):
+        raise OperationFailure("Mock for storeFile failure.", [])
+
+    samba_mock.add_callback("retrieveFile", retrieve_endlessly)
+    samba_mock.add_callback("storeFile", raise_failure)
+    with pytest.raises(pyndows.PyndowsException) as exception_info:
+        pyndows.transfer(
+            source,
+            "SourceShare",
+            "/TestFilePath",
+            destination,
+            "DestinationShare",
+            "/TestFilePath",
+            buffers=2,
+        )
+
+    assert (
+        str(exception_info.value)
+        == r"Unable to write \\DestinationComputer\DestinationShare/TestFilePath.tmp"
+    )
+    # Retrieval stopped as soon as the ring of buffers was full
+    assert len(retrieved) <= 2
+
+
 def test_file_rename(samba_mock: SMBConnectionMock):
     connection = pyndows.connect(
         "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
@@ -451,6 +1622,104 @@ def test_get_all_folder_contents_matching_a_pattern_with_question_mark_wildcard(
     ]
 
 
+def create_files_to_filter(samba_mock: SMBConnectionMock):
+    samba_mock.path("TestShare", "/A").mkdir()
+    for name in ("1.csv", "2.CSV", "3.xml", "4.done", "5.txt"):
+        samba_mock.path("TestShare", f"/A/{name}").write_text("Test Find")
+    samba_mock.path("TestShare", "/A/6.csv").mkdir()
+
+
+def test_get_folder_content_matching_many_patterns(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_files_to_filter(samba_mock)
+    listed = samba_mock.track_calls("listPath")
+
+    shared_folder_contents = pyndows.get_folder_content(
+        connection, "TestShare", "/A", pattern=["*.csv", "*.xml", "?.done"]
+    )
+
+    assert shared_folder_contents == [
+        SharedFileMock(filename="1.csv", isDirectory=False),
+        SharedFileMock(filename="2.CSV", isDirectory=False),
+        SharedFileMock(filename="3.xml", isDirectory=False),
+        SharedFileMock(filename="4.done", isDirectory=False),
+        SharedFileMock(filename="6.csv", isDirectory=True),
+    ]
+    # Folder is listed once
+    assert [call["pattern"] for call in listed] == ["*"]
+
+
+def test_get_folder_content_matching_a_single_pattern_in_a_list(
+    samba_mock: SMBConnectionMock,
+):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_files_to_filter(samba_mock)
+    listed = samba_mock.track_calls("listPath")
+
+    assert pyndows.get_folder_content(
+        connection, "TestShare", "/A", include_folders=False, pattern=["*.xml"]
+    ) == [SharedFileMock(filename="3.xml", isDirectory=False)]
+    # Server filters files
+    assert [call["pattern"] for call in listed] == ["*.xml"]
+
+
+def test_get_folder_content_matching_every_pattern(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_files_to_filter(samba_mock)
+
+    assert (
+        len(
+            pyndows.get_folder_content(
+                connection, "TestShare", "/A", pattern=["*.xml", "*"]
+            )
+        )
+        == 6
+    )
+    assert pyndows.get_folder_content(connection, "TestShare", "/A", pattern=[]) == []
+
+
+def test_get_folder_content_matching_a_regex(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_files_to_filter(samba_mock)
+
+    assert pyndows.get_folder_content(
+        connection,
+        "TestShare",
+        "/A",
+        include_folders=False,
+        pattern=re.compile(r"\d\.(csv|done)"),
+    ) == [
+        SharedFileMock(filename="1.csv", isDirectory=False),
+        SharedFileMock(filename="4.done", isDirectory=False),
+    ]
+
+
+def test_get_folder_content_matching_a_predicate(samba_mock: SMBConnectionMock):
+    connection = pyndows.connect(
+        "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"
+    )
+    create_files_to_filter(samba_mock)
+    samba_mock.path("TestShare", "/A/7.csv").write_text("Test Find bigger file")
+
+    listing = pyndows.get_folder_content(
+        connection,
+        "TestShare",
+        "/A",
+        pattern=lambda file: file.file_size > 10,
+        compact=True,
+    )
+
+    assert list(listing.names()) == ["7.csv"]
+
+
 def test_get_all_shared_folder_contents(samba_mock: SMBConnectionMock):
     connection = pyndows.connect(
         "TestComputer", "127.0.0.1", 80, "TestDomain", "TestUser", "TestPassword"